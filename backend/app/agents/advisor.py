@@ -1,33 +1,103 @@
-from app.core.config import settings
 import json
+import asyncio
+import orjson
+from string import Template
+from typing import Dict, Optional, Tuple
+from app.core.model_response import extract_json_object
+from app.core.local_model import get_hybrid_client
+from app.core.cache import cache
+
+# Static part of the prompt, serialized once at import instead of per call
+OUTPUT_SCHEMA = json.dumps({
+    "platform": "string",
+    "cost_estimate": "string",
+    "config_files": ["string"]
+}, indent=4)
+
+ADVISOR_PROMPT = Template("""
+        You are The Deployment Advisor.
+        Analyze the following project and recommend a deployment strategy.
+
+        Project:
+        $project_details
+
+        Output JSON:
+        $output_schema
+        """)
+
+# Rule-based recommendations at or above this confidence skip the LLM call
+RULE_CONFIDENCE_THRESHOLD = 0.9
+
+FRONTEND_ONLY_STACKS = ("nextjs", "vite", "react", "static")
 
 class AdvisorAgent:
     def __init__(self):
-        pass
+        # One lock per in-flight project so identical concurrent requests share a single LLM call
+        self._inflight: Dict[str, asyncio.Lock] = {}
+        # Callers holding or waiting on each lock; the lock is dropped when the last one leaves
+        self._waiters: Dict[str, int] = {}
+
+    def _confident_rule_recommendation(self, project_details: dict) -> Tuple[Optional[dict], float]:
+        """
+        Deterministic recommendation for projects with an obvious target,
+        read from the Architect blueprint fields. Returns (recommendation, confidence).
+        """
+        project_type = str(project_details.get("project_type", "")).lower()
+        stack = str(project_details.get("primary_stack", "")).lower()
+        paths = [f.get("path", "") for f in project_details.get("file_structure", []) if isinstance(f, dict)]
+        has_backend = any(p.startswith("backend/") for p in paths)
+        has_frontend = any(p.startswith("frontend/") for p in paths)
+
+        if project_type == "static" or (stack in FRONTEND_ONLY_STACKS and not has_backend):
+            return {
+                "platform": "Vercel",
+                "cost_estimate": "Free (Hobby tier)",
+                "config_files": ["vercel.json"],
+                "reasoning": "Frontend-only project; static/edge hosting fits without a server."
+            }, 0.95
+
+        if stack == "python" and not has_frontend:
+            return {
+                "platform": "Render",
+                "cost_estimate": "Free tier, $7/month for always-on",
+                "config_files": ["render.yaml"],
+                "reasoning": "Python backend without a frontend; a single web service is enough."
+            }, 0.9
+
+        return None, 0.0
 
     async def analyze_deployment(self, project_details: dict) -> dict:
         """
         Recommends deployment strategies and estimates costs.
+        Unambiguous projects are answered by rules; the rest go to the LLM
+        and are cached by the canonical JSON of project_details.
         """
-        from app.core.local_model import HybridModelClient
-        client = HybridModelClient()
-        
-        prompt = f"""
-        You are The Deployment Advisor.
-        Analyze the following project and recommend a deployment strategy.
-        
-        Project:
-        {project_details}
-        
-        Output JSON:
-        {{
-            "platform": "string",
-            "cost_estimate": "string",
-            "config_files": ["string"]
-        }}
-        """
+        recommendation, confidence = self._confident_rule_recommendation(project_details)
+        if recommendation and confidence >= RULE_CONFIDENCE_THRESHOLD:
+            return recommendation
+
+        cache_key = orjson.dumps(project_details, default=str, option=orjson.OPT_SORT_KEYS).decode()
+        lock = self._inflight.setdefault(cache_key, asyncio.Lock())
+        self._waiters[cache_key] = self._waiters.get(cache_key, 0) + 1
+
         try:
-            response = await client.generate(prompt, json_mode=True)
-            return json.loads(response)
-        except Exception as e:
-            return {"error": str(e)}
+            async with lock:
+                cached_response = await cache.get(cache_key, "advisor")
+                if cached_response:
+                    return orjson.loads(cached_response)
+
+                client = get_hybrid_client()
+                prompt = ADVISOR_PROMPT.substitute(project_details=project_details, output_schema=OUTPUT_SCHEMA)
+                try:
+                    response = await client.generate(prompt, json_mode=True)
+                    result = orjson.loads(extract_json_object(response))
+                except Exception as e:
+                    return {"error": str(e)}
+
+                await cache.set(cache_key, "advisor", orjson.dumps(result).decode())
+                return result
+        finally:
+            self._waiters[cache_key] -= 1
+            if not self._waiters[cache_key]:
+                del self._waiters[cache_key]
+                del self._inflight[cache_key]
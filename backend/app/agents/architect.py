@@ -1,45 +1,138 @@
 # ACEA Sentinel - The Architect Agent (HYBRID)
 # Uses Gemini API with automatic Ollama fallback
 
-from app.core.config import settings
 import json
 import asyncio
+import random
 import re
+import orjson
+import fastjsonschema
+from contextlib import aclosing
+from functools import lru_cache
+from string import Template
+from app.core.model_response import extract_json_object
+from app.core.local_model import get_hybrid_client
+from app.core.socket_manager import SocketManager
+from app.core.cache import cache, normalize_prompt
+from app.core.config import settings
 
-class ArchitectAgent:
-    def __init__(self):
-        self.model = None
+# Identical generations raced on the first attempt (when settings.SPECULATIVE_RETRIES
+# is on); the first one that parses wins
+SPECULATIVE_GENERATIONS = 2
 
-    async def design_system(self, user_prompt: str, tech_stack: str = "Auto-detect") -> dict:
-        """
-        Analyzes the user prompt and generates a MINIMAL, production-ready system architecture.
-        Uses Hybrid client: Gemini API → Ollama fallback.
-        """
-        from app.core.local_model import HybridModelClient
-        from app.core.socket_manager import SocketManager
-        from app.core.cache import cache
-        
-        client = HybridModelClient()
-        sm = SocketManager()
-        
-        # Initialize Redis (optional, non-blocking)
-        await cache.init_redis()
-        
-        # Check Cache
-        cached_response = await cache.get(user_prompt, "architect", tech_stack=tech_stack)
-        if cached_response:
-            await sm.emit("agent_log", {"agent_name": "ARCHITECT", "message": "⚡ Retrieved blueprint from cache"})
-            return json.loads(cached_response)
-        
-        await sm.emit("agent_log", {"agent_name": "ARCHITECT", "message": f"Analyzing requirements (Stack: {tech_stack})..."})
+# Minimum shape downstream agents rely on; compiled to Python code once at import
+BLUEPRINT_SCHEMA = {
+    "type": "object",
+    "required": ["project_name", "file_structure"],
+    "properties": {
+        "project_name": {"type": "string", "minLength": 1},
+        "project_type": {"enum": ["dynamic", "static"]},
+        "primary_stack": {"type": "string"},
+        "file_structure": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["path"],
+                "properties": {"path": {"type": "string", "minLength": 1}}
+            }
+        }
+    }
+}
+validate_blueprint = fastjsonschema.compile(BLUEPRINT_SCHEMA)
 
-        system_prompt = f"""
-You are The Architect, the brain of ACEA Sentinel.
+# Lowercased error substrings that make further attempts pointless
+FATAL_ERRORS = ("not available", "unauthorized", "invalid api key", "api key not valid", "permission denied")
+
+# Appended to the prompt after a JSON parse failure so the retry isn't identical
+JSON_RETRY_SUFFIX = "\n\nReturn ONLY valid JSON, no prose."
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff capped at 8s, with jitter so concurrent retries spread out."""
+    return min(2 ** attempt, 8) + random.random() * 0.25
+
+# Blueprint cache TTL (seconds) by (project_type, primary_stack): static sites stay
+# valid for weeks, fast-moving frontend stacks go stale within a day
+BLUEPRINT_TTLS = {
+    ("static", "static"): 30 * 86400,
+    ("dynamic", "python"): 3 * 86400,
+    ("dynamic", "node"): 2 * 86400,
+    ("dynamic", "nextjs"): 86400,
+    ("dynamic", "vite"): 86400,
+    ("dynamic", "react"): 86400,
+}
+DEFAULT_BLUEPRINT_TTL = 86400
+COMPLEX_BLUEPRINT_TTL = 12 * 3600
+
+def blueprint_ttl(result: dict) -> int:
+    """Cache lifetime for a generated blueprint."""
+    ttl = BLUEPRINT_TTLS.get(
+        (result.get("project_type", "dynamic"), result.get("primary_stack", "")),
+        DEFAULT_BLUEPRINT_TTL
+    )
+    if result.get("complexity") == "complex":
+        ttl = min(ttl, COMPLEX_BLUEPRINT_TTL)
+    return ttl
+
+# Frontend stack detection, checked in order (first match wins):
+# (stack, keywords in the tech_stack string, markers in file paths)
+STACK_DETECTION = (
+    ("nextjs", ("next",), ("next.config", "app/page.tsx")),
+    ("vite", ("vite", "react"), ("vite.config",)),
+)
+
+# Every path marker the safety net cares about, matched in one scan per path
+PATH_MARKER_RE = re.compile(r"next\.config|vite\.config|app/page\.tsx|pages/index\.tsx")
 
-**OBJECTIVE**: Design a MINIMAL, production-ready software system for this request:
-"{user_prompt}"
+# Paths that are not under frontend/ or backend/ but look like web files; they
+# are moved under frontend/. Prefix and hint checks run as one match() per path.
+NEEDS_FRONTEND_PREFIX_RE = re.compile(r"(?!frontend/|backend/).*?(?:\.tsx|\.jsx|\.css|\.html|vite|next|tailwind)")
 
-**TECH STACK PREFERENCE**: {tech_stack}
+# Config files each frontend stack needs; missing ones are added to the blueprint
+STACK_CONFIGS = {
+    "nextjs": (
+        ("frontend/tailwind.config.ts", "Tailwind CSS configuration"),
+        ("frontend/postcss.config.mjs", "PostCSS configuration"),
+        ("frontend/next.config.js", "Next.js configuration"),
+        ("frontend/tsconfig.json", "TypeScript configuration"),
+    ),
+    "vite": (
+        ("frontend/vite.config.js", "Vite configuration"),
+        ("frontend/tailwind.config.js", "Tailwind CSS configuration"),
+        ("frontend/postcss.config.js", "PostCSS configuration"),
+        ("frontend/package.json", "Package manifest"),
+    ),
+}
+
+@lru_cache(maxsize=256)
+def _keyword_stacks(tech_stack_str: str) -> frozenset:
+    """Stacks whose keywords appear in the tech_stack string. Pure, so cached across retries."""
+    lowered = tech_stack_str.lower()
+    return frozenset(stack for stack, keywords, _ in STACK_DETECTION if any(k in lowered for k in keywords))
+
+def find_path_markers(paths) -> set:
+    """Single pass over the blueprint paths collecting every PATH_MARKER_RE hit."""
+    found = set()
+    for p in paths:
+        found.update(PATH_MARKER_RE.findall(p))
+    return found
+
+def detect_frontend_stack(tech_stack_str: str, path_markers: set) -> str:
+    """Returns "nextjs", "vite" or "" for the blueprint's frontend stack."""
+    keyword_hits = _keyword_stacks(tech_stack_str)
+    for stack, _, markers in STACK_DETECTION:
+        if stack in keyword_hits or not path_markers.isdisjoint(markers):
+            return stack
+    return ""
+
+# Built once at import; only the request and stack preference vary per call
+# Static instructions come first and the per-request part last, so every call
+# (and every retry) shares an identical prefix that Gemini can serve from its
+# implicit prompt cache instead of re-processing it.
+ARCHITECT_PREAMBLE = """
+You are The Architect, the brain of ACEA Sentinel.
+
+**OBJECTIVE**: Design a MINIMAL, production-ready software system for the USER REQUEST at the end of this prompt.
 
 **CRITICAL RULES**:
 1. **DEFAULT TO DYNAMIC**: "Dynamic" is the default project type. Only use "static" if the user EXPLICITLY requests a static site (e.g., "static html", "no backend").
@@ -50,131 +143,196 @@ You are The Architect, the brain of ACEA Sentinel.
    - COMPLEX: Max 18-25 files
 
 **OUTPUT FORMAT**: Return ONLY a JSON object (no markdown):
-{{
+{
     "project_name": "string",
     "description": "string",
     "project_type": "dynamic|static",
     "primary_stack": "nextjs|vite|react|python|node|static",
     "rationale": "Short explanation for stack choice",
     "complexity": "simple|medium|complex",
-    "tech_stack": "{tech_stack}",
+    "tech_stack": "string (the TECH STACK PREFERENCE given below, verbatim)",
     "file_structure": [
-        {{"path": "frontend/app/page.tsx", "description": "Main page with game UI"}},
-        {{"path": "backend/app/main.py", "description": "FastAPI server"}}
+        {"path": "frontend/app/page.tsx", "description": "Main page with game UI"},
+        {"path": "backend/app/main.py", "description": "FastAPI server"}
     ],
     "api_endpoints": [],
     "security_policies": ["Input validation", "CORS"]
-}}
+}
 
 **EXAMPLES**:
 1. User: "Make a portfolio" -> project_type: "dynamic", primary_stack: "nextjs"
 2. User: "Static HTML landing page" -> project_type: "static", primary_stack: "static"
 3. User: "Python script" -> project_type: "dynamic", primary_stack: "python"
 """
+
+ARCHITECT_REQUEST = Template("""
+**USER REQUEST**: "$user_prompt"
+
+**TECH STACK PREFERENCE**: $tech_stack
+
+Return JSON only.
+""")
+
+# A short preamble ("Sure! Here is the blueprint:") before the JSON is fine;
+# a response with no "{" this far in is not going to be a blueprint.
+JSON_START_WINDOW = 200
+
+class ArchitectAgent:
+    def __init__(self):
+        self.model = None
+
+    async def _generate_blueprint(self, client, system_prompt: str) -> dict:
+        """
+        Streams one LLM response, abandoning it when no JSON object has started
+        within the first JSON_START_WINDOW characters, then cleans fences,
+        parses and schema-validates it.
+        """
+        chunks = []
+        seen = 0
+        async with aclosing(client.stream(system_prompt, json_mode=True)) as stream:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if seen is not None:
+                    if "{" in chunk:
+                        seen = None
+                    else:
+                        seen += len(chunk)
+                        if seen >= JSON_START_WINDOW:
+                            # Still prose and no object in sight: stop paying for the rest of the generation
+                            head = "".join(chunks)
+                            raise json.JSONDecodeError("Response is not a JSON object", head, 0)
+        return validate_blueprint(orjson.loads(extract_json_object("".join(chunks))))
+
+    async def _race_blueprints(self, client, system_prompt: str, count: int) -> dict:
+        """
+        Runs `count` identical generations concurrently and returns the first
+        one that parses. Cancels the stragglers; re-raises the last error if all fail.
+        """
+        tasks = [asyncio.create_task(self._generate_blueprint(client, system_prompt)) for _ in range(count)]
+        last_error = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except Exception as e:
+                    last_error = e
+            raise last_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def design_system(self, user_prompt: str, tech_stack: str = "Auto-detect") -> dict:
+        """
+        Analyzes the user prompt and generates a MINIMAL, production-ready system architecture.
+        Uses Hybrid client: Gemini API → Ollama fallback.
+        """
+        client = get_hybrid_client()
+        sm = SocketManager()
+        
+        # Initialize Redis (optional, non-blocking)
+        if not cache.ready:
+            await cache.init_redis()
+        
+        # Check Cache
+        # Rephrasings that only differ in case/punctuation/spacing share an entry
+        cache_prompt = normalize_prompt(user_prompt)
+        cached_response = await cache.get(cache_prompt, "architect", tech_stack=tech_stack)
+        if cached_response:
+            sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": "⚡ Retrieved blueprint from cache"})
+            return orjson.loads(cached_response)
+        
+        sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": f"Analyzing requirements (Stack: {tech_stack})..."})
+
+        system_prompt = ARCHITECT_PREAMBLE + ARCHITECT_REQUEST.substitute(user_prompt=user_prompt, tech_stack=tech_stack)
         
         max_attempts = 3
         errors = []
+        prompt = system_prompt
         
         for attempt in range(max_attempts):
 
             try:
-                await sm.emit("agent_log", {"agent_name": "ARCHITECT", "message": f"Generating blueprint (Attempt {attempt+1}/{max_attempts})..."})
+                sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": f"Generating blueprint (Attempt {attempt+1}/{max_attempts})..."})
                 
-                response = await client.generate(system_prompt, json_mode=True)
-                
-                # Clean and parse response
-                cleaned = response.replace("```json", "").replace("```", "").strip()
-                result = json.loads(cleaned)
+                # First attempt is speculative: cuts tail latency on flaky JSON outputs
+                if attempt == 0 and settings.SPECULATIVE_RETRIES:
+                    result = await self._race_blueprints(client, prompt, SPECULATIVE_GENERATIONS)
+                else:
+                    result = await self._generate_blueprint(client, prompt)
                 
                 file_count = len(result.get("file_structure", []))
                 complexity = result.get("complexity", "simple")
                 p_type = result.get("project_type", "dynamic")
                 stack = result.get("primary_stack", "unknown")
                 
-                await sm.emit("agent_log", {"agent_name": "ARCHITECT", "message": f"✅ Blueprint: {result['project_name']} ({p_type}/{stack}, {file_count} files)"})
+                sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": f"✅ Blueprint: {result['project_name']} ({p_type}/{stack}, {file_count} files)"})
                 
                 # --- SAFETY NET: Ensure Config Files Exist & Paths are Correct ---
                 files = result.get("file_structure", [])
                 
                 # 1. Enforce 'frontend/' prefix for web files if missing
                 for f in files:
-                    curr_path = f["path"]
-                    if not curr_path.startswith("frontend/") and not curr_path.startswith("backend/"):
-                        # Heuristic: .tsx, .jsx, .css, .html -> frontend
-                        if any(ext in curr_path for ext in [".tsx", ".jsx", ".css", ".html", "vite", "next", "tailwind"]):
-                            f["path"] = f"frontend/{curr_path}"
+                    # Heuristic: .tsx, .jsx, .css, .html -> frontend
+                    if NEEDS_FRONTEND_PREFIX_RE.match(f["path"]):
+                        f["path"] = f"frontend/{f['path']}"
                             
-                paths = [f["path"] for f in files]
-                added_configs = []
+                files_by_path = {f["path"]: f for f in files}
+                paths = files_by_path.keys()
 
                 # 2. Add Configs based on Stack Detection
                 tech_stack_val = result.get("tech_stack", "")
                 tech_stack_str = tech_stack_val if isinstance(tech_stack_val, str) else " ".join(tech_stack_val) if isinstance(tech_stack_val, list) else str(tech_stack_val)
-                is_nextjs = "next" in tech_stack_str.lower() or any("next.config" in p for p in paths) or any("app/page.tsx" in p for p in paths)
+                path_markers = find_path_markers(paths)
+                frontend_stack = detect_frontend_stack(tech_stack_str, path_markers)
+                is_nextjs = frontend_stack == "nextjs"
                 
                 # FIX: Ensure next.js uses app router structure if detecting nextjs
                 if is_nextjs:
                      # Check if we have app/page.tsx
-                     has_app = any("app/page.tsx" in p for p in paths)
-                     has_pages = any("pages/index.tsx" in p for p in paths)
+                     has_app = "app/page.tsx" in path_markers
+                     has_pages = "pages/index.tsx" in path_markers
                      
                      if not (has_app or has_pages):
                          # Force app directory structure for main page if missing
-                         for f in files:
-                             if f["path"] == "frontend/page.tsx" or f["path"] == "frontend/index.tsx":
-                                 f["path"] = "frontend/app/page.tsx"
+                         for candidate in ("frontend/page.tsx", "frontend/index.tsx"):
+                             if candidate in files_by_path:
+                                 files_by_path[candidate]["path"] = "frontend/app/page.tsx"
                                  
-                is_vite = "vite" in tech_stack_str.lower() or "react" in tech_stack_str.lower() or any("vite.config" in p for p in paths)
-
-                if is_nextjs:
-                    next_configs = {
-                        "frontend/tailwind.config.ts": "Tailwind CSS configuration",
-                        "frontend/postcss.config.mjs": "PostCSS configuration",
-                        "frontend/next.config.js": "Next.js configuration",
-                        "frontend/tsconfig.json": "TypeScript configuration"
-                    }
-                    for path, desc in next_configs.items():
-                        if not any(path in p for p in paths):
-                            files.append({"path": path, "description": desc})
-                            added_configs.append(path)
-                            
-                elif is_vite:
-                     vite_configs = {
-                        "frontend/vite.config.js": "Vite configuration",
-                        "frontend/tailwind.config.js": "Tailwind CSS configuration",
-                        "frontend/postcss.config.js": "PostCSS configuration",
-                        "frontend/package.json": "Package manifest"
-                    }
-                     for path, desc in vite_configs.items():
-                        if not any(path in p for p in paths):
-                            files.append({"path": path, "description": desc})
-                            added_configs.append(path)
+                missing = [(path, desc) for path, desc in STACK_CONFIGS.get(frontend_stack, ()) if path not in paths]
+                files.extend({"path": path, "description": desc} for path, desc in missing)
+                added_configs = [path for path, _ in missing]
                 
                 if added_configs:
                     result["file_structure"] = files
-                    await sm.emit("agent_log", {"agent_name": "ARCHITECT", "message": f"🔧 Architect added missing configs: {len(added_configs)} files"})
+                    sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": f"🔧 Architect added missing configs: {len(added_configs)} files"})
 
                 # Cache successful result
-                await cache.set(user_prompt, "architect", json.dumps(result), tech_stack=tech_stack)
+                cache.set_nowait(cache_prompt, "architect", orjson.dumps(result).decode(), ttl=blueprint_ttl(result), tech_stack=tech_stack)
                 
                 return result
                 
             except json.JSONDecodeError as e:
                 errors.append(f"JSON parse error: {str(e)[:50]}")
-                await sm.emit("agent_log", {"agent_name": "ARCHITECT", "message": f"⚠️ JSON parse error, retrying..."})
-                await asyncio.sleep(1)
-                continue
+                sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": f"⚠️ JSON parse error, retrying..."})
+                # Don't repeat the exact prompt that just produced invalid JSON
+                prompt = system_prompt + JSON_RETRY_SUFFIX
+                
+            except fastjsonschema.JsonSchemaException as e:
+                errors.append(f"Invalid blueprint: {str(e)[:80]}")
+                sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": f"⚠️ Blueprint missing required fields, retrying..."})
+                prompt = system_prompt + JSON_RETRY_SUFFIX
                 
             except Exception as e:
                 error_str = str(e)
                 errors.append(error_str[:100])
-                await sm.emit("agent_log", {"agent_name": "ARCHITECT", "message": f"⚠️ Error: {error_str[:50]}..."})
+                sm.emit_buffered("agent_log", {"agent_name": "ARCHITECT", "message": f"⚠️ Error: {error_str[:50]}..."})
                 
-                # If Ollama not available, don't keep retrying
-                if "Ollama not available" in error_str:
+                # Ollama down, bad credentials etc. won't fix themselves on retry
+                lowered = error_str.lower()
+                if any(marker in lowered for marker in FATAL_ERRORS):
                     break
-                
-                await asyncio.sleep(1)
-                continue
+            
+            if attempt < max_attempts - 1:
+                await asyncio.sleep(backoff_delay(attempt))
 
         return {"error": f"Architect failed after {max_attempts} attempts. Errors: {errors}"}
\ No newline at end of file
@@ -3,10 +3,131 @@
 # Complements Watcher (basic load testing) with deeper quality validation
 
 import asyncio
+import aiohttp
 import json
+from functools import partial
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from app.core.browser_pool import browser_pool
+from app.core.config import settings
+from app.core.socket_manager import SocketManager
+
+# Selectors still driven through Playwright (waits, clicks, fills)
+INTERACTIVE_SELECTOR = "button, a, input"
+BUTTON_SELECTOR = "button"
+TEXT_INPUT_SELECTOR = "input, textarea"
+
+# Interactive element counts plus visible/enabled state of the first 3 buttons
+INTERACTIVITY_SCRIPT = """
+() => {
+    const buttons = [...document.querySelectorAll("button")];
+    return {
+        buttons: buttons.length,
+        links: document.querySelectorAll("a").length,
+        inputs: document.querySelectorAll("input, textarea, select").length,
+        button_states: buttons.slice(0, 3).map(b => {
+            const rect = b.getBoundingClientRect();
+            return {
+                visible: rect.width > 0 && rect.height > 0 && getComputedStyle(b).visibility !== "hidden",
+                enabled: !b.disabled
+            };
+        })
+    };
+}
+"""
+
+# WCAG basics in one pass; label coverage is decided per field, so labeled_inputs
+# can never exceed inputs or double-count a field matched by two rules
+ACCESSIBILITY_SCRIPT = """
+() => {
+    const images = [...document.images];
+    const inputs = [...document.querySelectorAll("input:not([type='hidden']), textarea, select")];
+    const isLabeled = el => el.hasAttribute("aria-label") || el.hasAttribute("aria-labelledby") || el.labels.length > 0;
+    const buttons = [...document.querySelectorAll("button")];
+    return {
+        images: images.length,
+        images_with_alt: images.filter(img => img.hasAttribute("alt")).length,
+        inputs: inputs.length,
+        labeled_inputs: inputs.filter(isLabeled).length,
+        h1: document.querySelectorAll("h1").length,
+        has_nav: !!document.querySelector("nav"),
+        has_main: !!document.querySelector("main"),
+        has_header: !!document.querySelector("header"),
+        buttons: buttons.length,
+        buttons_with_text: buttons.filter(b => b.textContent.trim().length > 0).length
+    };
+}
+"""
+
+# Navigation Timing for the shared navigation, so Python-side event-loop jitter
+# doesn't skew the numbers
+PERFORMANCE_SCRIPT = """
+() => {
+    const perf = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByType('paint').find(e => e.name === 'first-contentful-paint');
+    return {
+        total_load_time_ms: perf.loadEventEnd - perf.startTime,
+        dom_content_loaded: perf.domContentLoadedEventEnd - perf.domContentLoadedEventStart,
+        load_complete: perf.loadEventEnd - perf.loadEventStart,
+        dom_interactive: perf.domInteractive,
+        response_time: perf.responseEnd - perf.requestStart,
+        ttfb: perf.responseStart - perf.requestStart,
+        fcp: fcp ? fcp.startTime : null
+    };
+}
+"""
+
+# Title, meta description and heading counts
+SEO_SCRIPT = """
+() => ({
+    title: document.title,
+    meta_description: document.querySelector('meta[name="description"]')?.getAttribute("content") ?? null,
+    h1: document.querySelectorAll("h1").length,
+    h2: document.querySelectorAll("h2").length
+})
+"""
+
+# Raw href plus the browser-resolved absolute URL of every link
+LINKS_SCRIPT = """
+() => Array.from(document.querySelectorAll("a[href]"), a => [a.getAttribute("href"), a.href])
+"""
+
+# Document scroll width vs. visible width, for horizontal-scroll detection. Waits two
+# animation frames first so a just-resized viewport has finished relayout.
+WIDTHS_SCRIPT = """
+() => new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(() => resolve([
+    document.documentElement.scrollWidth,
+    document.documentElement.clientWidth
+]))))
+"""
+
+# Form count plus submit/required-field checks on the first form
+FORMS_SCRIPT = """
+() => {
+    const form = document.querySelector("form");
+    return {
+        forms: document.forms.length,
+        submit_buttons: form ? form.querySelectorAll('button[type="submit"], input[type="submit"]').length : 0,
+        required_inputs: form ? form.querySelectorAll("input[required], textarea[required], select[required]").length : 0
+    };
+}
+"""
+
+# Structural phases read the loaded DOM through one combined snapshot evaluate
+SNAPSHOT_SCRIPTS = {
+    "accessibility": ACCESSIBILITY_SCRIPT,
+    "seo": SEO_SCRIPT,
+    "links": LINKS_SCRIPT,
+    "forms": FORMS_SCRIPT
+}
+
+# Fixed per-status scores; WARN is scored from its issue count, SKIP is not applicable
+STATUS_SCORES = {"PASS": 100, "FAIL": 0, "SKIP": None}
+
+# Upper bound on in-flight HEAD requests during link checks
+LINK_CHECK_CONCURRENCY = 10
+
 
 class BrowserValidationAgent:
     """
@@ -39,10 +160,9 @@ class BrowserValidationAgent:
         Returns:
             Comprehensive validation report
         """
-        from app.core.socket_manager import SocketManager
         sm = SocketManager()
         
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🌐 Starting comprehensive browser validation..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🌐 Starting comprehensive browser validation..."})
         
         report = {
             "timestamp": datetime.now().isoformat(),
@@ -54,44 +174,78 @@ class BrowserValidationAgent:
         }
         
         try:
-            from playwright.async_api import async_playwright
-            
-            async with async_playwright() as p:
-                # Launch browser
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    viewport={"width": 1920, "height": 1080},
-                    user_agent="Mozilla/5.0 (ACEA Validator Bot)"
-                )
+            # Shared browser; only the context is per-run (and closed below)
+            browser = await browser_pool.get_browser()
+            context = await browser.new_context(
+                viewport={"width": 1920, "height": 1080},
+                user_agent="Mozilla/5.0 (ACEA Validator Bot)"
+            )
+            try:
                 page = await context.new_page()
                 
-                # Run validation tests
-                if validation_level in ["quick", "standard", "thorough"]:
-                    report["tests"]["interactive"] = await self._test_interactivity(page, url, sm)
-                    report["tests"]["accessibility"] = await self._test_accessibility(page, url, sm)
-                    report["tests"]["responsive"] = await self._test_responsiveness(page, url, sm)
+                # Load the page once; every test phase reads the same loaded DOM
+                await self._load_page(page, url)
                 
+                # Structural checks all read the same loaded DOM: snapshot it once
+                structural = ["accessibility"]
                 if validation_level in ["standard", "thorough"]:
-                    report["tests"]["performance"] = await self._test_performance(page, url, sm)
-                    report["tests"]["seo"] = await self._test_seo(page, url, sm)
-                
+                    structural.append("seo")
                 if validation_level == "thorough":
-                    report["tests"]["links"] = await self._test_links(page, url, sm)
-                    report["tests"]["forms"] = await self._test_forms(page, url, sm)
+                    structural += ["links", "forms"]
+                snapshot = await self._dom_snapshot(page, structural)
+                
+                # Run validation tests. The read-only phases only inspect the loaded
+                # DOM (responsive uses its own page), so they run concurrently.
+                phases = {}
+                if validation_level in ["quick", "standard", "thorough"]:
+                    phases["accessibility"] = partial(self._test_accessibility, snapshot=snapshot)
+                    phases["responsive"] = self._test_responsiveness
                 
-                await browser.close()
+                if validation_level in ["standard", "thorough"]:
+                    phases["performance"] = self._test_performance
+                    phases["seo"] = partial(self._test_seo, snapshot=snapshot)
                 
-                # Calculate overall score
-                report["scores"] = self._calculate_scores(report["tests"])
-                report["overall_status"] = self._determine_status(report["scores"])
+                tests = await self._run_phases(phases, page, url, sm)
                 
-                await sm.emit("agent_log", {
-                    "agent_name": "BROWSER_VALIDATOR", 
-                    "message": f"✅ Validation complete. Status: {report['overall_status']}"
-                })
+                # Interactivity clicks buttons and fills inputs, so it runs alone after the
+                # read-only phases; it goes first in the report and counts toward the early-exit score
+                if validation_level in ["quick", "standard", "thorough"]:
+                    tests = {"interactive": await self._test_interactivity(page, url, sm), **tests}
+                
+                if validation_level == "thorough":
+                    provisional = self._calculate_scores(tests)["overall"]
+                    if provisional < settings.BROWSER_EARLY_EXIT_SCORE:
+                        # Already failing badly; deep link/form checks would not change the verdict
+                        sm.emit_buffered("agent_log", {
+                            "agent_name": "BROWSER_VALIDATOR",
+                            "message": f"⏭️ Score {provisional} after core checks; skipping link and form checks"
+                        })
+                        skipped = {"status": "SKIP", "issues": [], "reason": "Skipped early: core checks already poor"}
+                        tests["links"] = dict(skipped)
+                        tests["forms"] = dict(skipped)
+                    else:
+                        tests.update(await self._run_phases(
+                            {
+                                "links": partial(self._test_links, snapshot=snapshot),
+                                "forms": partial(self._test_forms, snapshot=snapshot)
+                            },
+                            page, url, sm
+                        ))
+                report["tests"] = tests
+            finally:
+                await context.close()
+            
+            # Calculate overall score
+            report["scores"] = self._calculate_scores(report["tests"])
+            report["overall_status"] = self._determine_status(report["scores"])
+            
+            sm.emit_buffered("agent_log", {
+                "agent_name": "BROWSER_VALIDATOR", 
+                "message": f"✅ Validation complete. Status: {report['overall_status']}"
+            })
         
         except ImportError:
-            await sm.emit("agent_log", {
+            sm.emit_buffered("agent_log", {
                 "agent_name": "BROWSER_VALIDATOR", 
                 "message": "⚠️ Playwright not installed. Skipping validation."
             })
@@ -99,7 +253,7 @@ class BrowserValidationAgent:
             report["error"] = "Playwright not available"
         
         except Exception as e:
-            await sm.emit("agent_log", {
+            sm.emit_buffered("agent_log", {
                 "agent_name": "BROWSER_VALIDATOR", 
                 "message": f"❌ Validation error: {str(e)[:100]}"
             })
@@ -108,11 +262,44 @@ class BrowserValidationAgent:
         
         return report
     
+    async def _run_phases(self, phases: Dict[str, Any], page, url: str, sm) -> Dict[str, Any]:
+        """Runs read-only test phases concurrently, keyed by phase name."""
+        results = await asyncio.gather(*(test(page, url, sm) for test in phases.values()))
+        return dict(zip(phases, results))
+    
+    async def _dom_snapshot(self, page, names: List[str]) -> Dict[str, Any]:
+        """
+        Reads the inputs of several structural phases in one round-trip.
+        Each phase's own script runs in the page and its result is keyed by phase name.
+        If the combined evaluate fails every part is None, and each phase falls
+        back to its own evaluate inside its own error handling.
+        """
+        script = "() => ({" + ", ".join(
+            f"{name}: ({SNAPSHOT_SCRIPTS[name].strip()})()" for name in names
+        ) + "})"
+        try:
+            return await page.evaluate(script)
+        except Exception:
+            return dict.fromkeys(names)
+    
+    async def _from_snapshot(self, page, snapshot: Optional[Dict[str, Any]], name: str, script: str):
+        """A phase's DOM data from the shared snapshot, or its own evaluate when that part is missing."""
+        part = snapshot.get(name) if snapshot else None
+        return part if part is not None else await page.evaluate(script)
+    
+    async def _load_page(self, page, url: str):
+        """
+        Navigates once for all test phases.
+        Waits for the load event rather than networkidle: the phases only read
+        the DOM, and analytics beacons can keep the network busy for seconds.
+        """
+        await page.goto(url, wait_until="load", timeout=30000)
+    
     async def _test_interactivity(self, page, url: str, sm) -> Dict[str, Any]:
         """
         Tests interactive elements: buttons, links, inputs.
         """
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🖱️ Testing interactivity..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🖱️ Testing interactivity..."})
         
         results = {
             "status": "PASS",
@@ -121,13 +308,15 @@ class BrowserValidationAgent:
         }
         
         try:
-            # Navigate to page
-            await page.goto(url, wait_until="networkidle", timeout=15000)
+            # Give client-rendered UIs a moment to attach controls (hydration)
+            try:
+                await page.wait_for_selector(INTERACTIVE_SELECTOR, timeout=2000, state="attached")
+            except Exception:
+                pass  # Page may legitimately have no interactive elements
             
-            # Find all interactive elements
-            buttons = await page.locator("button").count()
-            links = await page.locator("a").count()
-            inputs = await page.locator("input, textarea, select").count()
+            # Count interactive elements and read the sampled buttons' state in one round-trip
+            dom = await page.evaluate(INTERACTIVITY_SCRIPT)
+            buttons, links, inputs = dom["buttons"], dom["links"], dom["inputs"]
             
             results["interactive_elements"] = {
                 "buttons": buttons,
@@ -135,13 +324,14 @@ class BrowserValidationAgent:
                 "inputs": inputs
             }
             
-            # Test button clicks (sample first 3 buttons)
-            button_test_count = min(buttons, 3)
-            for i in range(button_test_count):
+            # Test button clicks (sample first 3 buttons). Handles are resolved once
+            # rather than re-running the selector for every click.
+            button_handles = await page.locator(BUTTON_SELECTOR).element_handles() if buttons else []
+            clicked = False
+            for i, state in enumerate(dom["button_states"]):
                 try:
-                    button = page.locator("button").nth(i)
-                    is_visible = await button.is_visible()
-                    is_enabled = await button.is_enabled()
+                    is_visible = state["visible"]
+                    is_enabled = state["enabled"]
                     
                     if not is_visible:
                         results["issues"].append(f"Button {i+1} is not visible")
@@ -150,16 +340,19 @@ class BrowserValidationAgent:
                     
                     # Try clicking (but don't wait for navigation)
                     if is_visible and is_enabled:
-                        await button.click(timeout=1000)
-                        await asyncio.sleep(0.5)  # Brief pause to see if anything happens
+                        await button_handles[i].click(timeout=1000, no_wait_after=True)
+                        clicked = True
                 
                 except Exception as e:
                     results["issues"].append(f"Button {i+1} click failed: {str(e)[:50]}")
             
+            if clicked:
+                await asyncio.sleep(0.5)  # One brief pause to see if anything happens
+            
             # Test input fields (check if they accept input)
             if inputs > 0:
                 try:
-                    first_input = page.locator("input, textarea").first
+                    first_input = page.locator(TEXT_INPUT_SELECTOR).first
                     await first_input.fill("test", timeout=2000)
                     value = await first_input.input_value()
                     if value != "test":
@@ -169,12 +362,12 @@ class BrowserValidationAgent:
             
             if results["issues"]:
                 results["status"] = "WARN"
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"⚠️ Found {len(results['issues'])} interactivity issues"
                 })
             else:
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"✅ Interactive elements working ({buttons} buttons, {links} links, {inputs} inputs)"
                 })
@@ -185,11 +378,11 @@ class BrowserValidationAgent:
         
         return results
     
-    async def _test_accessibility(self, page, url: str, sm) -> Dict[str, Any]:
+    async def _test_accessibility(self, page, url: str, sm, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Tests accessibility: ARIA labels, semantic HTML, keyboard navigation.
         """
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "♿ Testing accessibility..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "♿ Testing accessibility..."})
         
         results = {
             "status": "PASS",
@@ -198,13 +391,12 @@ class BrowserValidationAgent:
         }
         
         try:
-            await page.goto(url, wait_until="networkidle", timeout=15000)
-            
-            # Check for basic accessibility features
+            # Check for basic accessibility features (all counts in one round-trip)
+            dom = await self._from_snapshot(page, snapshot, "accessibility", ACCESSIBILITY_SCRIPT)
             
             # 1. Alt text on images
-            images = await page.locator("img").count()
-            images_with_alt = await page.locator("img[alt]").count()
+            images = dom["images"]
+            images_with_alt = dom["images_with_alt"]
             
             results["wcag_checks"]["images_total"] = images
             results["wcag_checks"]["images_with_alt"] = images_with_alt
@@ -213,8 +405,8 @@ class BrowserValidationAgent:
                 results["issues"].append(f"{images - images_with_alt} images missing alt text")
             
             # 2. Form labels
-            inputs = await page.locator("input:not([type='hidden'])").count()
-            labeled_inputs = await page.locator("input[aria-label], input[id]:has(+ label), label > input").count()
+            inputs = dom["inputs"]
+            labeled_inputs = dom["labeled_inputs"]
             
             results["wcag_checks"]["inputs_total"] = inputs
             results["wcag_checks"]["labeled_inputs"] = labeled_inputs
@@ -223,7 +415,7 @@ class BrowserValidationAgent:
                 results["issues"].append(f"{inputs - labeled_inputs} inputs missing labels")
             
             # 3. Heading hierarchy
-            h1_count = await page.locator("h1").count()
+            h1_count = dom["h1"]
             
             results["wcag_checks"]["h1_count"] = h1_count
             
@@ -233,9 +425,9 @@ class BrowserValidationAgent:
                 results["issues"].append(f"Multiple H1 headings ({h1_count}) - should have only one")
             
             # 4. Semantic HTML
-            has_nav = await page.locator("nav").count() > 0
-            has_main = await page.locator("main").count() > 0
-            has_header = await page.locator("header").count() > 0
+            has_nav = dom["has_nav"]
+            has_main = dom["has_main"]
+            has_header = dom["has_header"]
             
             results["wcag_checks"]["semantic_html"] = {
                 "has_nav": has_nav,
@@ -247,8 +439,8 @@ class BrowserValidationAgent:
                 results["issues"].append("Missing <main> landmark")
             
             # 5. Button accessibility
-            buttons = await page.locator("button").count()
-            buttons_with_text = await page.locator("button:has-text(/\\w+/)").count()
+            buttons = dom["buttons"]
+            buttons_with_text = dom["buttons_with_text"]
             
             if buttons > 0 and buttons_with_text < buttons:
                 results["issues"].append(f"{buttons - buttons_with_text} buttons without text content")
@@ -256,18 +448,18 @@ class BrowserValidationAgent:
             # Determine status
             if len(results["issues"]) > 5:
                 results["status"] = "FAIL"
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"❌ Accessibility: {len(results['issues'])} critical issues"
                 })
             elif len(results["issues"]) > 0:
                 results["status"] = "WARN"
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"⚠️ Accessibility: {len(results['issues'])} minor issues"
                 })
             else:
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": "✅ Accessibility checks passed"
                 })
@@ -282,7 +474,7 @@ class BrowserValidationAgent:
         """
         Tests responsive design across different viewport sizes.
         """
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "📱 Testing responsiveness..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "📱 Testing responsiveness..."})
         
         results = {
             "status": "PASS",
@@ -296,15 +488,44 @@ class BrowserValidationAgent:
             "desktop": {"width": 1920, "height": 1080}
         }
         
+        async def read_widths(target):
+            # Check for horizontal scroll (bad UX on mobile); both widths in one round-trip
+            scroll_width, client_width = await target.evaluate(WIDTHS_SCRIPT)
+            return scroll_width, client_width
+        
+        # The shared page is already at the desktop size and is read as-is. The other
+        # sizes share one extra page, loaded once and resized in place, so the shared
+        # page that the other phases are reading concurrently is never resized.
+        resized = {device: size for device, size in viewports.items() if size != page.viewport_size}
+        
+        async def measure_resized():
+            if not resized:
+                return []
+            sizes = list(resized.values())
+            context = await page.context.browser.new_context(viewport=sizes[0])
+            try:
+                viewport_page = await context.new_page()
+                # Only layout matters here, not idle network
+                await viewport_page.goto(url, wait_until="domcontentloaded", timeout=15000)
+                widths = [await read_widths(viewport_page)]
+                for size in sizes[1:]:
+                    # Chromium relayouts on resize; WIDTHS_SCRIPT waits for the next frame
+                    await viewport_page.set_viewport_size(size)
+                    widths.append(await read_widths(viewport_page))
+                return widths
+            finally:
+                await context.close()
+        
+        async def measure_shared():
+            return [await read_widths(page) for device in viewports if device not in resized]
+        
         try:
-            for device, size in viewports.items():
-                await page.set_viewport_size(size)
-                await page.goto(url, wait_until="networkidle", timeout=15000)
-                
-                # Check for horizontal scroll (bad UX on mobile)
-                scroll_width = await page.evaluate("document.documentElement.scrollWidth")
-                client_width = await page.evaluate("document.documentElement.clientWidth")
-                
+            resized_widths, shared_widths = await asyncio.gather(measure_resized(), measure_shared())
+            measured = dict(zip(resized, resized_widths))
+            measured.update(zip((device for device in viewports if device not in resized), shared_widths))
+            widths = [measured[device] for device in viewports]
+            
+            for (device, size), (scroll_width, client_width) in zip(viewports.items(), widths):
                 has_horizontal_scroll = scroll_width > client_width
                 
                 results["viewports"][device] = {
@@ -319,12 +540,12 @@ class BrowserValidationAgent:
                     results["status"] = "WARN"
             
             if results["status"] == "PASS":
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": "✅ Responsive design validated across 3 viewports"
                 })
             else:
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"⚠️ Responsiveness: {len(results['issues'])} issues"
                 })
@@ -339,7 +560,7 @@ class BrowserValidationAgent:
         """
         Tests performance: load time, resource counts, basic metrics.
         """
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "⚡ Testing performance..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "⚡ Testing performance..."})
         
         results = {
             "status": "PASS",
@@ -348,29 +569,13 @@ class BrowserValidationAgent:
         }
         
         try:
-            # Measure load time
-            start_time = asyncio.get_event_loop().time()
-            
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            load_time = (asyncio.get_event_loop().time() - start_time) * 1000  # ms
-            
-            # Get performance metrics
-            performance_metrics = await page.evaluate("""
-                () => {
-                    const perf = performance.getEntriesByType('navigation')[0];
-                    return {
-                        dom_content_loaded: perf.domContentLoadedEventEnd - perf.domContentLoadedEventStart,
-                        load_complete: perf.loadEventEnd - perf.loadEventStart,
-                        dom_interactive: perf.domInteractive,
-                        response_time: perf.responseEnd - perf.requestStart
-                    };
-                }
-            """)
+            # All timings come from the browser's Navigation Timing entry
+            performance_metrics = await page.evaluate(PERFORMANCE_SCRIPT)
+            load_time = performance_metrics["total_load_time_ms"]  # ms
             
             results["metrics"] = {
-                "total_load_time_ms": round(load_time, 2),
-                **performance_metrics
+                **performance_metrics,
+                "total_load_time_ms": round(load_time, 2)
             }
             
             # Performance thresholds
@@ -383,12 +588,12 @@ class BrowserValidationAgent:
                 results["status"] = "WARN"
             
             if results["status"] == "PASS":
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"✅ Performance: {round(load_time)}ms load time"
                 })
             else:
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"⚠️ Performance issues detected"
                 })
@@ -399,11 +604,11 @@ class BrowserValidationAgent:
         
         return results
     
-    async def _test_seo(self, page, url: str, sm) -> Dict[str, Any]:
+    async def _test_seo(self, page, url: str, sm, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Tests basic SEO: title, meta description, headings.
         """
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🔍 Testing SEO..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🔍 Testing SEO..."})
         
         results = {
             "status": "PASS",
@@ -412,10 +617,11 @@ class BrowserValidationAgent:
         }
         
         try:
-            await page.goto(url, wait_until="networkidle", timeout=15000)
+            # Read title, meta description and heading counts in one round-trip
+            dom = await self._from_snapshot(page, snapshot, "seo", SEO_SCRIPT)
             
             # Check title
-            title = await page.title()
+            title = dom["title"]
             results["seo_elements"]["title"] = title
             
             if not title or len(title) < 10:
@@ -424,7 +630,7 @@ class BrowserValidationAgent:
                 results["issues"].append(f"Title too long ({len(title)} chars, recommend < 60)")
             
             # Check meta description
-            meta_desc = await page.locator('meta[name="description"]').get_attribute("content")
+            meta_desc = dom["meta_description"]
             results["seo_elements"]["meta_description"] = meta_desc
             
             if not meta_desc:
@@ -433,8 +639,8 @@ class BrowserValidationAgent:
                 results["issues"].append(f"Meta description too long ({len(meta_desc)} chars)")
             
             # Check heading structure
-            h1_count = await page.locator("h1").count()
-            h2_count = await page.locator("h2").count()
+            h1_count = dom["h1"]
+            h2_count = dom["h2"]
             
             results["seo_elements"]["headings"] = {
                 "h1": h1_count,
@@ -449,12 +655,12 @@ class BrowserValidationAgent:
             # Determine status
             if len(results["issues"]) > 3:
                 results["status"] = "WARN"
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"⚠️ SEO: {len(results['issues'])} issues"
                 })
             else:
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": "✅ SEO basics validated"
                 })
@@ -465,11 +671,11 @@ class BrowserValidationAgent:
         
         return results
     
-    async def _test_links(self, page, url: str, sm) -> Dict[str, Any]:
+    async def _test_links(self, page, url: str, sm, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Tests all links on the page to ensure they're not broken.
         """
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🔗 Testing links..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "🔗 Testing links..."})
         
         results = {
             "status": "PASS",
@@ -478,36 +684,42 @@ class BrowserValidationAgent:
         }
         
         try:
-            await page.goto(url, wait_until="networkidle", timeout=15000)
-            
-            # Get all links
-            links = await page.locator("a[href]").all()
+            # Get all links in one round-trip; a.href is already resolved to an absolute URL
+            links = await self._from_snapshot(page, snapshot, "links", LINKS_SCRIPT)
             
             total_links = len(links)
             broken_links = []
             
-            # Test first 10 links (to avoid timeout)
-            test_count = min(total_links, 10)
-            
-            for i in range(test_count):
-                try:
-                    href = await links[i].get_attribute("href")
-                    
-                    # Skip anchors and javascript links
-                    if href and not href.startswith("#") and not href.startswith("javascript:"):
-                        # Check if link is valid (basic check)
-                        if href.startswith("http"):
-                            # External link - just note it
-                            pass
-                        elif href.startswith("/"):
-                            # Internal link - could test but skip for now
-                            pass
-                        else:
-                            # Relative link
-                            pass
-                
-                except Exception as e:
-                    broken_links.append(f"Link {i+1}: {str(e)[:50]}")
+            # Skip anchors and javascript/mailto links; test the first 10 distinct targets (to avoid timeout)
+            targets = list(dict.fromkeys(
+                absolute for href, absolute in links
+                if href and not href.startswith("#") and absolute.startswith("http")
+            ))[:10]
+            test_count = len(targets)
+            
+            # HEAD every target concurrently over one pooled session, bounded by a semaphore
+            semaphore = asyncio.Semaphore(LINK_CHECK_CONCURRENCY)
+            
+            async def check(session, target):
+                async with semaphore:
+                    try:
+                        return await self._head_status(session, target)
+                    except Exception as e:
+                        return e  # Reported as a broken link rather than cancelling the group
+            
+            async with aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=LINK_CHECK_CONCURRENCY),
+                timeout=aiohttp.ClientTimeout(total=3)
+            ) as session:
+                async with asyncio.TaskGroup() as group:
+                    tasks = [group.create_task(check(session, target)) for target in targets]
+            statuses = [task.result() for task in tasks]
+            
+            for i, (target, status) in enumerate(zip(targets, statuses)):
+                if isinstance(status, Exception):
+                    broken_links.append(f"Link {i+1}: {type(status).__name__} ({target[:80]})")
+                elif status >= 400 and status != 405:  # Some servers just don't allow HEAD
+                    broken_links.append(f"Link {i+1}: HTTP {status} ({target[:80]})")
             
             results["link_summary"] = {
                 "total_links": total_links,
@@ -519,12 +731,12 @@ class BrowserValidationAgent:
             
             if broken_links:
                 results["status"] = "WARN"
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"⚠️ Found {len(broken_links)} problematic links"
                 })
             else:
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"✅ Links validated ({test_count} tested)"
                 })
@@ -535,11 +747,16 @@ class BrowserValidationAgent:
         
         return results
     
-    async def _test_forms(self, page, url: str, sm) -> Dict[str, Any]:
+    async def _head_status(self, session, link_url: str) -> int:
+        """Returns the HTTP status of a HEAD request, following redirects."""
+        async with session.head(link_url, allow_redirects=True) as resp:
+            return resp.status
+    
+    async def _test_forms(self, page, url: str, sm, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Tests form functionality and validation.
         """
-        await sm.emit("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "📝 Testing forms..."})
+        sm.emit_buffered("agent_log", {"agent_name": "BROWSER_VALIDATOR", "message": "📝 Testing forms..."})
         
         results = {
             "status": "PASS",
@@ -548,43 +765,39 @@ class BrowserValidationAgent:
         }
         
         try:
-            await page.goto(url, wait_until="networkidle", timeout=15000)
-            
-            # Find forms
-            forms = await page.locator("form").count()
+            # Find forms and inspect the first one in one round-trip
+            dom = await self._from_snapshot(page, snapshot, "forms", FORMS_SCRIPT)
+            forms = dom["forms"]
             
             results["form_summary"]["total_forms"] = forms
             
             if forms == 0:
                 results["status"] = "SKIP"
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": "ℹ️ No forms found to test"
                 })
                 return results
             
-            # Test first form
-            form = page.locator("form").first
-            
-            # Check for submit button
-            submit_buttons = await form.locator('button[type="submit"], input[type="submit"]').count()
+            # Check for submit button (first form)
+            submit_buttons = dom["submit_buttons"]
             
             if submit_buttons == 0:
                 results["issues"].append("Form missing submit button")
             
             # Check for required fields
-            required_inputs = await form.locator("input[required], textarea[required], select[required]").count()
+            required_inputs = dom["required_inputs"]
             
             results["form_summary"]["required_fields"] = required_inputs
             
             if results["issues"]:
                 results["status"] = "WARN"
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"⚠️ Form validation: {len(results['issues'])} issues"
                 })
             else:
-                await sm.emit("agent_log", {
+                sm.emit_buffered("agent_log", {
                     "agent_name": "BROWSER_VALIDATOR", 
                     "message": f"✅ Form structure validated ({forms} forms)"
                 })
@@ -600,24 +813,24 @@ class BrowserValidationAgent:
         Calculates scores (0-100) for each test category.
         """
         scores = {}
+        total = 0
+        counted = 0
         
         for test_name, test_result in tests.items():
-            if test_result.get("status") == "PASS":
-                scores[test_name] = 100
-            elif test_result.get("status") == "WARN":
+            status = test_result.get("status")
+            if status == "WARN":
                 # Score based on issue count
-                issue_count = len(test_result.get("issues", []))
-                scores[test_name] = max(50, 100 - (issue_count * 10))
-            elif test_result.get("status") == "FAIL":
-                scores[test_name] = 0
-            elif test_result.get("status") == "SKIP":
-                scores[test_name] = None  # Not applicable
+                score = max(50, 100 - (len(test_result.get("issues", ())) * 10))
             else:
-                scores[test_name] = 50  # ERROR or unknown
+                score = STATUS_SCORES.get(status, 50)  # ERROR or unknown -> 50
+            scores[test_name] = score
+            
+            # Overall score is the average of non-None (non-SKIP) scores
+            if score is not None:
+                total += score
+                counted += 1
         
-        # Calculate overall score (average of non-None scores)
-        valid_scores = [s for s in scores.values() if s is not None]
-        scores["overall"] = round(sum(valid_scores) / len(valid_scores)) if valid_scores else 0
+        scores["overall"] = round(total / counted) if counted else 0
         
         return scores
     
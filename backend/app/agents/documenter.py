@@ -2,7 +2,42 @@
 # Generates README.md and documentation
 
 import json
+import re
 from typing import Dict, List
+from app.core.local_model import get_hybrid_client
+from app.core.socket_manager import SocketManager
+
+# Model output sometimes arrives wrapped in one ```markdown fence; inner code blocks are kept
+README_FENCE_RE = re.compile(r"\s*```(?:markdown|md)?[ \t]*\n(.*?)\n?```\s*", re.S)
+
+README_TEMPLATE = """# {name}
+
+## Description
+{description}
+
+## Tech Stack
+{stack}
+
+## Project Structure
+```
+{file_tree}
+```
+
+## Installation
+```bash
+npm install   # For Node.js projects
+pip install -r requirements.txt   # For Python projects
+```
+
+## Running the Project
+```bash
+npm start   # For Node.js projects
+python main.py   # For Python projects
+```
+
+## License
+MIT
+"""
 
 
 class DocumenterAgent:
@@ -17,10 +52,7 @@ class DocumenterAgent:
         
         Returns: README content as markdown string
         """
-        from app.core.local_model import HybridModelClient
-        from app.core.socket_manager import SocketManager
-        
-        client = HybridModelClient()
+        client = get_hybrid_client()
         sm = SocketManager()
         
         await sm.emit("agent_log", {"agent_name": "DOCUMENTER", "message": "Generating README.md..."})
@@ -71,8 +103,9 @@ Return ONLY the markdown content, no code blocks.
         try:
             readme = await client.generate(prompt)
             
-            # Clean up any markdown code blocks
-            readme = readme.replace("```markdown", "").replace("```", "").strip()
+            # Clean up a wrapping markdown code block
+            wrapped = README_FENCE_RE.fullmatch(readme)
+            readme = (wrapped.group(1) if wrapped else readme).strip()
             
             await sm.emit("agent_log", {"agent_name": "DOCUMENTER", "message": "✅ README.md generated"})
             return readme
@@ -83,36 +116,9 @@ Return ONLY the markdown content, no code blocks.
     
     def _fallback_readme(self, blueprint: dict, files: List[str], user_prompt: str) -> str:
         """Generate basic README without API call."""
-        name = blueprint.get('project_name', 'Project')
-        stack = blueprint.get('tech_stack', 'Unknown')
-        
-        file_tree = "\n".join(f"├── {f}" for f in files[:15])
-        
-        return f"""# {name}
-
-## Description
-{blueprint.get('description', user_prompt)}
-
-## Tech Stack
-{stack}
-
-## Project Structure
-```
-{file_tree}
-```
-
-## Installation
-```bash
-npm install   # For Node.js projects
-pip install -r requirements.txt   # For Python projects
-```
-
-## Running the Project
-```bash
-npm start   # For Node.js projects
-python main.py   # For Python projects
-```
-
-## License
-MIT
-"""
+        return README_TEMPLATE.format(
+            name=blueprint.get('project_name', 'Project'),
+            description=blueprint.get('description', user_prompt),
+            stack=blueprint.get('tech_stack', 'Unknown'),
+            file_tree="\n".join(["├── " + f for f in files[:15]])
+        )
@@ -1,7 +1,8 @@
 import subprocess
 import os
 import sys
-from app.core.config import settings
+from app.core.local_model import get_hybrid_client
+from app.core.model_response import strip_code_fences
 class OracleAgent:
     def __init__(self):
         pass
@@ -10,22 +11,13 @@ class OracleAgent:
         """
         Generates test code using Gemini via HybridModelClient.
         """
-        from app.core.local_model import HybridModelClient
-        client = HybridModelClient()
+        client = get_hybrid_client()
         
         prompt = f"Generate {language} unit tests for this code using pytest/vitest. Return ONLY code, no markdown blocks:\n{code}"
         try:
             response = await client.generate(prompt)
             # Clean markdown and common identifiers
-            code = response.replace("```python", "").replace("```typescript", "").replace("```javascript", "").replace("```", "").strip()
-            
-            # Extra safety: Remove bare language identifiers
-            import re
-            for lang in ["python", "pytest", "javascript", "typescript"]:
-                if re.match(f"^{lang}\\s+", code, re.IGNORECASE):
-                    code = re.sub(f"^{lang}\\s+", "", code, flags=re.IGNORECASE).strip()
-            
-            return code
+            return strip_code_fences(response)
         except Exception as e:
             return f"# Error generating tests: {e}"
 
@@ -3,13 +3,418 @@
 
 import os
 import json
+import asyncio
+import orjson
+import posixpath
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from enum import Enum
 from app.core.filesystem import BASE_PROJECTS_DIR, archive_project
+from app.core.socket_manager import SocketManager
+from app.agents.documenter import DocumenterAgent
+
+# Dependency, VCS and cache directories are never part of a release and are not descended into
+SKIP_DIRS = frozenset(("node_modules", ".git", "__pycache__", "venv"))
+
+# A project with none of these has no recognizable entry point
+ENTRY_POINT_FILES = frozenset(("package.json", "requirements.txt", "main.py", "app.py", "index.html"))
+
+# Blueprint tech-stack keywords (matched as substrings, e.g. "next" in "Next.js"),
+# and what each implies, in priority order
+STACK_KEYWORD_RE = re.compile("next|react|vue|fastapi|flask|python|express|node")
+_PYTHON_BACKEND = {"language": "python", "type": "backend", "has_backend": True}
+_NODE_BACKEND = {"framework": "express", "type": "backend", "has_backend": True}
+STACK_RULES = (
+    ("next", {"framework": "nextjs", "type": "frontend"}),
+    ("react", {"framework": "react", "type": "frontend"}),
+    ("vue", {"framework": "vue", "type": "frontend"}),
+    ("fastapi", {**_PYTHON_BACKEND, "framework": "fastapi"}),
+    ("python", {**_PYTHON_BACKEND, "framework": "flask"}),
+    ("flask", {**_PYTHON_BACKEND, "framework": "flask"}),
+    ("node", _NODE_BACKEND),
+    ("express", _NODE_BACKEND),
+)
+
+# .gitignore for projects that lack one, kept as bytes so writing it needs no encoding step
+GITIGNORE_BASE = b"""# Dependencies
+node_modules/
+venv/
+__pycache__/
+*.pyc
+.env
+.env.local
+
+# Build outputs
+dist/
+build/
+.next/
+out/
+
+# IDE
+.idea/
+.vscode/
+*.swp
+
+# OS
+.DS_Store
+Thumbs.db
+
+# Logs
+*.log
+npm-debug.log*
+"""
+
+# Python projects also ignore packaging and test/coverage output
+GITIGNORE_PYTHON = GITIGNORE_BASE + b"""
+# Python
+*.egg-info/
+.eggs/
+.pytest_cache/
+htmlcov/
+.coverage
+"""
+
+
+# Deployment config files. They are static apart from the framework/language
+# variant, so each variant is one module constant picked by a lookup.
+DOCKERFILE_PYTHON = """# Python Application Dockerfile
+FROM python:3.11-slim
+
+WORKDIR /app
+
+# Install dependencies
+COPY requirements.txt .
+RUN pip install --no-cache-dir -r requirements.txt
+
+# Copy application
+COPY . .
+
+# Expose port
+EXPOSE 8000
+
+# Run application
+CMD ["python", "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
+"""
+
+DOCKERFILE_NEXTJS = """# Next.js Application Dockerfile
+FROM node:20-alpine AS base
+
+# Install dependencies only when needed
+FROM base AS deps
+WORKDIR /app
+COPY package.json package-lock.json* ./
+RUN npm ci
+
+# Build the application
+FROM base AS builder
+WORKDIR /app
+COPY --from=deps /app/node_modules ./node_modules
+COPY . .
+RUN npm run build
+
+# Production image
+FROM base AS runner
+WORKDIR /app
+ENV NODE_ENV=production
+
+COPY --from=builder /app/public ./public
+COPY --from=builder /app/.next/standalone ./
+COPY --from=builder /app/.next/static ./.next/static
+
+EXPOSE 3000
+ENV PORT=3000
+CMD ["node", "server.js"]
+"""
 
+DOCKERFILE_NODE = """# Node.js Application Dockerfile
+FROM node:20-alpine
+
+WORKDIR /app
+
+# Install dependencies
+COPY package*.json ./
+RUN npm ci --only=production
+
+# Copy application
+COPY . .
+
+# Build if needed
+RUN npm run build --if-present
+
+# Expose port
+EXPOSE 3000
+
+# Run application
+CMD ["npm", "start"]
+"""
+
+NETLIFY_TOML = {
+    "nextjs": """[build]
+  command = "npm run build"
+  publish = ".next"
+
+[[plugins]]
+  package = "@netlify/plugin-nextjs"
+""",
+    "react": """[build]
+  command = "npm run build"
+  publish = "build"
+
+[[redirects]]
+  from = "/*"
+  to = "/index.html"
+  status = 200
+""",
+}
+
+NETLIFY_TOML_STATIC = """[build]
+  publish = "dist"
+
+[[redirects]]
+  from = "/*"
+  to = "/index.html"
+  status = 200
+"""
+
+GITHUB_PAGES_WORKFLOW = """name: Deploy to GitHub Pages
+
+on:
+  push:
+    branches: [main]
+  workflow_dispatch:
+
+permissions:
+  contents: read
+  pages: write
+  id-token: write
+
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - uses: actions/setup-node@v4
+        with:
+          node-version: 20
+          cache: npm
+      - run: npm ci
+      - run: npm run build
+      - uses: actions/upload-pages-artifact@v3
+        with:
+          path: ./dist
+
+  deploy:
+    needs: build
+    runs-on: ubuntu-latest
+    environment:
+      name: github-pages
+      url: ${{ steps.deployment.outputs.page_url }}
+    steps:
+      - uses: actions/deploy-pages@v4
+        id: deployment
+"""
+
+
+# GitHub Actions CI workflow, one per language
+CI_WORKFLOW_PYTHON = """name: CI
+
+on:
+  push:
+    branches: [main]
+  pull_request:
+    branches: [main]
+
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - uses: actions/setup-python@v5
+        with:
+          python-version: '3.11'
+      - run: pip install -r requirements.txt
+      - run: pip install pytest
+      - run: pytest --tb=short
+"""
+
+CI_WORKFLOW_NODE = """name: CI
+
+on:
+  push:
+    branches: [main]
+  pull_request:
+    branches: [main]
+
+jobs:
+  test:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - uses: actions/setup-node@v4
+        with:
+          node-version: 20
+          cache: npm
+      - run: npm ci
+      - run: npm run lint --if-present
+      - run: npm test --if-present
+      - run: npm run build
+"""
+
+# railway.json takes no parameters, so it is serialized once
+RAILWAY_JSON = json.dumps({
+    "$schema": "https://railway.app/railway.schema.json",
+    "build": {
+        "builder": "NIXPACKS"
+    },
+    "deploy": {
+        "numReplicas": 1,
+        "restartPolicyType": "ON_FAILURE",
+        "restartPolicyMaxRetries": 10
+    }
+}, indent=2)
+
+
+def _slugify(name: str) -> str:
+    """Project name as used in deploy configs: lowercase, spaces as hyphens."""
+    return name.lower().replace(" ", "-")
+
+@lru_cache(maxsize=64)
+def _build_vercel_json(framework: str, name: str) -> str:
+    """vercel.json for a framework and project name slug; repeated releases reuse the text."""
+    config = {
+        "version": 2,
+        "name": name,
+        "builds": [],
+        "routes": []
+    }
+    
+    if framework == "nextjs":
+        config["framework"] = "nextjs"
+    elif framework == "react":
+        config["builds"] = [{"src": "package.json", "use": "@vercel/static-build"}]
+        config["routes"] = [{"src": "/(.*)", "dest": "/index.html"}]
+    else:
+        config["builds"] = [{"src": "**/*", "use": "@vercel/static"}]
+    
+    return json.dumps(config, indent=2)
+
+def _iter_files(root) -> Iterator[os.DirEntry]:
+    """
+    Yields every regular file under root as an os.DirEntry, skipping SKIP_DIRS.
+    DirEntry carries the file type from the directory listing (and caches stat),
+    so no extra stat call is needed per entry.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def _write_file(path, data: bytes):
+    """
+    Write a generated file with raw os.open/os.write. Release artifacts are a few
+    KB, so the buffered and text IO layers of open() are pure overhead here.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+@dataclass
+class ValidationState:
+    """File checks gathered while scanning the project, for _validate_files to report."""
+    has_entry_point: bool = False
+    has_readme: bool = False
+    empty_count: int = 0
+
+
+def _scan_project(root) -> Tuple[List[os.DirEntry], List[str], int, ValidationState]:
+    """
+    One walk of the project for everything release preparation needs from the
+    tree: the file entries, their relative POSIX paths, their total size and the
+    file checks. Relative paths are sliced off each entry's path string, and sizes
+    come from each DirEntry's cached stat, so every file costs at most one stat call.
+    """
+    file_list = []
+    rel_paths = []
+    total_size = 0
+    state = ValidationState()
+    prefix_len = len(os.path.join(os.fspath(root), ""))
+    
+    for entry in _iter_files(root):
+        file_list.append(entry)
+        rel_paths.append(entry.path[prefix_len:].replace(os.sep, "/"))
+        size = entry.stat(follow_symlinks=False).st_size
+        total_size += size
+        if not size:
+            state.empty_count += 1
+        name = entry.name
+        if name in ENTRY_POINT_FILES:
+            state.has_entry_point = True
+        if name.lower() == "readme.md":
+            state.has_readme = True
+    
+    return file_list, rel_paths, total_size, state
+
+
+@lru_cache(maxsize=128)
+def _detect_stack_cached(
+    project_path: str,
+    bp_stack: Optional[str],
+    package_json: Optional[Tuple[int, int]],
+    has_requirements: bool
+) -> dict:
+    """
+    Tech stack for a project; the arguments besides project_path only key the
+    cache (package_json is the file's (mtime_ns, size), None when it is missing).
+    """
+    stack = {
+        "type": "unknown",
+        "framework": None,
+        "language": "javascript",
+        "has_backend": False,
+        "has_frontend": True
+    }
+    
+    if bp_stack is not None:
+        # One scan finds every keyword; the first rule with a hit wins
+        hits = set(STACK_KEYWORD_RE.findall(bp_stack))
+        for keyword, detected in STACK_RULES:
+            if keyword in hits:
+                stack.update(detected)
+                break
+    
+    # File-based detection
+    if package_json is not None:
+        try:
+            pkg = orjson.loads(Path(project_path, "package.json").read_bytes())
+            deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
+            if "next" in deps:
+                stack["framework"] = "nextjs"
+            elif "react" in deps:
+                stack["framework"] = "react"
+            elif "vue" in deps:
+                stack["framework"] = "vue"
+        except:
+            pass
+    
+    if has_requirements:
+        stack["language"] = "python"
+        stack["has_backend"] = True
+    
+    return stack
 
 class DeployTarget(Enum):
     """Supported deployment targets."""
@@ -45,7 +450,20 @@ class ReleaseReport:
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Same result as dataclasses.asdict, without its reflection and deepcopy;
+        # the list fields only hold strings, so shallow copies are enough
+        return {
+            "project_id": self.project_id,
+            "project_name": self.project_name,
+            "ready": self.ready,
+            "file_count": self.file_count,
+            "total_size_bytes": self.total_size_bytes,
+            "missing_files": list(self.missing_files),
+            "warnings": list(self.warnings),
+            "generated_artifacts": list(self.generated_artifacts),
+            "deploy_targets": list(self.deploy_targets),
+            "created_at": self.created_at,
+        }
 
 
 class ReleaseAgent:
@@ -60,14 +478,14 @@ class ReleaseAgent:
     - Archive creation with all artifacts
     """
     
-    def __init__(self):
-        self.deploy_generators = {
-            DeployTarget.VERCEL: self._generate_vercel_config,
-            DeployTarget.NETLIFY: self._generate_netlify_config,
-            DeployTarget.RAILWAY: self._generate_railway_config,
-            DeployTarget.DOCKER: self._generate_dockerfile,
-            DeployTarget.GITHUB_PAGES: self._generate_github_pages_config,
-        }
+    # Config generator method per deploy target, shared by every instance
+    DEPLOY_GENERATORS = {
+        DeployTarget.VERCEL: "_generate_vercel_config",
+        DeployTarget.NETLIFY: "_generate_netlify_config",
+        DeployTarget.RAILWAY: "_generate_railway_config",
+        DeployTarget.DOCKER: "_generate_dockerfile",
+        DeployTarget.GITHUB_PAGES: "_generate_github_pages_config",
+    }
     
     async def prepare_release(
         self,
@@ -87,12 +505,11 @@ class ReleaseAgent:
             generate_readme: Whether to generate/update README
             generate_cicd: Whether to generate CI/CD configs
         """
-        from app.core.socket_manager import SocketManager
         sm = SocketManager()
         
         project_path = BASE_PROJECTS_DIR / project_id
         
-        await sm.emit("agent_log", {
+        sm.emit_buffered("agent_log", {
             "agent_name": "RELEASE",
             "message": "Preparing release package..."
         })
@@ -108,72 +525,81 @@ class ReleaseAgent:
             )
         
         # Get all files and calculate size
-        files = list(project_path.glob("**/*"))
-        file_list = [f for f in files if f.is_file()]
-        total_size = sum(f.stat().st_size for f in file_list)
+        file_list, rel_path_list, total_size, validation = _scan_project(project_path)
+        
+        # Relative POSIX paths from the same walk answer the existence checks below
+        rel_paths = set(rel_path_list)
         
         # Run validations
-        warnings = self._validate_files(file_list)
-        missing = self._validate_blueprint(project_path, blueprint)
+        warnings = self._validate_files(validation)
+        missing = self._validate_blueprint(project_path, blueprint, rel_paths)
         
         # Determine tech stack
         tech_stack = self._detect_tech_stack(project_path, blueprint)
         
-        # Generate artifacts
+        # Name and slug shared by the report, the manifest and the deploy configs
+        project_name = blueprint.get("project_name", "Project") if blueprint else "Project"
+        project_slug = _slugify(project_name)
+        
+        # Generate artifacts; files are collected here and written together in step 6
         generated = []
+        artifacts: List[DeploymentArtifact] = []
         
         # 1. Generate .gitignore if missing
-        if not (project_path / ".gitignore").exists():
-            self._generate_gitignore(project_path, tech_stack)
+        write_gitignore = ".gitignore" not in rel_paths
+        if write_gitignore:
             generated.append(".gitignore")
         
-        # 2. Generate README if requested
-        if generate_readme and not any(f.name.lower() == "readme.md" for f in file_list):
-            await self._generate_readme(project_path, blueprint)
+        # 2. Generate README if requested; its LLM call runs while the configs below are built
+        readme_task = None
+        if generate_readme and not validation.has_readme:
+            readme_task = asyncio.create_task(self._generate_readme(project_path, blueprint, rel_path_list))
             generated.append("README.md")
         
         # 3. Generate deployment configs
         targets_used = []
-        if deploy_targets:
-            for target in deploy_targets:
-                if target in self.deploy_generators:
-                    artifact = self.deploy_generators[target](project_path, tech_stack, blueprint)
-                    if artifact:
-                        self._write_artifact(project_path, artifact)
-                        generated.append(artifact.filename)
-                        targets_used.append(target.value)
-        else:
+        if not deploy_targets:
             # Auto-detect best deployment target
             auto_target = self._auto_detect_deploy_target(tech_stack)
-            if auto_target and auto_target in self.deploy_generators:
-                artifact = self.deploy_generators[auto_target](project_path, tech_stack, blueprint)
+            deploy_targets = [auto_target] if auto_target else []
+        # Each target once, in the caller's order (a repeat would write the same file twice)
+        for target in dict.fromkeys(deploy_targets):
+            generator = self.DEPLOY_GENERATORS.get(target)
+            if generator:
+                artifact = getattr(self, generator)(project_path, tech_stack, project_slug)
                 if artifact:
-                    self._write_artifact(project_path, artifact)
-                    generated.append(artifact.filename)
-                    targets_used.append(auto_target.value)
+                    artifacts.append(artifact)
+                    targets_used.append(target.value)
         
         # 4. Generate CI/CD configs
         if generate_cicd:
-            cicd_artifacts = self._generate_cicd_configs(project_path, tech_stack)
-            for artifact in cicd_artifacts:
-                self._write_artifact(project_path, artifact)
-                generated.append(artifact.filename)
+            artifacts.extend(self._generate_cicd_configs(project_path, tech_stack))
         
         # 5. Generate release manifest
-        manifest = self._generate_release_manifest(project_id, blueprint, tech_stack, targets_used)
-        manifest_path = project_path / "release.json"
-        with open(manifest_path, "w") as f:
-            json.dump(manifest, f, indent=2)
-        generated.append("release.json")
+        manifest = self._generate_release_manifest(project_id, project_name, tech_stack, targets_used)
+        artifacts.append(DeploymentArtifact(
+            target=DeployTarget.CUSTOM,
+            filename="release.json",
+            content=orjson.dumps(manifest, option=orjson.OPT_INDENT_2).decode(),
+            description="Release manifest"
+        ))
+        generated.extend(artifact.filename for artifact in artifacts)
+        
+        # 6. Write all artifacts concurrently, and wait for the README
+        await asyncio.gather(
+            self._write_artifacts(project_path, artifacts),
+            *([self._generate_gitignore(project_path, tech_stack)] if write_gitignore else []),
+            *([readme_task] if readme_task else [])
+        )
         
-        await sm.emit("agent_log", {
+        sm.emit_buffered("agent_log", {
             "agent_name": "RELEASE",
             "message": f"✅ Generated {len(generated)} artifacts: {', '.join(generated[:5])}"
         })
         
         return ReleaseReport(
             project_id=project_id,
-            project_name=blueprint.get("project_name", "Project") if blueprint else "Project",
+            project_name=project_name,
             ready=len(missing) == 0,
             file_count=len(file_list),
             total_size_bytes=total_size,
@@ -184,58 +610,21 @@ class ReleaseAgent:
         )
     
     def _detect_tech_stack(self, project_path: Path, blueprint: dict = None) -> dict:
-        """Detect project tech stack from files."""
-        stack = {
-            "type": "unknown",
-            "framework": None,
-            "language": "javascript",
-            "has_backend": False,
-            "has_frontend": True
-        }
-        
-        if blueprint:
-            bp_stack = blueprint.get("tech_stack", "")
-            if isinstance(bp_stack, str):
-                bp_stack = bp_stack.lower()
-            else:
-                bp_stack = str(bp_stack).lower()
-            
-            if "react" in bp_stack or "next" in bp_stack:
-                stack["framework"] = "nextjs" if "next" in bp_stack else "react"
-                stack["type"] = "frontend"
-            elif "vue" in bp_stack:
-                stack["framework"] = "vue"
-                stack["type"] = "frontend"
-            elif "python" in bp_stack or "flask" in bp_stack or "fastapi" in bp_stack:
-                stack["language"] = "python"
-                stack["framework"] = "fastapi" if "fastapi" in bp_stack else "flask"
-                stack["type"] = "backend"
-                stack["has_backend"] = True
-            elif "node" in bp_stack or "express" in bp_stack:
-                stack["framework"] = "express"
-                stack["type"] = "backend"
-                stack["has_backend"] = True
-        
-        # File-based detection
-        if (project_path / "package.json").exists():
-            try:
-                with open(project_path / "package.json") as f:
-                    pkg = json.load(f)
-                    deps = {**pkg.get("dependencies", {}), **pkg.get("devDependencies", {})}
-                    if "next" in deps:
-                        stack["framework"] = "nextjs"
-                    elif "react" in deps:
-                        stack["framework"] = "react"
-                    elif "vue" in deps:
-                        stack["framework"] = "vue"
-            except:
-                pass
-        
-        if (project_path / "requirements.txt").exists():
-            stack["language"] = "python"
-            stack["has_backend"] = True
-        
-        return stack
+        """
+        Detect project tech stack from files.
+        Detection is cached on everything it reads: the blueprint's stack string,
+        package.json's mtime and size, and whether requirements.txt exists.
+        """
+        bp_stack = str(blueprint.get("tech_stack", "")).lower() if blueprint else None
+        try:
+            st = os.stat(project_path / "package.json")
+            package_json = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            package_json = None
+        has_requirements = os.path.exists(project_path / "requirements.txt")
+        
+        # Copied so callers can't change the cached entry
+        return dict(_detect_stack_cached(str(project_path), bp_stack, package_json, has_requirements))
     
     def _auto_detect_deploy_target(self, tech_stack: dict) -> Optional[DeployTarget]:
         """Auto-detect best deployment target based on tech stack."""
@@ -250,63 +639,18 @@ class ReleaseAgent:
         else:
             return DeployTarget.DOCKER
     
-    def _generate_vercel_config(self, project_path: Path, tech_stack: dict, blueprint: dict) -> DeploymentArtifact:
+    def _generate_vercel_config(self, project_path: Path, tech_stack: dict, project_slug: str) -> DeploymentArtifact:
         """Generate vercel.json configuration."""
-        framework = tech_stack.get("framework", "")
-        
-        config = {
-            "version": 2,
-            "name": blueprint.get("project_name", "project").lower().replace(" ", "-") if blueprint else "project",
-            "builds": [],
-            "routes": []
-        }
-        
-        if framework == "nextjs":
-            config["framework"] = "nextjs"
-        elif framework == "react":
-            config["builds"] = [{"src": "package.json", "use": "@vercel/static-build"}]
-            config["routes"] = [{"src": "/(.*)", "dest": "/index.html"}]
-        else:
-            config["builds"] = [{"src": "**/*", "use": "@vercel/static"}]
-        
         return DeploymentArtifact(
             target=DeployTarget.VERCEL,
             filename="vercel.json",
-            content=json.dumps(config, indent=2),
+            content=_build_vercel_json(tech_stack.get("framework", ""), project_slug),
             description="Vercel deployment configuration"
         )
     
-    def _generate_netlify_config(self, project_path: Path, tech_stack: dict, blueprint: dict) -> DeploymentArtifact:
+    def _generate_netlify_config(self, project_path: Path, tech_stack: dict, project_slug: str) -> DeploymentArtifact:
         """Generate netlify.toml configuration."""
-        framework = tech_stack.get("framework", "")
-        
-        if framework == "nextjs":
-            config = """[build]
-  command = "npm run build"
-  publish = ".next"
-
-[[plugins]]
-  package = "@netlify/plugin-nextjs"
-"""
-        elif framework == "react":
-            config = """[build]
-  command = "npm run build"
-  publish = "build"
-
-[[redirects]]
-  from = "/*"
-  to = "/index.html"
-  status = 200
-"""
-        else:
-            config = """[build]
-  publish = "dist"
-
-[[redirects]]
-  from = "/*"
-  to = "/index.html"
-  status = 200
-"""
+        config = NETLIFY_TOML.get(tech_stack.get("framework", ""), NETLIFY_TOML_STATIC)
         
         return DeploymentArtifact(
             target=DeployTarget.NETLIFY,
@@ -315,103 +659,23 @@ class ReleaseAgent:
             description="Netlify deployment configuration"
         )
     
-    def _generate_railway_config(self, project_path: Path, tech_stack: dict, blueprint: dict) -> DeploymentArtifact:
+    def _generate_railway_config(self, project_path: Path, tech_stack: dict, project_slug: str) -> DeploymentArtifact:
         """Generate railway.json configuration."""
-        config = {
-            "$schema": "https://railway.app/railway.schema.json",
-            "build": {
-                "builder": "NIXPACKS"
-            },
-            "deploy": {
-                "numReplicas": 1,
-                "restartPolicyType": "ON_FAILURE",
-                "restartPolicyMaxRetries": 10
-            }
-        }
-        
         return DeploymentArtifact(
             target=DeployTarget.RAILWAY,
             filename="railway.json",
-            content=json.dumps(config, indent=2),
+            content=RAILWAY_JSON,
             description="Railway deployment configuration"
         )
     
-    def _generate_dockerfile(self, project_path: Path, tech_stack: dict, blueprint: dict) -> DeploymentArtifact:
+    def _generate_dockerfile(self, project_path: Path, tech_stack: dict, project_slug: str) -> DeploymentArtifact:
         """Generate Dockerfile based on tech stack."""
-        language = tech_stack.get("language", "javascript")
-        framework = tech_stack.get("framework", "")
-        
-        if language == "python":
-            dockerfile = """# Python Application Dockerfile
-FROM python:3.11-slim
-
-WORKDIR /app
-
-# Install dependencies
-COPY requirements.txt .
-RUN pip install --no-cache-dir -r requirements.txt
-
-# Copy application
-COPY . .
-
-# Expose port
-EXPOSE 8000
-
-# Run application
-CMD ["python", "-m", "uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
-"""
-        elif framework == "nextjs":
-            dockerfile = """# Next.js Application Dockerfile
-FROM node:20-alpine AS base
-
-# Install dependencies only when needed
-FROM base AS deps
-WORKDIR /app
-COPY package.json package-lock.json* ./
-RUN npm ci
-
-# Build the application
-FROM base AS builder
-WORKDIR /app
-COPY --from=deps /app/node_modules ./node_modules
-COPY . .
-RUN npm run build
-
-# Production image
-FROM base AS runner
-WORKDIR /app
-ENV NODE_ENV=production
-
-COPY --from=builder /app/public ./public
-COPY --from=builder /app/.next/standalone ./
-COPY --from=builder /app/.next/static ./.next/static
-
-EXPOSE 3000
-ENV PORT=3000
-CMD ["node", "server.js"]
-"""
+        if tech_stack.get("language", "javascript") == "python":
+            dockerfile = DOCKERFILE_PYTHON
+        elif tech_stack.get("framework", "") == "nextjs":
+            dockerfile = DOCKERFILE_NEXTJS
         else:
-            dockerfile = """# Node.js Application Dockerfile
-FROM node:20-alpine
-
-WORKDIR /app
-
-# Install dependencies
-COPY package*.json ./
-RUN npm ci --only=production
-
-# Copy application
-COPY . .
-
-# Build if needed
-RUN npm run build --if-present
-
-# Expose port
-EXPOSE 3000
-
-# Run application
-CMD ["npm", "start"]
-"""
+            dockerfile = DOCKERFILE_NODE
         
         return DeploymentArtifact(
             target=DeployTarget.DOCKER,
@@ -420,45 +684,9 @@ CMD ["npm", "start"]
             description="Docker container configuration"
         )
     
-    def _generate_github_pages_config(self, project_path: Path, tech_stack: dict, blueprint: dict) -> DeploymentArtifact:
+    def _generate_github_pages_config(self, project_path: Path, tech_stack: dict, project_slug: str) -> DeploymentArtifact:
         """Generate GitHub Pages workflow."""
-        workflow = """name: Deploy to GitHub Pages
-
-on:
-  push:
-    branches: [main]
-  workflow_dispatch:
-
-permissions:
-  contents: read
-  pages: write
-  id-token: write
-
-jobs:
-  build:
-    runs-on: ubuntu-latest
-    steps:
-      - uses: actions/checkout@v4
-      - uses: actions/setup-node@v4
-        with:
-          node-version: 20
-          cache: npm
-      - run: npm ci
-      - run: npm run build
-      - uses: actions/upload-pages-artifact@v3
-        with:
-          path: ./dist
-
-  deploy:
-    needs: build
-    runs-on: ubuntu-latest
-    environment:
-      name: github-pages
-      url: ${{ steps.deployment.outputs.page_url }}
-    steps:
-      - uses: actions/deploy-pages@v4
-        id: deployment
-"""
+        workflow = GITHUB_PAGES_WORKFLOW
         
         return DeploymentArtifact(
             target=DeployTarget.GITHUB_PAGES,
@@ -469,69 +697,20 @@ jobs:
     
     def _generate_cicd_configs(self, project_path: Path, tech_stack: dict) -> List[DeploymentArtifact]:
         """Generate CI/CD configuration files."""
-        artifacts = []
-        
         # GitHub Actions CI
         language = tech_stack.get("language", "javascript")
         
-        if language == "python":
-            ci_workflow = """name: CI
-
-on:
-  push:
-    branches: [main]
-  pull_request:
-    branches: [main]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-    steps:
-      - uses: actions/checkout@v4
-      - uses: actions/setup-python@v5
-        with:
-          python-version: '3.11'
-      - run: pip install -r requirements.txt
-      - run: pip install pytest
-      - run: pytest --tb=short
-"""
-        else:
-            ci_workflow = """name: CI
-
-on:
-  push:
-    branches: [main]
-  pull_request:
-    branches: [main]
-
-jobs:
-  test:
-    runs-on: ubuntu-latest
-    steps:
-      - uses: actions/checkout@v4
-      - uses: actions/setup-node@v4
-        with:
-          node-version: 20
-          cache: npm
-      - run: npm ci
-      - run: npm run lint --if-present
-      - run: npm test --if-present
-      - run: npm run build
-"""
-        
-        artifacts.append(DeploymentArtifact(
+        return [DeploymentArtifact(
             target=DeployTarget.CUSTOM,
             filename=".github/workflows/ci.yml",
-            content=ci_workflow,
+            content=CI_WORKFLOW_PYTHON if language == "python" else CI_WORKFLOW_NODE,
             description="GitHub Actions CI workflow"
-        ))
-        
-        return artifacts
+        )]
     
     def _generate_release_manifest(
         self,
         project_id: str,
-        blueprint: dict,
+        project_name: str,
         tech_stack: dict,
         deploy_targets: List[str]
     ) -> dict:
@@ -539,7 +718,7 @@ jobs:
         return {
             "version": "1.0.0",
             "project_id": project_id,
-            "project_name": blueprint.get("project_name", "Project") if blueprint else "Project",
+            "project_name": project_name,
             "generated_by": "ACEA Sentinel",
             "generated_at": datetime.now().isoformat(),
             "tech_stack": tech_stack,
@@ -550,12 +729,9 @@ jobs:
             }
         }
     
-    async def _generate_readme(self, project_path: Path, blueprint: dict):
-        """Generate README.md using Documenter agent."""
-        from app.agents.documenter import DocumenterAgent
-        
+    async def _generate_readme(self, project_path: Path, blueprint: dict, files: List[str]):
+        """Generate README.md using Documenter agent, listing the relative paths from the release walk."""
         documenter = DocumenterAgent()
-        files = [str(f.relative_to(project_path)) for f in project_path.glob("**/*") if f.is_file()]
         
         readme = await documenter.generate_readme(
             blueprint or {},
@@ -563,87 +739,78 @@ jobs:
             blueprint.get("description", "") if blueprint else ""
         )
         
-        with open(project_path / "README.md", "w") as f:
-            f.write(readme)
+        await asyncio.to_thread(_write_file, project_path / "README.md", readme.encode())
     
-    def _write_artifact(self, project_path: Path, artifact: DeploymentArtifact):
-        """Write artifact to project directory."""
-        artifact_path = project_path / artifact.filename
-        artifact_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(artifact_path, "w") as f:
-            f.write(artifact.content)
+    async def _write_artifacts(self, project_path: Path, artifacts: List[DeploymentArtifact]):
+        """
+        Write artifacts to the project directory concurrently, off the event loop.
+        Each distinct parent directory is created once before the writes start.
+        """
+        paths = [project_path / artifact.filename for artifact in artifacts]
+        parents = {path.parent for path in paths} - {project_path}
+        if parents:
+            await asyncio.to_thread(lambda: [parent.mkdir(parents=True, exist_ok=True) for parent in parents])
+        
+        await asyncio.gather(*(
+            asyncio.to_thread(_write_file, path, artifact.content.encode())
+            for path, artifact in zip(paths, artifacts)
+        ))
     
-    def _validate_files(self, file_list: List[Path]) -> List[str]:
-        """Check for essential files and common issues."""
+    def _validate_files(self, state: ValidationState) -> List[str]:
+        """Report missing essential files and common issues found by the project scan."""
         warnings = []
         
-        essential = ["package.json", "requirements.txt", "main.py", "app.py", "index.html"]
-        if not any(f.name in essential for f in file_list):
+        if not state.has_entry_point:
             warnings.append("No standard entry point file found")
         
-        if not any(f.name.lower() == "readme.md" for f in file_list):
+        if not state.has_readme:
             warnings.append("No README.md found")
         
-        empty_files = [f for f in file_list if f.stat().st_size == 0]
-        if empty_files:
-            warnings.append(f"{len(empty_files)} empty file(s) found")
+        if state.empty_count:
+            warnings.append(f"{state.empty_count} empty file(s) found")
         
         return warnings
     
-    def _validate_blueprint(self, project_path: Path, blueprint: dict) -> List[str]:
-        """Check if all blueprint files exist."""
+    def _validate_blueprint(self, project_path: Path, blueprint: dict, rel_paths: Optional[Set[str]] = None) -> List[str]:
+        """
+        Check if all blueprint files exist.
+        rel_paths (relative POSIX file paths from the release walk) answers most
+        checks without a stat; the rest (directories, paths under a skipped
+        directory) are grouped by parent and checked with one scandir per directory.
+        """
+        if not blueprint:
+            return []
+        
+        # One pass over the blueprint: (as written, normalized) for each path the walk did not see
+        unseen = []
+        for f in blueprint.get("file_structure", ()):
+            expected = f.get("path")
+            if expected:
+                normalized = posixpath.normpath(expected)
+                if rel_paths is None or normalized not in rel_paths:
+                    unseen.append((expected, normalized))
+        if not unseen:
+            return []
+        
+        present: Dict[str, Set[str]] = {}
         missing = []
-        if blueprint:
-            expected_files = [f.get("path") for f in blueprint.get("file_structure", [])]
-            for expected in expected_files:
-                if expected and not (project_path / expected).exists():
-                    missing.append(expected)
+        for expected, normalized in unseen:
+            parent, name = posixpath.split(normalized)
+            if parent not in present:
+                try:
+                    with os.scandir(project_path / parent) as it:
+                        present[parent] = {entry.name for entry in it}
+                except OSError:
+                    present[parent] = set()
+            if name not in present[parent]:
+                missing.append(expected)
         return missing
     
-    def _generate_gitignore(self, project_path: Path, tech_stack: dict):
+    async def _generate_gitignore(self, project_path: Path, tech_stack: dict):
         """Generate appropriate .gitignore."""
         language = tech_stack.get("language", "javascript")
-        
-        base_content = """# Dependencies
-node_modules/
-venv/
-__pycache__/
-*.pyc
-.env
-.env.local
-
-# Build outputs
-dist/
-build/
-.next/
-out/
-
-# IDE
-.idea/
-.vscode/
-*.swp
-
-# OS
-.DS_Store
-Thumbs.db
-
-# Logs
-*.log
-npm-debug.log*
-"""
-        
-        if language == "python":
-            base_content += """
-# Python
-*.egg-info/
-.eggs/
-.pytest_cache/
-htmlcov/
-.coverage
-"""
-        
-        with open(project_path / ".gitignore", "w") as f:
-            f.write(base_content)
+        content = GITIGNORE_PYTHON if language == "python" else GITIGNORE_BASE
+        await asyncio.to_thread(_write_file, project_path / ".gitignore", content)
     
     def create_archive(self, project_id: str) -> str:
         """Create ZIP archive. Returns path to ZIP file."""
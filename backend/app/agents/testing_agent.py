@@ -2,17 +2,346 @@
 # Generates and executes tests for produced code with multi-framework support
 
 from app.core.config import settings
+import ast
 import json
 import asyncio
 import subprocess
 import os
 import sys
 import re
-from pathlib import Path
-from typing import Dict, List, Optional
+import hashlib
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from string import Template
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from app.agents.state import AgentState
+from app.core.local_model import get_hybrid_client
+from app.core.model_response import extract_json_object, strip_code_fences
+
+# Configs, existing tests, dependencies and build outputs, as one alternation so each
+# path is scanned once rather than once per pattern
+TEST_EXCLUDE_RE = re.compile("|".join([
+    r"\.config\.",
+    r"\.test\.",
+    r"\.spec\.",
+    r"__tests__",
+    r"node_modules",
+    r"dist/",
+    r"build/",
+    r"\.next/",
+    r"venv/",
+    r"__pycache__",
+    r"package\.json",
+    r"tsconfig\.json",
+    r"postcss\.config",
+    r"tailwind\.config",
+    r"next\.config",
+    r"vite\.config"
+]))
+
+TESTABLE_EXTENSIONS = (".py", ".js", ".jsx", ".ts", ".tsx")
+
+# Source language per file extension; anything else is "unknown"
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+}
+
+# JS test runners looked for in package.json, in order of preference
+JS_TEST_FRAMEWORKS = ("vitest", "jest", "mocha")
+
+# Counts on pytest's closing line, e.g. "==== 3 passed, 1 failed, 2 skipped in 0.42s ===="
+PYTEST_SUMMARY_COUNT_RE = re.compile(r"(\d+) (passed|failed|skipped|errors?)\b")
+
+# Per-test outcomes from -v output, for runs cut off before the closing line
+PYTEST_OUTCOME_RE = re.compile(r"\b(PASSED|FAILED|SKIPPED)\b")
+
+
+def parse_pytest_counts(stdout: str) -> Tuple[int, int, int]:
+    """
+    Returns (passed, failed, skipped) for a pytest run; collection errors count as failed.
+    Reads the closing summary line; only when it is missing is the whole output scanned,
+    once, for per-test outcomes. (Scanning for FAILED would also double-count the
+    short test summary section.)
+    """
+    summary = stdout.rstrip().rpartition("\n")[2]
+    counts = {outcome: int(n) for n, outcome in PYTEST_SUMMARY_COUNT_RE.findall(summary)}
+    if counts:
+        failed = counts.get("failed", 0) + counts.get("error", 0) + counts.get("errors", 0)
+        return counts.get("passed", 0), failed, counts.get("skipped", 0)
+    
+    tally = Counter(PYTEST_OUTCOME_RE.findall(stdout))
+    return tally["PASSED"], tally["FAILED"], tally["SKIPPED"]
+
+
+# Per-test lines from verbose runs, matched while the output streams in
+PYTEST_PROGRESS_RE = re.compile(r"::\S.* (PASSED|FAILED|SKIPPED|ERROR)\b")
+VITEST_PROGRESS_RE = re.compile(r"(✓|✗)")
+
+# A running tally is posted after every this many finished tests
+TEST_PROGRESS_EVERY = 20
+
+# Longest single output line read while streaming (asyncio's default is 64 KiB)
+STREAM_LINE_LIMIT = 1 << 20
+
+
+def progress_reporter(sm, outcome_re: re.Pattern, failed: str) -> Callable[[str], None]:
+    """
+    Line callback for run_command: counts per-test outcome lines as a run streams
+    and posts a running tally every TEST_PROGRESS_EVERY tests, so long suites
+    report before they finish.
+    """
+    tally = Counter()
+    
+    def on_line(line: str):
+        match = outcome_re.search(line)
+        if match is None:
+            return
+        tally[match.group(1)] += 1
+        total = sum(tally.values())
+        if total % TEST_PROGRESS_EVERY == 0:
+            sm.emit_buffered("agent_log", {"agent_name": "TESTING", "message": f"🧪 {total} tests run, {tally[failed]} failed so far..."})
+    
+    return on_line
+
+
+async def run_command(
+    cmd: List[str],
+    cwd: str,
+    timeout: Optional[float] = None,
+    env: Optional[Dict[str, str]] = None,
+    on_line: Optional[Callable[[str], None]] = None
+) -> subprocess.CompletedProcess:
+    """
+    Runs a command without blocking the event loop, capturing decoded output.
+    Mirrors subprocess.run: returns a CompletedProcess and raises
+    subprocess.TimeoutExpired (after killing the process) when timeout passes.
+    With on_line, stdout is read line by line and each line is passed to it as it arrives.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        limit=STREAM_LINE_LIMIT
+    )
+    
+    async def read_lines():
+        lines = []
+        async for raw in proc.stdout:
+            lines.append(raw)
+            on_line(raw.decode(errors="replace"))
+        return b"".join(lines)
+    
+    async def stream():
+        # stderr is drained alongside so a chatty child never blocks on a full pipe
+        stdout, stderr = await asyncio.gather(read_lines(), proc.stderr.read())
+        await proc.wait()
+        return stdout, stderr
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            proc.communicate() if on_line is None else stream(), timeout
+        )
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return subprocess.CompletedProcess(
+        cmd, proc.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    )
+
+
+# Verbose per-test lines are kept for the report. The cache plugin and bytecode
+# writing are off: nothing reuses them between runs, and they would only add
+# startup work and leave .pytest_cache/__pycache__ in the generated project.
+PYTEST_ARGS = ["-v", "--tb=short", "-p", "no:cacheprovider"]
+PYTEST_ENV = {"PYTHONDONTWRITEBYTECODE": "1"}
+
+# Concurrent pytest processes when a project has several test files (on a single
+# core, per-file processes would only add interpreter startups, so one run is used)
+PYTEST_WORKERS = min(8, os.cpu_count() or 1)
+
+# Directories pytest discovery would never find project tests in
+PYTEST_SKIP_DIRS = frozenset(("node_modules", ".git", "__pycache__", "venv", ".venv"))
+
+
+def find_pytest_files(root: str) -> List[str]:
+    """Test modules pytest would collect under root (test_*.py / *_test.py), relative to root."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in PYTEST_SKIP_DIRS]
+        for name in filenames:
+            if name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py")):
+                found.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(found)
+
+
+# Config files pytest reads its ini options from
+PYTEST_CONFIG_FILES = ("pytest.ini", "pyproject.toml", "tox.ini", "setup.cfg")
+
+# Ini options that change which files pytest collects
+PYTEST_DISCOVERY_OPTION_RE = re.compile(r"^\s*(testpaths|python_files)\s*=", re.MULTILINE)
+
+# pytest exit code for "no tests collected"
+PYTEST_NO_TESTS_COLLECTED = 5
+
+
+def has_custom_pytest_discovery(*dirs: str) -> bool:
+    """Whether a pytest config in any of dirs sets testpaths or python_files."""
+    for directory in dirs:
+        for name in PYTEST_CONFIG_FILES:
+            try:
+                with open(os.path.join(directory, name), encoding="utf-8", errors="ignore") as f:
+                    if PYTEST_DISCOVERY_OPTION_RE.search(f.read()):
+                        return True
+            except OSError:
+                continue
+    return False
+
+
+# Sources up to this many characters in total share one batched generation request
+TEST_BATCH_MAX_CHARS = 30_000
+
+# Upper bound on concurrent per-file generation requests
+TEST_GENERATION_CONCURRENCY = 5
+
+# Example test layout shown to the model, per framework
+TEST_FRAMEWORK_EXAMPLES = {
+    "pytest": """
+import pytest
+from module import function
+
+def test_function_happy_path():
+    result = function(valid_input)
+    assert result == expected_output
+
+def test_function_edge_case():
+    with pytest.raises(ValueError):
+        function(invalid_input)
+""",
+    "vitest": """
+import { describe, it, expect } from 'vitest';
+import { function } from './module';
+
+describe('function', () => {
+  it('should handle happy path', () => {
+    const result = function(validInput);
+    expect(result).toBe(expectedOutput);
+  });
+
+  it('should handle edge case', () => {
+    expect(() => function(invalidInput)).toThrow();
+  });
+});
+""",
+    "jest": """
+import { function } from './module';
+
+describe('function', () => {
+  test('happy path', () => {
+    const result = function(validInput);
+    expect(result).toBe(expectedOutput);
+  });
+
+  test('edge case', () => {
+    expect(() => function(invalidInput)).toThrow();
+  });
+});
+"""
+}
+
+# Static instructions come first and the per-file part last, so every file generated
+# for one framework shares a prefix that Gemini can serve from its implicit prompt cache
+TEST_GENERATION_PREAMBLE = Template("""Generate comprehensive unit tests using $framework for the source file at the end of this prompt.
+
+**REQUIREMENTS**:
+1. Test all exported functions/classes
+2. Include happy path and edge cases
+3. Use proper $framework syntax and assertions
+4. Include proper imports from the source file
+5. Return ONLY the test code, no markdown, no explanations
+
+**EXAMPLE STRUCTURE**:
+$example
+""")
+
+TEST_GENERATION_REQUEST = Template("""
+**FILE**: $file_path
+
+**SOURCE CODE**:
+```$language
+$file_content
+```
+
+Generate the complete test file now:""")
+
+
+@lru_cache(maxsize=None)
+def framework_preamble(framework: str) -> str:
+    """The framework-specific instruction block, built once per framework."""
+    return TEST_GENERATION_PREAMBLE.substitute(
+        framework=framework,
+        example=TEST_FRAMEWORK_EXAMPLES.get(framework, "")
+    )
+
+
+TEST_BATCH_GENERATION_PREAMBLE = Template("""Generate comprehensive unit tests using $framework for each of the source files at the end of this prompt.
+
+**REQUIREMENTS**:
+1. Test all exported functions/classes of every file
+2. Include happy path and edge cases
+3. Use proper $framework syntax and assertions
+4. Include proper imports from each source file
+5. Return ONLY a JSON object mapping each source file path (exactly as given) to its complete test file code
+""")
+
+TEST_BATCH_GENERATION_REQUEST = Template("""
+**SOURCE FILES**:
+$sources
+
+Generate the JSON object now:""")
+
+
+@lru_cache(maxsize=None)
+def batch_framework_preamble(framework: str) -> str:
+    """The static instruction block of batched prompts, built once per framework."""
+    return TEST_BATCH_GENERATION_PREAMBLE.substitute(framework=framework)
+
+# Generated tests keyed on (framework, source path, source), least recently used first.
+# The path is part of the key because generated imports depend on it.
+GENERATED_TEST_CACHE_SIZE = 512
+_generated_tests: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _generated_test_key(file_path: str, file_content: str, framework: str) -> str:
+    return hashlib.blake2b(f"{framework}|{file_path}|{file_content}".encode(), digest_size=16).hexdigest()
+
+
+def _cached_test(file_path: str, file_content: str, framework: str) -> Optional[str]:
+    """Returns previously generated test code for this exact source, if still cached."""
+    key = _generated_test_key(file_path, file_content, framework)
+    test_code = _generated_tests.get(key)
+    if test_code is not None:
+        _generated_tests.move_to_end(key)
+    return test_code
+
+
+def _remember_test(file_path: str, file_content: str, framework: str, test_code: str):
+    """Caches generated test code, evicting the least recently used entry when full."""
+    _generated_tests[_generated_test_key(file_path, file_content, framework)] = test_code
+    if len(_generated_tests) > GENERATED_TEST_CACHE_SIZE:
+        _generated_tests.popitem(last=False)
+
 
 class TestingAgent:
+    # Runner method per framework that _run_tests can execute
+    TEST_RUNNERS = {
+        "pytest": "_run_pytest",
+        "vitest": "_run_vitest",
+        "jest": "_run_jest",
+    }
+    
     def __init__(self):
         self.supported_frameworks = {
             "python": ["pytest", "unittest"],
@@ -34,10 +363,7 @@ class TestingAgent:
             # Use sys.executable to ensure we use the backend's environment
             cmd = [sys.executable, "-m", "pytest", "--maxfail=1", "--disable-warnings", "--json-report", f"--json-report-file={report_file}"]
             
-            result = subprocess.run(
-                cmd,
-                cwd=project_dir, capture_output=True, text=True
-            )
+            result = await run_command(cmd, cwd=project_dir)
             
             if result.returncode != 0:
                 from app.agents.state import Issue
@@ -77,10 +403,7 @@ class TestingAgent:
 
         state.messages.append("TestingAgent: Running Vitest...")
         try:
-            result = subprocess.run(
-                ["npm", "run", "test:vitest"], cwd=project_dir,
-                capture_output=True, text=True
-            )
+            result = await run_command(["npm", "run", "test:vitest"], cwd=project_dir)
             if result.returncode != 0:
                 from app.agents.state import Issue
                 state.issues.append(Issue(file="Vitest", issue="Frontend tests failed", fix="Check logs"))
@@ -163,12 +486,9 @@ class TestingAgent:
                     package_data = json.load(f)
                     deps = {**package_data.get("dependencies", {}), **package_data.get("devDependencies", {})}
                     
-                    if "vitest" in deps:
-                        return "vitest"
-                    elif "jest" in deps:
-                        return "jest"
-                    elif "mocha" in deps:
-                        return "mocha"
+                    framework = next((fw for fw in JS_TEST_FRAMEWORKS if fw in deps), None)
+                    if framework:
+                        return framework
             except:
                 pass
         
@@ -196,116 +516,185 @@ class TestingAgent:
         Generates test code for all testable files using LLM.
         Returns dict of {test_file_path: test_code}
         """
-        from app.core.local_model import HybridModelClient
+        client = get_hybrid_client()
         
-        client = HybridModelClient()
-        test_files = {}
+        generated = {}  # source path -> test code
+        pending = {}
         
-        # Identify testable files (exclude configs, tests, node_modules)
-        testable_files = self._find_testable_files(file_system)
+        # Identify testable files (exclude configs, tests, node_modules); files unchanged
+        # since an earlier run (e.g. an orchestrator retry) reuse their tests
+        for file_path, file_content in self._iter_testable_files(file_system):
+            test_code = _cached_test(file_path, file_content, framework)
+            if test_code is None:
+                pending[file_path] = file_content
+            else:
+                generated[file_path] = test_code
+        
+        if generated:
+            await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"♻️ Reusing tests for {len(generated)} unchanged files"})
+        
+        # Small projects: one request returns tests for every file
+        if len(pending) > 1 and sum(map(len, pending.values())) < TEST_BATCH_MAX_CHARS:
+            batched = await self._generate_tests_batch(client, pending, framework, sm)
+            # Files whose batched test does not parse fall through to per-file generation
+            valid = await asyncio.to_thread(lambda: {
+                file_path: test_code for file_path, test_code in batched.items()
+                if self._syntax_ok(test_code, self._get_language(file_path))
+            })
+            for file_path, test_code in valid.items():
+                _remember_test(file_path, pending.pop(file_path), framework, test_code)
+                generated[file_path] = test_code
+        
+        # Everything else (or whatever the batch missed): one request per file, concurrently
+        semaphore = asyncio.Semaphore(TEST_GENERATION_CONCURRENCY)
+        
+        async def generate_one(file_path, file_content):
+            async with semaphore:
+                return await self._generate_test_for_file(client, file_path, file_content, framework, sm)
+        
+        results = await asyncio.gather(*(
+            generate_one(file_path, file_content) for file_path, file_content in pending.items()
+        ))
+        for (file_path, file_content), test_code in zip(pending.items(), results):
+            if test_code is not None:
+                _remember_test(file_path, file_content, framework, test_code)
+                generated[file_path] = test_code
         
-        for file_path, file_content in testable_files.items():
-            try:
-                await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"📝 Generating tests for {file_path}..."})
-                
-                # Determine language
-                language = self._get_language(file_path)
-                
-                # Generate test file path
-                test_file_path = self._get_test_file_path(file_path, framework)
-                
-                # Create prompt
-                prompt = self._create_test_generation_prompt(
-                    file_path, 
-                    file_content, 
-                    framework, 
-                    language
-                )
-                
-                # Generate tests
-                response = await client.generate(prompt)
-                
-                # Clean response
-                test_code = self._clean_generated_code(response, language)
-                
-                test_files[test_file_path] = test_code
-                
-            except Exception as e:
-                await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"⚠️ Failed to generate test for {file_path}: {str(e)[:50]}"})
-                continue
+        return {
+            self._get_test_file_path(file_path, framework): test_code
+            for file_path, test_code in generated.items()
+        }
+
+    async def _generate_test_for_file(
+        self,
+        client,
+        file_path: str,
+        file_content: str,
+        framework: str,
+        sm
+    ) -> Optional[str]:
+        """
+        Generates the test file for one source file.
+        Returns the test code, or None if generation failed.
+        """
+        try:
+            await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"📝 Generating tests for {file_path}..."})
+            
+            # Determine language
+            language = self._get_language(file_path)
+            
+            # Create prompt
+            prompt = self._create_test_generation_prompt(
+                file_path, 
+                file_content, 
+                framework, 
+                language
+            )
+            
+            # Generate tests
+            response = await client.generate(prompt)
+            
+            # Clean response
+            test_code = self._clean_generated_code(response, language)
+            
+            # Reject unparsable output here rather than in a pytest run (and before it is cached)
+            if not await asyncio.to_thread(self._syntax_ok, test_code, language):
+                await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"⚠️ Discarding generated test for {file_path}: syntax error"})
+                return None
+            return test_code
+            
+        except Exception as e:
+            await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"⚠️ Failed to generate test for {file_path}: {str(e)[:50]}"})
+            return None
+
+    async def _generate_tests_batch(
+        self,
+        client,
+        files: Dict[str, str],
+        framework: str,
+        sm
+    ) -> Dict[str, str]:
+        """
+        Generates tests for several small files in one request.
+        Returns {source_path: test_code} for the files the model answered;
+        an empty dict if the request or its JSON failed.
+        """
+        await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"📝 Generating tests for {len(files)} files in one request..."})
         
-        return test_files
+        try:
+            response = await client.generate(
+                self._create_batch_test_generation_prompt(files, framework),
+                json_mode=True
+            )
+            generated = json.loads(extract_json_object(response))
+        except Exception as e:
+            await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"⚠️ Batched generation failed, generating per file: {str(e)[:50]}"})
+            return {}
+        
+        if not isinstance(generated, dict):
+            return {}
+        
+        return {
+            file_path: self._clean_generated_code(test_code, self._get_language(file_path))
+            for file_path, test_code in generated.items()
+            if file_path in files and isinstance(test_code, str) and test_code.strip()
+        }
 
     def _find_testable_files(self, file_system: Dict[str, str]) -> Dict[str, str]:
         """
         Filters file_system to only include files that should have tests.
         Excludes: configs, existing tests, node_modules, build outputs.
         """
-        testable = {}
-        
-        exclude_patterns = [
-            r"\.config\.",
-            r"\.test\.",
-            r"\.spec\.",
-            r"__tests__",
-            r"node_modules",
-            r"dist/",
-            r"build/",
-            r"\.next/",
-            r"venv/",
-            r"__pycache__",
-            r"package\.json",
-            r"tsconfig\.json",
-            r"postcss\.config",
-            r"tailwind\.config",
-            r"next\.config",
-            r"vite\.config"
-        ]
-        
+        return dict(self._iter_testable_files(file_system))
+
+    def _iter_testable_files(self, file_system: Dict[str, str]) -> Iterator[Tuple[str, str]]:
+        """
+        Yields (path, content) for testable files, cheapest checks first: most
+        paths are rejected by extension before the exclude regex runs, and only
+        files long enough to matter pay for the whitespace-stripped length.
+        """
         for path, content in file_system.items():
+            # Include only source code files
+            if not path.endswith(TESTABLE_EXTENSIONS):
+                continue
+            
+            # Skip if file is too small (likely empty or just imports)
+            if len(content) <= 50 or len(content.strip()) <= 50:
+                continue
+            
             # Skip if matches exclude pattern
-            if any(re.search(pattern, path) for pattern in exclude_patterns):
+            if TEST_EXCLUDE_RE.search(path):
                 continue
             
-            # Include only source code files
-            if path.endswith((".py", ".js", ".jsx", ".ts", ".tsx")):
-                # Skip if file is too small (likely empty or just imports)
-                if len(content.strip()) > 50:
-                    testable[path] = content
-        
-        return testable
+            yield path, content
 
     def _get_language(self, file_path: str) -> str:
         """Returns language identifier for the file."""
-        if file_path.endswith(".py"):
-            return "python"
-        elif file_path.endswith((".ts", ".tsx")):
-            return "typescript"
-        elif file_path.endswith((".js", ".jsx")):
-            return "javascript"
-        return "unknown"
+        return LANGUAGE_BY_EXTENSION.get(os.path.splitext(file_path)[1], "unknown")
 
     def _get_test_file_path(self, source_path: str, framework: str) -> str:
         """
         Generates appropriate test file path based on framework conventions.
         """
-        path_obj = Path(source_path)
+        # String splitting gives the same parts as Path(...).stem/.suffix without building a Path per file
+        root, suffix = os.path.splitext(source_path)
+        stem = root.rpartition("/")[2]
         
         if framework == "pytest":
             # Python: tests/test_filename.py
-            return f"backend/tests/test_{path_obj.stem}.py"
+            return f"backend/tests/test_{stem}.py"
         
         elif framework in ["vitest", "jest"]:
             # JS/TS: place .test.ts next to source or in __tests__
             if "frontend" in source_path:
                 # Keep in frontend, add .test before extension
-                return source_path.replace(path_obj.suffix, f".test{path_obj.suffix}")
+                return f"{root}.test{suffix}"
             else:
-                return f"frontend/__tests__/{path_obj.stem}.test.ts"
+                return f"frontend/__tests__/{stem}.test.ts"
         
         else:
             # Default fallback
-            return f"tests/{path_obj.stem}.test{path_obj.suffix}"
+            return f"tests/{stem}.test{suffix}"
 
     def _create_test_generation_prompt(
         self, 
@@ -315,85 +704,39 @@ class TestingAgent:
         language: str
     ) -> str:
         """Creates optimized prompt for test generation."""
-        
-        framework_examples = {
-            "pytest": """
-import pytest
-from module import function
-
-def test_function_happy_path():
-    result = function(valid_input)
-    assert result == expected_output
-
-def test_function_edge_case():
-    with pytest.raises(ValueError):
-        function(invalid_input)
-""",
-            "vitest": """
-import { describe, it, expect } from 'vitest';
-import { function } from './module';
+        return framework_preamble(framework) + TEST_GENERATION_REQUEST.substitute(
+            file_path=file_path,
+            file_content=file_content,
+            language=language
+        )
 
-describe('function', () => {
-  it('should handle happy path', () => {
-    const result = function(validInput);
-    expect(result).toBe(expectedOutput);
-  });
-  
-  it('should handle edge case', () => {
-    expect(() => function(invalidInput)).toThrow();
-  });
-});
-""",
-            "jest": """
-import { function } from './module';
-
-describe('function', () => {
-  test('happy path', () => {
-    const result = function(validInput);
-    expect(result).toBe(expectedOutput);
-  });
-  
-  test('edge case', () => {
-    expect(() => function(invalidInput)).toThrow();
-  });
-});
-"""
-        }
-        
-        example = framework_examples.get(framework, "")
-        
-        return f"""Generate comprehensive unit tests for this {language} file using {framework}.
-
-**FILE**: {file_path}
-
-**SOURCE CODE**:
-```{language}
-{file_content}
-```
-
-**REQUIREMENTS**:
-1. Test all exported functions/classes
-2. Include happy path and edge cases
-3. Use proper {framework} syntax and assertions
-4. Include proper imports from the source file
-5. Return ONLY the test code, no markdown, no explanations
-
-**EXAMPLE STRUCTURE**:
-{example}
-
-Generate the complete test file now:"""
+    def _create_batch_test_generation_prompt(self, files: Dict[str, str], framework: str) -> str:
+        """Creates one prompt covering several source files, answered as a JSON map."""
+        sources = "\n\n".join(
+            f'<file path="{file_path}">\n{file_content}\n</file>'
+            for file_path, file_content in files.items()
+        )
+        
+        return batch_framework_preamble(framework) + TEST_BATCH_GENERATION_REQUEST.substitute(sources=sources)
 
     def _clean_generated_code(self, response: str, language: str) -> str:
         """Cleans LLM response to extract pure code."""
-        # Remove markdown code blocks
-        response = re.sub(r'```(?:python|typescript|javascript|jsx|tsx)?\n', '', response)
-        response = response.replace('```', '')
-        
-        # Remove language identifiers at start
-        for lang in ["python", "typescript", "javascript", "pytest", "vitest", "jest"]:
-            response = re.sub(f'^{lang}\\s+', '', response, flags=re.IGNORECASE)
-        
-        return response.strip()
+        # Remove markdown code blocks and language identifiers at start
+        return strip_code_fences(response)
+
+    @staticmethod
+    def _syntax_ok(code: str, language: str) -> bool:
+        """
+        Whether generated test code parses. Only Python is checked (no JS parser
+        is a dependency); other languages are accepted as-is.
+        """
+        if language != "python":
+            return True
+        try:
+            ast.parse(code)
+        except (SyntaxError, ValueError):
+            return False
+        return True
 
     async def _write_test_files(
         self, 
@@ -425,18 +768,14 @@ Generate the complete test file now:"""
         Executes tests using the detected framework.
         Returns structured test results.
         """
-        if framework == "pytest":
-            return await self._run_pytest(project_path, sm)
-        elif framework == "vitest":
-            return await self._run_vitest(project_path, sm)
-        elif framework == "jest":
-            return await self._run_jest(project_path, sm)
-        else:
+        runner = self.TEST_RUNNERS.get(framework)
+        if runner is None:
             return {
                 "success": False,
                 "framework": framework,
                 "error": f"Framework {framework} not supported for execution"
             }
+        return await getattr(self, runner)(project_path, sm)
 
     async def _run_pytest(self, project_path: str, sm) -> dict:
         """Runs pytest and parses results."""
@@ -450,23 +789,48 @@ Generate the complete test file now:"""
             }
         
         try:
-            result = subprocess.run(
-                [sys.executable, "-m", "pytest", "-v", "--tb=short"],
-                cwd=backend_path,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            cmd = [sys.executable, "-m", "pytest", *PYTEST_ARGS]
+            env = {**os.environ, **PYTEST_ENV}
+            test_files = find_pytest_files(backend_path)
+            on_line = progress_reporter(sm, PYTEST_PROGRESS_RE, failed="FAILED")
+            
+            # Per-file runs only mirror a plain `pytest` run when discovery uses the defaults
+            if PYTEST_WORKERS > 1 and len(test_files) > 1 and not has_custom_pytest_discovery(backend_path, project_path):
+                # One pytest process per test file, PYTEST_WORKERS at a time, all
+                # sharing the same 30s budget as a single run
+                semaphore = asyncio.Semaphore(PYTEST_WORKERS)
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + 30
+                
+                async def run_file(test_file):
+                    async with semaphore:
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            raise subprocess.TimeoutExpired(cmd + [test_file], 30)
+                        return await run_command(
+                            cmd + [test_file], cwd=backend_path, timeout=remaining, env=env, on_line=on_line
+                        )
+                
+                runs = await asyncio.gather(*map(run_file, test_files), return_exceptions=True)
+                for run in runs:
+                    if isinstance(run, BaseException):
+                        raise run
+            else:
+                runs = [await run_command(cmd, cwd=backend_path, timeout=30, env=env, on_line=on_line)]
             
             # Parse pytest output
-            output = result.stdout + result.stderr
+            output = "".join(run.stdout + run.stderr for run in runs)
             
             # Extract test counts
-            passed = len(re.findall(r'PASSED', output))
-            failed = len(re.findall(r'FAILED', output))
-            skipped = len(re.findall(r'SKIPPED', output))
+            passed, failed, skipped = map(sum, zip(*(parse_pytest_counts(run.stdout) for run in runs)))
             
-            success = result.returncode == 0
+            # A module with no tests exits 5 on its own, but is harmless in a combined run
+            exit_code = next(
+                (run.returncode for run in runs
+                 if run.returncode and not (len(runs) > 1 and run.returncode == PYTEST_NO_TESTS_COLLECTED)),
+                0
+            )
+            success = exit_code == 0
             
             if success:
                 await sm.emit("agent_log", {"agent_name": "TESTING", "message": f"✅ All tests passed! ({passed} passed)"})
@@ -481,7 +845,7 @@ Generate the complete test file now:"""
                 "failed": failed,
                 "skipped": skipped,
                 "details": output,
-                "exit_code": result.returncode
+                "exit_code": exit_code
             }
             
         except subprocess.TimeoutExpired:
@@ -511,12 +875,11 @@ Generate the complete test file now:"""
         
         try:
             # Check if vitest is installed
-            result = subprocess.run(
+            result = await run_command(
                 ["npm", "run", "test", "--", "--run"],
                 cwd=frontend_path,
-                capture_output=True,
-                text=True,
-                timeout=60
+                timeout=60,
+                on_line=progress_reporter(sm, VITEST_PROGRESS_RE, failed="✗")
             )
             
             output = result.stdout + result.stderr
@@ -569,11 +932,9 @@ Generate the complete test file now:"""
             }
         
         try:
-            result = subprocess.run(
+            result = await run_command(
                 ["npm", "test", "--", "--passWithNoTests"],
                 cwd=frontend_path,
-                capture_output=True,
-                text=True,
                 timeout=60
             )
             
@@ -10,6 +10,52 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+from urllib.parse import urlparse
+from app.core.browser_pool import browser_pool
+from app.core.model_response import extract_json_object
+
+# Full-page PNGs run to several MB; JPEG at this quality is ~5-10x smaller
+# and still plenty for the vision check.
+SCREENSHOT_JPEG_QUALITY = 70
+
+# Buffers console output inside the page so it can be read back in a single
+# evaluate() call, instead of one CDP event -> Python callback per message.
+# Errors are left to a page.on("console") listener: the browser reports failed
+# resource loads and CSP violations there without going through console.error.
+CONSOLE_COLLECTOR_SCRIPT = """
+window.__aceaConsole = [];
+for (const [method, type] of [["log", "log"], ["info", "info"], ["debug", "debug"], ["warn", "warning"]]) {
+    const original = console[method];
+    console[method] = (...args) => {
+        window.__aceaConsole.push({type, text: args.map(String).join(" ")});
+        return original.apply(console, args);
+    };
+}
+"""
+
+
+async def _read_console_buffer(page) -> list:
+    """Reads the in-page console buffer; a crashed or closed page yields nothing."""
+    try:
+        return await page.evaluate("window.__aceaConsole || []")
+    except Exception:
+        return []
+
+
+# Generated frontends often pull web fonts, media and trackers that slow the
+# load without changing what the checks look at
+BLOCKED_RESOURCE_TYPES = frozenset({"font", "media", "websocket"})
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net")
+
+
+async def _block_heavy_resources(route):
+    """Playwright route handler: abort heavy/irrelevant requests, pass the rest."""
+    request = route.request
+    host = urlparse(request.url).hostname or ""
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or host.endswith(BLOCKED_HOSTS):
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 @dataclass
@@ -55,6 +101,7 @@ class WatcherAgent:
         self.browser = None
         self.page = None
         self._vision_client = None
+        Path("screenshots").mkdir(exist_ok=True)
     
     async def _get_vision_client(self):
         """Get the HybridModelClient for vision analysis."""
@@ -151,13 +198,13 @@ class WatcherAgent:
                     base_name = f"{safe_url}_{timestamp}"
                     
                     # 1. Above-the-fold screenshot (viewport only)
-                    above_fold_path = screenshots_dir / f"{base_name}_above_fold.png"
-                    await page.screenshot(path=str(above_fold_path), full_page=False)
+                    above_fold_path = screenshots_dir / f"{base_name}_above_fold.jpg"
+                    await page.screenshot(path=str(above_fold_path), full_page=False, type="jpeg", quality=SCREENSHOT_JPEG_QUALITY)
                     artifacts.above_fold_screenshot = str(above_fold_path)
                     
                     # 2. Full-page screenshot
-                    full_page_path = screenshots_dir / f"{base_name}_full_page.png"
-                    await page.screenshot(path=str(full_page_path), full_page=True)
+                    full_page_path = screenshots_dir / f"{base_name}_full_page.jpg"
+                    await page.screenshot(path=str(full_page_path), full_page=True, type="jpeg", quality=SCREENSHOT_JPEG_QUALITY)
                     artifacts.full_page_screenshot = str(full_page_path)
                     
                     await sm.emit("agent_log", {
@@ -360,20 +407,13 @@ Respond in JSON format:
             response = await client.generate_with_image(
                 prompt=prompt,
                 image_base64=image_data,
-                image_mime_type="image/png"
+                image_mime_type="image/png" if screenshot_path.endswith(".png") else "image/jpeg"
             )
             
             # Parse response
             try:
-                # Try to extract JSON from response
-                if "```json" in response:
-                    json_str = response.split("```json")[1].split("```")[0].strip()
-                elif "```" in response:
-                    json_str = response.split("```")[1].split("```")[0].strip()
-                else:
-                    json_str = response.strip()
-                
-                analysis = json.loads(json_str)
+                # Fenced or not, the payload is the outermost JSON object
+                analysis = json.loads(extract_json_object(response))
                 artifacts.gemini_analysis = analysis
                 
                 # Log summary
@@ -420,52 +460,59 @@ Respond in JSON format:
         visual_issues = []
         
         try:
-            from playwright.async_api import async_playwright
-            
-            await sm.emit("agent_log", {"agent_name": "WATCHER", "message": f"Launching browser for {url}..."})
+            sm.emit_buffered("agent_log", {"agent_name": "WATCHER", "message": f"Launching browser for {url}..."})
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context()
+            # Shared browser; only the context is per-run (and closed below)
+            browser = await browser_pool.get_browser()
+            context = await browser.new_context()
+            try:
+                await context.route("**/*", _block_heavy_resources)
                 page = await context.new_page()
                 
-                # Capture console messages
-                page.on("console", lambda msg: console_logs.append({
-                    "type": msg.type,
-                    "text": msg.text
-                }))
+                # Capture console messages (collected in-page, flushed once after load)
+                await page.add_init_script(CONSOLE_COLLECTOR_SCRIPT)
+                page.on("console", lambda msg: console_logs.append({"type": "error", "text": msg.text}) if msg.type == "error" else None)
                 
                 # Capture page errors
                 page.on("pageerror", lambda exc: errors.append(str(exc)))
                 
                 try:
-                    # Navigate to URL with timeout
-                    response = await page.goto(url, wait_until="networkidle", timeout=30000)
+                    # Navigate to URL with timeout. networkidle needs 500ms of network
+                    # silence and often never settles for SPAs, so wait for DOM only.
+                    response = await page.goto(url, wait_until="domcontentloaded", timeout=20000)
                     
                     if response is None or response.status >= 400:
                         errors.append(f"HTTP Error: {response.status if response else 'No response'}")
                     
-                    # Wait a bit for any async rendering
-                    await asyncio.sleep(2)
+                    # Give images/scripts a bounded window to finish instead of a fixed sleep
+                    try:
+                        await page.wait_for_load_state("load", timeout=5000)
+                    except Exception:
+                        pass  # Late assets only affect the screenshot, not error capture
                     
-                    # Take screenshot
-                    screenshot_path = f"screenshots/{url.replace('http://', '').replace('/', '_')}.png"
-                    Path("screenshots").mkdir(exist_ok=True)
-                    await page.screenshot(path=screenshot_path, full_page=True)
+                    console_logs.extend(await _read_console_buffer(page))
                     
-                    await sm.emit("agent_log", {"agent_name": "WATCHER", "message": f"Screenshot saved: {screenshot_path}"})
+                    # Take screenshot; the disk write runs in a worker thread so
+                    # concurrent agents don't stall on file I/O
+                    screenshot_path = f"screenshots/{url.replace('http://', '').replace('/', '_')}.jpg"
+                    image_bytes = await page.screenshot(full_page=True, type="jpeg", quality=SCREENSHOT_JPEG_QUALITY)
+                    await asyncio.to_thread(Path(screenshot_path).write_bytes, image_bytes)
+                    
+                    sm.emit_buffered("agent_log", {"agent_name": "WATCHER", "message": f"Screenshot saved: {screenshot_path}"})
                     
                     # Perform Visual QA (Vibe Check) - Enhanced with Gemini Vision
                     visual_issues = await self.analyze_visuals(screenshot_path, console_logs, sm)
                     errors.extend([issue['issue'] for issue in visual_issues])
-                    
+                
                 except Exception as nav_error:
                     errors.append(f"Navigation failed: {str(nav_error)}")
-                
-                await browser.close()
+                    # Whatever the page logged before failing is the best clue to why
+                    console_logs.extend(await _read_console_buffer(page))
+            finally:
+                await context.close()
         
         except ImportError:
-            await sm.emit("agent_log", {"agent_name": "WATCHER", "message": "Playwright not installed. Skipping browser test."})
+            sm.emit_buffered("agent_log", {"agent_name": "WATCHER", "message": "Playwright not installed. Skipping browser test."})
             return {
                 "status": "SKIPPED",
                 "reason": "Playwright not installed",
@@ -481,9 +528,9 @@ Respond in JSON format:
         all_errors = errors + [err["text"] for err in console_errors]
         
         if all_errors:
-            await sm.emit("agent_log", {"agent_name": "WATCHER", "message": f"Found {len(all_errors)} errors"})
+            sm.emit_buffered("agent_log", {"agent_name": "WATCHER", "message": f"Found {len(all_errors)} errors"})
             for err in all_errors[:3]:  # Show first 3 errors
-                await sm.emit("agent_log", {"agent_name": "WATCHER", "message": f"  → {err[:100]}"})
+                sm.emit_buffered("agent_log", {"agent_name": "WATCHER", "message": f"  → {err[:100]}"})
             
             return {
                 "status": "FAIL",
@@ -494,7 +541,7 @@ Respond in JSON format:
                 "fix_this": True
             }
         else:
-            await sm.emit("agent_log", {"agent_name": "WATCHER", "message": "Page loaded successfully!"})
+            sm.emit_buffered("agent_log", {"agent_name": "WATCHER", "message": "Page loaded successfully!"})
             return {
                 "status": "PASS",
                 "errors": [],
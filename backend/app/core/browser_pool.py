@@ -0,0 +1,47 @@
+# Browser Pool - One shared headless Chromium per process
+# Launching Chromium costs hundreds of ms; callers open a cheap context per run instead.
+
+import asyncio
+
+
+class BrowserPool:
+    """Lazily launches a headless Chromium and hands the same instance to every caller."""
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+
+    async def get_browser(self):
+        """
+        Return the shared browser, (re)launching it if needed.
+        Raises ImportError when Playwright is not installed, like a direct import would.
+        """
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                from playwright.async_api import async_playwright
+
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            return self._browser
+
+    async def close(self):
+        """Shut down the browser and the Playwright driver (app shutdown)."""
+        async with self._lock:
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception as e:
+                    print(f"Browser pool close error: {e}")
+                self._browser = None
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception as e:
+                    print(f"Playwright stop error: {e}")
+                self._playwright = None
+
+
+# Singleton instance
+browser_pool = BrowserPool()
@@ -1,24 +1,51 @@
+import asyncio
 import hashlib
-import json
+import orjson
+import re
+import time
 from typing import Optional
 from redis import asyncio as aioredis
 import os
 
+# Sentence punctuation and quotes; periods only at word end so "next.js" survives
+_PROMPT_PUNCT_RE = re.compile(r"[!?,;:\"'`]+|\.(?=\s|$)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical prompt form for cache keys: case, punctuation and spacing don't change the answer."""
+    return _WHITESPACE_RE.sub(" ", _PROMPT_PUNCT_RE.sub(" ", prompt.lower())).strip()
+
 class AIResponseCache:
     """Cache AI responses to reduce API calls and costs."""
     
     def __init__(self):
-        self.memory_cache = {}  # Simple in-memory cache
+        self.memory_cache = {}  # key -> (expires_at, response)
         self.redis = None  # Optional Redis for production
+        self.ready = False  # True once init_redis has run; callers can skip the await
+        self._init_lock = asyncio.Lock()
+        self._pending = set()  # Strong refs to background Redis writes
         
     async def init_redis(self):
-        """Initialize Redis connection if URL is provided."""
-        redis_url = os.getenv("REDIS_URL", "redis://localhost")
-        try:
-            self.redis = await aioredis.from_url(redis_url, encoding="utf-8", decode_responses=True)
-        except Exception:
-            # Fall back to memory cache silently or log
-            pass
+        """
+        Initialize Redis connection if URL is provided.
+        Idempotent: the first call builds one shared connection pool, later
+        (or concurrent) calls return without opening new connections.
+        """
+        if self.ready:
+            return
+        async with self._init_lock:
+            if self.ready:
+                return
+            redis_url = os.getenv("REDIS_URL", "redis://localhost")
+            try:
+                pool = aioredis.ConnectionPool.from_url(
+                    redis_url, max_connections=50, encoding="utf-8", decode_responses=True
+                )
+                self.redis = aioredis.Redis(connection_pool=pool)
+            except Exception:
+                # Fall back to memory cache silently or log
+                pass
+            self.ready = True
     
     def _generate_key(self, prompt: str, model: str, **kwargs) -> str:
         """Generate cache key from prompt and parameters."""
@@ -27,9 +54,8 @@ class AIResponseCache:
             "model": model,
             **kwargs
         }
-        # Sort keys to ensure consistent hash
-        cache_str = json.dumps(cache_data, sort_keys=True)
-        return hashlib.sha256(cache_str.encode()).hexdigest()
+        # Sort keys to ensure consistent hash; orjson emits bytes, so no encode step
+        return hashlib.sha256(orjson.dumps(cache_data, option=orjson.OPT_SORT_KEYS)).hexdigest()
     
     async def get(self, prompt: str, model: str, **kwargs) -> Optional[str]:
         """Get cached response if available."""
@@ -44,22 +70,47 @@ class AIResponseCache:
             except Exception:
                 pass
         
-        # Fall back to memory
-        return self.memory_cache.get(key)
+        # Fall back to memory, evicting expired entries on read
+        entry = self.memory_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self.memory_cache[key]
+            return None
+        return response
     
     async def set(self, prompt: str, model: str, response: str, ttl: int = 3600, **kwargs):
         """Cache AI response."""
         key = self._generate_key(prompt, model, **kwargs)
         
-        # Store in memory
-        self.memory_cache[key] = response
+        # Store in memory with the same TTL as Redis
+        self.memory_cache[key] = (time.monotonic() + ttl, response)
         
         # Store in Redis with TTL
+        await self._redis_setex(key, ttl, response)
+    
+    def set_nowait(self, prompt: str, model: str, response: str, ttl: int = 3600, **kwargs):
+        """
+        Cache AI response without waiting on Redis.
+        The memory entry is visible immediately; the Redis write runs as a
+        background task. Only use for idempotent writes.
+        """
+        key = self._generate_key(prompt, model, **kwargs)
+        self.memory_cache[key] = (time.monotonic() + ttl, response)
+        
+        if self.redis:
+            task = asyncio.create_task(self._redis_setex(key, ttl, response))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+    
+    async def _redis_setex(self, key: str, ttl: int, response: str):
+        """Write to Redis, swallowing errors (memory cache still has the entry)."""
         if self.redis:
             try:
                 await self.redis.setex(key, ttl, response)
-            except Exception:
-                pass
+            except Exception as e:
+                print(f"Cache write error: {e}")
 
 # Singleton instance
 cache = AIResponseCache()
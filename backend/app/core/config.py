@@ -53,6 +53,15 @@ class Settings(BaseSettings):
     ENABLE_CACHE: bool = True
     CACHE_TTL_HOURS: int = 24
     
+    # Architect: race two generations on the first attempt. Opt in with
+    # SPECULATIVE_RETRIES=true; it doubles the token cost of that attempt.
+    SPECULATIVE_RETRIES: bool = False
+    
+    # Browser validator: thorough mode skips link/form checks when the earlier phases score below this
+    # (0 disables). The default is the POOR band; only interactivity/accessibility can FAIL (score 0),
+    # the other phases score at least 50, so lower thresholds almost never trigger.
+    BROWSER_EARLY_EXIT_SCORE: int = 50
+    
     # Cleanup
     PROJECT_RETENTION_HOURS: int = 24
     ENABLE_AUTO_CLEANUP: bool = True
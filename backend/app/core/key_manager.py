@@ -1,10 +1,16 @@
 # app/core/key_manager.py
-from typing import List, Optional, Set
+from typing import Dict, List, Optional
 from google.genai import Client as GeminiClient
 import os
+import time
+
+# Seconds a key stays out of rotation after a quota error. Most 429s are
+# per-minute limits, and the KeyManager lives as long as the process, so an
+# exhausted key has to come back on its own.
+KEY_COOLDOWN_SECONDS = 60.0
 
 class KeyManager:
-    def __init__(self, keys: Optional[List[str]] = None):
+    def __init__(self, keys: Optional[List[str]] = None, cooldown: float = KEY_COOLDOWN_SECONDS):
         if keys is None:
             from app.core.config import settings
             keys = settings.api_keys_list
@@ -15,7 +21,11 @@ class KeyManager:
              
         self.keys = keys
         self.index = 0
-        self.exhausted: Set[str] = set()
+        self.cooldown = cooldown
+        # Exhausted key -> time.monotonic() at which it may be used again
+        self.exhausted: Dict[str, float] = {}
+        # One client per key, reused across calls instead of a new HTTP client each time
+        self._clients: Dict[str, GeminiClient] = {}
         # list of 30+ Gemini API keys
         # current key index
         # optionally track exhausted keys
@@ -25,6 +35,8 @@ class KeyManager:
         if not self.keys:
             raise RuntimeError("No API keys available in KeyManager.")
         
+        self._release_expired()
+        
         # Check if all keys are exhausted
         if len(self.exhausted) >= len(self.keys):
              raise RuntimeError("All API keys have been exhausted.")
@@ -36,7 +48,9 @@ class KeyManager:
             self.rotate_key()
             key = self.keys[self.index]
 
-        client = GeminiClient(api_key=key)
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = GeminiClient(api_key=key)
         return client
 
     def rotate_key(self) -> None:
@@ -44,6 +58,8 @@ class KeyManager:
         if not self.keys:
             raise RuntimeError("No keys to rotate.")
         
+        self._release_expired()
+        
         # Cycle until finding a non-exhausted key
         n = len(self.keys)
         # Try n times to find a usable key
@@ -57,5 +73,12 @@ class KeyManager:
         raise RuntimeError("All API keys have been exhausted.")
 
     def mark_exhausted(self, key: str) -> None:
-        """Mark a key as exhausted (e.g. after a quota error)."""
-        self.exhausted.add(key)
+        """Mark a key as exhausted (e.g. after a quota error) for the cooldown period."""
+        self.exhausted[key] = time.monotonic() + self.cooldown
+
+    def _release_expired(self) -> None:
+        """Return keys whose cooldown has passed to the rotation."""
+        if self.exhausted:
+            now = time.monotonic()
+            for key in [k for k, until in self.exhausted.items() if until <= now]:
+                del self.exhausted[key]
@@ -3,7 +3,28 @@
 
 import aiohttp
 import json
-from typing import Optional, Dict, Any
+import time
+from functools import lru_cache
+from typing import Optional, Dict, Any, AsyncIterator
+
+# The shared client (get_hybrid_client) outlives any one request, so its fallback
+# state expires: local mode is left after LOCAL_MODE_TTL seconds to retry Gemini,
+# and Ollama's availability is re-checked after OLLAMA_CHECK_TTL seconds.
+LOCAL_MODE_TTL = 300.0
+OLLAMA_CHECK_TTL = 60.0
+
+def is_quota_error(error_str: str) -> bool:
+    """
+    True for Gemini rate-limit / quota failures that warrant key rotation, including
+    KeyManager refusing a client while every key is still cooling down.
+    """
+    return (
+        "429" in error_str
+        or "quota" in error_str.lower()
+        or "RESOURCE_EXHAUSTED" in error_str
+        or "All API keys have been exhausted" in error_str
+    )
+
 
 class OllamaClient:
     """
@@ -162,14 +183,24 @@ class HybridModelClient:
         self.km = key_manager or KeyManager()
         self.ollama = OllamaClient()
         self.use_local = False  # Track if we're in local mode
+        self._local_until = 0.0  # When local mode ends and Gemini is tried again
         self._ollama_available = None  # Cache availability check
+        self._ollama_checked_at = 0.0
     
     async def check_ollama(self) -> bool:
-        """Check if Ollama is available (cached)."""
-        if self._ollama_available is None:
+        """Check if Ollama is available (cached for OLLAMA_CHECK_TTL seconds)."""
+        now = time.monotonic()
+        if self._ollama_available is None or now - self._ollama_checked_at >= OLLAMA_CHECK_TTL:
             self._ollama_available = await self.ollama.is_available()
+            self._ollama_checked_at = now
         return self._ollama_available
     
+    def _in_local_mode(self) -> bool:
+        """Whether to go straight to Ollama; local mode expires after LOCAL_MODE_TTL."""
+        if self.use_local and time.monotonic() >= self._local_until:
+            self.use_local = False
+        return self.use_local
+    
     async def generate(self, prompt: str, json_mode: bool = False) -> str:
         """
         Generate text using best available model.
@@ -179,7 +210,7 @@ class HybridModelClient:
         sm = SocketManager()
         
         # If we're in local mode and Ollama is available, use it directly
-        if self.use_local:
+        if self._in_local_mode():
             if await self.check_ollama():
                 await sm.emit("agent_log", {"agent_name": "SYSTEM", "message": "🏠 Using local model (Ollama)..."})
                 return await self.ollama.generate(prompt, json_mode=json_mode)
@@ -202,13 +233,14 @@ class HybridModelClient:
             error_str = str(e)
             
             # Check for quota errors
-            if "429" in error_str or "quota" in error_str.lower() or "RESOURCE_EXHAUSTED" in error_str:
+            if is_quota_error(error_str):
                 await sm.emit("agent_log", {"agent_name": "SYSTEM", "message": "⚠️ API key exhausted. Rotating..."})
                 
                 try:
                     # Mark current key as exhausted
                     current_key = self.km.keys[self.km.index]
-                    self.km.mark_exhausted(current_key)
+                    if current_key not in self.km.exhausted:  # Don't extend a running cooldown
+                        self.km.mark_exhausted(current_key)
                     self.km.rotate_key()
                     
                     # Retry with new key
@@ -222,6 +254,7 @@ class HybridModelClient:
                      # Try Ollama fallback
                      if await self.check_ollama():
                          self.use_local = True
+                         self._local_until = time.monotonic() + LOCAL_MODE_TTL
                          await sm.emit("agent_log", {"agent_name": "SYSTEM", "message": f"🏠 Using Ollama: {self.ollama.current_model}"})
                          
                          # Select best available model
@@ -238,3 +271,44 @@ class HybridModelClient:
             
             # Other errors - re-raise
             raise
+
+    async def stream(self, prompt: str, json_mode: bool = False) -> AsyncIterator[str]:
+        """
+        Yield response text chunks as Gemini produces them, so callers can
+        start inspecting (or abandon) a response before it is complete.
+        Local mode and quota failures go through generate() and arrive as one chunk.
+        """
+        if self._in_local_mode():
+            yield await self.generate(prompt, json_mode)
+            return
+        
+        started = False
+        try:
+            client = self.km.get_client()
+            config = {"response_mime_type": "application/json"} if json_mode else {}
+            
+            response_stream = await client.aio.models.generate_content_stream(
+                model="gemini-2.5-flash",
+                contents=prompt,
+                config=config
+            )
+            async for chunk in response_stream:
+                if chunk.text:
+                    started = True
+                    yield chunk.text
+                    
+        except Exception as e:
+            # Rotation / Ollama fallback only makes sense before any output was sent
+            if started or not is_quota_error(str(e)):
+                raise
+            yield await self.generate(prompt, json_mode)
+
+
+@lru_cache(maxsize=1)
+def get_hybrid_client() -> HybridModelClient:
+    """
+    Process-wide HybridModelClient.
+    Agents share key rotation state and the cached Ollama availability check
+    instead of rebuilding a KeyManager on every call.
+    """
+    return HybridModelClient()
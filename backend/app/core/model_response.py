@@ -1,6 +1,36 @@
+import re
 from dataclasses import dataclass
 
+# Body of each markdown-fenced block (any language tag); an unclosed last fence runs to the end
+FENCED_BLOCK_RE = re.compile(r"```[\w+#-]*[ \t]*\n(.*?)(?:```|\Z)", re.S)
+
+# A bare language/framework word some models put before the code itself
+LEADING_LANGUAGE_RE = re.compile(r"^\s*(?:python|pytest|typescript|javascript|vitest|jest)\s+", re.IGNORECASE)
+
 @dataclass
 class ModelResponse:
     output: str
     thought_signature: str
+
+def extract_json_object(text: str) -> str:
+    """
+    Slice out the outermost {...} of an LLM response, dropping markdown fences
+    and surrounding prose without building intermediate strings.
+    Returns the stripped text unchanged when there is no object to slice.
+    """
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end < start:
+        return text.strip()
+    return text[start:end + 1]
+
+def strip_code_fences(text: str) -> str:
+    """
+    Reduce an LLM code response to the code. When it contains fenced blocks,
+    only their bodies are kept (prose around them is dropped); a leading
+    language identifier is removed either way.
+    """
+    blocks = FENCED_BLOCK_RE.findall(text)
+    if blocks:
+        text = "\n".join(blocks)
+    return LEADING_LANGUAGE_RE.sub("", text, count=1).strip()
@@ -13,6 +13,7 @@ from app.core.key_manager import KeyManager
 from app.core.HybridModelClient import HybridModelClient
 from app.core.model_response import ModelResponse
 from app.core.config import settings
+from app.core.socket_manager import SocketManager
 
 # Agents
 from app.agents.architect import ArchitectAgent
@@ -83,7 +84,6 @@ async def load_state(agent_id: str) -> Optional[AgentState]:
 # --- NODES ---
 
 async def architect_node(state: AgentState):
-    from app.core.socket_manager import SocketManager
     sm = SocketManager()
     
     # Ensure agent_id is set (using project_id as proxy or separate field)
@@ -132,7 +132,6 @@ async def architect_node(state: AgentState):
 from app.core.filesystem import write_project_files
 
 async def virtuoso_node(state: AgentState):
-    from app.core.socket_manager import SocketManager
     sm = SocketManager()
     
     thread_id = state.project_id
@@ -256,7 +255,6 @@ def _post_process_files(files):
 
 
 async def sentinel_node(state: AgentState):
-    from app.core.socket_manager import SocketManager
     from app.agents.state import Issue
     sm = SocketManager()
     
@@ -305,7 +303,6 @@ async def sentinel_node(state: AgentState):
 
 async def testing_node(state: AgentState):
     """Run automated tests."""
-    from app.core.socket_manager import SocketManager
     sm = SocketManager()
     
     thread_id = state.project_id
@@ -340,7 +337,6 @@ async def testing_node(state: AgentState):
     }
 
 async def watcher_node(state: AgentState):
-    from app.core.socket_manager import SocketManager
     from app.core.filesystem import BASE_PROJECTS_DIR
     from app.agents.state import Issue
     
@@ -412,7 +408,6 @@ async def release_node(state: AgentState):
     - Release manifest
     - README if missing
     """
-    from app.core.socket_manager import SocketManager
     sm = SocketManager()
     
     thread_id = state.project_id
@@ -1,6 +1,7 @@
 # Socket Manager - Owns the Socket.IO server instance
 # This module has NO dependencies on main.py to avoid circular imports
 
+import asyncio
 import socketio
 
 # Create the Socket.IO server instance here
@@ -10,9 +11,15 @@ sio = socketio.AsyncServer(
     cors_allowed_origins="*"
 )
 
+# Buffered events are coalesced over this window into one "<event>_batch" emit
+EMIT_BATCH_INTERVAL = 0.01
+
 class SocketManager:
     """Singleton for emitting events from anywhere in the app."""
     _instance = None
+    _pending = set()  # Strong refs so fire-and-forget emits aren't garbage collected
+    _buffers = {}  # (event, room) -> payloads waiting for the next batch flush
+    _flush_task = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -26,3 +33,28 @@ class SocketManager:
         except Exception as e:
             # Log to console since we can't emit to socket about a socket error
             print(f"Socket Emit Error ({event}): {e}")
+
+    def emit_nowait(self, event: str, data: dict, room: str = None):
+        """Schedule an emit without awaiting it, so progress logs don't stall the caller."""
+        task = asyncio.create_task(self.emit(event, data, room=room))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def emit_buffered(self, event: str, data: dict, room: str = None):
+        """
+        Queue a high-frequency event (progress logs) without awaiting it.
+        Everything queued within EMIT_BATCH_INTERVAL goes out as a single
+        "<event>_batch" emit carrying the list of payloads, in order.
+        """
+        self._buffers.setdefault((event, room), []).append(data)
+        if self._flush_task is None or self._flush_task.done():
+            SocketManager._flush_task = asyncio.create_task(self._flush_buffers())
+
+    async def _flush_buffers(self):
+        await asyncio.sleep(EMIT_BATCH_INTERVAL)
+        # emit_buffered schedules no new flush while this task runs, so payloads
+        # queued during an emit are picked up by another pass here
+        while SocketManager._buffers:
+            buffers, SocketManager._buffers = SocketManager._buffers, {}
+            for (event, room), batch in buffers.items():
+                await self.emit(f"{event}_batch", batch, room=room)
@@ -12,8 +12,13 @@ from app.core.database import create_db_and_tables
 async def lifespan(app: FastAPI):
     # Startup: Create DB tables
     create_db_and_tables()
+    # Warm the shared Redis pool once so requests don't race to open it
+    from app.core.cache import cache
+    await cache.init_redis()
     yield
-    # Shutdown logic if needed
+    # Shutdown: release the shared headless browser
+    from app.core.browser_pool import browser_pool
+    await browser_pool.close()
 
 # Initialize FastAPI app
 fastapi_app = FastAPI(
@@ -0,0 +1,88 @@
+import pytest
+import sys
+import os
+import asyncio
+from unittest.mock import patch
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.getcwd())
+
+from app.agents.advisor import AdvisorAgent
+
+
+@pytest.mark.asyncio
+async def test_analyze_deployment_dedupes_identical_requests():
+    calls = []
+
+    async def fake_generate(self, prompt, json_mode=False):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return '{"platform": "Render", "cost_estimate": "$7/mo", "config_files": []}'
+
+    agent = AdvisorAgent()
+    details = {"project_name": "dedupe-test", "tech_stack": "FastAPI"}
+
+    with patch("app.core.local_model.HybridModelClient.generate", fake_generate):
+        results = await asyncio.gather(*[agent.analyze_deployment(dict(details)) for _ in range(3)])
+
+    assert len(calls) == 1
+    assert all(r["platform"] == "Render" for r in results)
+    assert agent._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_analyze_deployment_keeps_lock_for_waiters_after_first_call_errors():
+    calls = []
+    agent = AdvisorAgent()
+    details = {"project_name": "dedupe-error-test", "tech_stack": "FastAPI"}
+
+    async def flaky_generate(self, prompt, json_mode=False):
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise Exception("503 UNAVAILABLE")
+        # The remaining callers still share one lock, so later arrivals would queue behind this call
+        assert len(agent._inflight) == 1 and sum(agent._waiters.values()) == 2
+        return '{"platform": "Render", "cost_estimate": "$7/mo", "config_files": []}'
+
+    with patch("app.core.local_model.HybridModelClient.generate", flaky_generate):
+        results = await asyncio.gather(*[agent.analyze_deployment(dict(details)) for _ in range(3)])
+
+    assert results[0] == {"error": "503 UNAVAILABLE"}
+    assert results[1]["platform"] == results[2]["platform"] == "Render"
+    assert len(calls) == 2  # The third caller is served from the second caller's cached result
+    assert agent._inflight == {} and agent._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_analyze_deployment_skips_llm_for_frontend_only():
+    async def fail_generate(self, prompt, json_mode=False):
+        raise AssertionError("LLM should not be called")
+
+    agent = AdvisorAgent()
+    blueprint = {
+        "project_type": "dynamic",
+        "primary_stack": "nextjs",
+        "file_structure": [{"path": "frontend/app/page.tsx", "description": "Main page"}],
+    }
+
+    with patch("app.core.local_model.HybridModelClient.generate", fail_generate):
+        result = await agent.analyze_deployment(blueprint)
+
+    assert result["platform"] == "Vercel"
+
+
+def test_rule_recommendation_defers_full_stack_projects():
+    agent = AdvisorAgent()
+    blueprint = {
+        "primary_stack": "nextjs",
+        "file_structure": [
+            {"path": "frontend/app/page.tsx"},
+            {"path": "backend/app/main.py"},
+        ],
+    }
+
+    recommendation, confidence = agent._confident_rule_recommendation(blueprint)
+
+    assert recommendation is None
+    assert confidence == 0.0
@@ -22,21 +22,17 @@ async def test_watcher_agent_verify_page():
     
     agent = WatcherAgent()
     
-    # Patch where it is imported from
-    with patch("playwright.async_api.async_playwright") as mock_pw_func:
-        # Mock Playwright
-        mock_context_mgr = MagicMock()
-        mock_p = MagicMock()
-        mock_context_mgr.__aenter__.return_value = mock_p
-        mock_pw_func.return_value = mock_context_mgr
-        
+    # Patch the shared browser pool the watcher draws from
+    with patch("app.agents.watcher.browser_pool.get_browser", new_callable=AsyncMock) as mock_get_browser:
         mock_browser = AsyncMock()
-        mock_p.chromium.launch.side_effect = AsyncMock(return_value=mock_browser)
+        mock_get_browser.return_value = mock_browser
         
         mock_context = AsyncMock()
         mock_browser.new_context.return_value = mock_context
         
         mock_page = AsyncMock()
+        mock_page.screenshot.return_value = b"png"
+        mock_page.evaluate.return_value = [{"type": "log", "text": "ready"}]
         mock_context.new_page.return_value = mock_page
         
         # Mock response for goto
@@ -45,7 +41,8 @@ async def test_watcher_agent_verify_page():
         mock_page.goto.return_value = mock_response
         
         # Test verify_page directly
-        with patch.object(agent, "analyze_visuals", return_value=[]) as mock_analyze:
+        with patch.object(agent, "analyze_visuals", return_value=[]) as mock_analyze, \
+             patch("app.agents.watcher.asyncio.to_thread", new_callable=AsyncMock) as mock_to_thread:
              result = await agent.verify_page("http://localhost:3000")
              
              # Debug failure if any
@@ -55,14 +52,75 @@ async def test_watcher_agent_verify_page():
              assert result["status"] == "PASS"
              mock_page.goto.assert_called()
              mock_page.screenshot.assert_called()
+             assert mock_page.screenshot.call_args.kwargs["type"] == "jpeg"
+             assert result["screenshot"].endswith(".jpg")
+             mock_page.add_init_script.assert_called_once()
+             mock_context.route.assert_called_once()
+             assert result["console_logs"] == [{"type": "log", "text": "ready"}]
+             assert mock_to_thread.call_args.args[1] == b"png" # Bytes written off the event loop
              mock_analyze.assert_called() # Check if Vibe check was called
+             mock_context.close.assert_called() # Context released, pooled browser kept
+             mock_browser.close.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_watcher_keeps_browser_errors_when_navigation_fails():
+    agent = WatcherAgent()
+
+    with patch("app.agents.watcher.browser_pool.get_browser", new_callable=AsyncMock) as mock_get_browser:
+        mock_browser = AsyncMock()
+        mock_get_browser.return_value = mock_browser
+        mock_context = AsyncMock()
+        mock_browser.new_context.return_value = mock_context
+
+        mock_page = AsyncMock()
+        mock_page.on = MagicMock()
+        mock_page.evaluate.return_value = [{"type": "log", "text": "booting"}]
+        mock_context.new_page.return_value = mock_page
+
+        async def failing_goto(url, **kwargs):
+            # Browser-originated error, never seen by console.error
+            on_console = next(call.args[1] for call in mock_page.on.call_args_list if call.args[0] == "console")
+            on_console(MagicMock(type="error", text="Failed to load resource: 404 (Not Found)"))
+            on_console(MagicMock(type="log", text="duplicated by the in-page buffer"))
+            raise TimeoutError("Timeout 20000ms exceeded")
+        mock_page.goto.side_effect = failing_goto
+
+        result = await agent.verify_page("http://localhost:3000")
+
+    assert result["status"] == "FAIL"
+    assert "Failed to load resource: 404 (Not Found)" in result["errors"]
+    assert any(err.startswith("Navigation failed") for err in result["errors"])
+    assert {"type": "log", "text": "booting"} in result["console_logs"]
+    assert len(result["console_logs"]) == 2
+
+@pytest.mark.asyncio
+async def test_watcher_blocks_heavy_resources():
+    from app.agents.watcher import _block_heavy_resources
+
+    def make_route(url, resource_type):
+        route = AsyncMock()
+        route.request.url = url
+        route.request.resource_type = resource_type
+        return route
+
+    font = make_route("http://localhost:3000/font.woff2", "font")
+    tracker = make_route("https://www.google-analytics.com/collect", "script")
+    page_script = make_route("http://localhost:3000/main.js", "script")
+
+    for route in (font, tracker, page_script):
+        await _block_heavy_resources(route)
+
+    font.abort.assert_awaited_once()
+    tracker.abort.assert_awaited_once()
+    page_script.continue_.assert_awaited_once()
+    page_script.abort.assert_not_called()
 
 # --- TestingAgent Tests ---
 @pytest.mark.asyncio
 async def test_testing_agent_run():
     state = AgentState(agent_id="tester", project_id="p1")
     
-    with patch("app.agents.testing_agent.subprocess.run") as mock_run:
+    with patch("app.agents.testing_agent.run_command", new_callable=AsyncMock) as mock_run:
         # Mock pytest failure
         mock_pytest = MagicMock()
         mock_pytest.returncode = 1
@@ -106,3 +164,4 @@ async def test_sentinel_agent_batch_audit():
          assert report["status"] == "BLOCKED"
          assert len(report["vulnerabilities"]) == 1
          assert report["vulnerabilities"][0]["description"] == "Hardcoded password"
+
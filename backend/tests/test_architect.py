@@ -0,0 +1,222 @@
+import pytest
+import sys
+import os
+import asyncio
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.getcwd())
+
+from app.agents.architect import ArchitectAgent
+
+
+VALID_BLUEPRINT = '{"project_name": "demo", "file_structure": [{"path": "main.py"}]}'
+
+
+class FakeClient:
+    """Returns queued responses, each after its own delay."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    async def generate(self, prompt, json_mode=False):
+        delay, text = self.responses[self.calls]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return text
+
+    async def stream(self, prompt, json_mode=False):
+        text = await self.generate(prompt, json_mode)
+        for i in range(0, len(text), 16):
+            yield text[i:i + 16]
+
+
+@pytest.mark.asyncio
+async def test_race_blueprints_returns_first_parsed():
+    agent = ArchitectAgent()
+    client = FakeClient([
+        (0.0, "not json"),
+        (0.01, '```json\n' + VALID_BLUEPRINT + '\n```'),
+    ])
+
+    result = await agent._race_blueprints(client, "prompt", 2)
+
+    assert result["project_name"] == "demo"
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_race_blueprints_raises_when_all_fail():
+    agent = ArchitectAgent()
+    client = FakeClient([(0.0, "nope"), (0.0, "still nope")])
+
+    with pytest.raises(ValueError):
+        await agent._race_blueprints(client, "prompt", 2)
+
+
+@pytest.mark.asyncio
+async def test_generate_blueprint_abandons_prose_stream_early():
+    agent = ArchitectAgent()
+    consumed = []
+
+    class ProseClient:
+        async def stream(self, prompt, json_mode=False):
+            for _ in range(20):
+                chunk = "I cannot produce a blueprint for that request. "
+                consumed.append(chunk)
+                yield chunk
+
+    with pytest.raises(ValueError):
+        await agent._generate_blueprint(ProseClient(), "prompt")
+
+    assert len(consumed) == 5
+
+
+@pytest.mark.asyncio
+async def test_generate_blueprint_accepts_prose_prefixed_json():
+    agent = ArchitectAgent()
+
+    class PreambleClient:
+        async def stream(self, prompt, json_mode=False):
+            for chunk in ["Sure! Here is ", "your blueprint: ", VALID_BLUEPRINT]:
+                yield chunk
+
+    result = await agent._generate_blueprint(PreambleClient(), "prompt")
+
+    assert result["file_structure"] == [{"path": "main.py"}]
+
+
+@pytest.mark.asyncio
+async def test_race_blueprints_skips_schema_invalid_output():
+    agent = ArchitectAgent()
+    client = FakeClient([
+        (0.0, '{"project_name": "demo", "file_structure": []}'),
+        (0.01, VALID_BLUEPRINT),
+    ])
+
+    result = await agent._race_blueprints(client, "prompt", 2)
+
+    assert result["file_structure"] == [{"path": "main.py"}]
+
+
+def test_detect_frontend_stack():
+    from app.agents.architect import detect_frontend_stack, find_path_markers
+
+    def detect(stack, paths):
+        return detect_frontend_stack(stack, find_path_markers(paths))
+
+    assert detect("Next.js + FastAPI", []) == "nextjs"
+    assert detect("React", ["frontend/next.config.js"]) == "nextjs"
+    assert detect("React + Tailwind", []) == "vite"
+    assert detect("", ["frontend/vite.config.js"]) == "vite"
+    assert detect("FastAPI", ["backend/main.py"]) == ""
+
+
+def test_find_path_markers():
+    from app.agents.architect import find_path_markers
+
+    paths = ["frontend/app/page.tsx", "frontend/pages/index.tsx", "backend/main.py"]
+
+    assert find_path_markers(paths) == {"app/page.tsx", "pages/index.tsx"}
+
+
+def test_needs_frontend_prefix():
+    from app.agents.architect import NEEDS_FRONTEND_PREFIX_RE
+
+    assert NEEDS_FRONTEND_PREFIX_RE.match("app/page.tsx")
+    assert NEEDS_FRONTEND_PREFIX_RE.match("tailwind.config.js")
+    assert not NEEDS_FRONTEND_PREFIX_RE.match("frontend/app/page.tsx")
+    assert not NEEDS_FRONTEND_PREFIX_RE.match("backend/templates/index.html")
+    assert not NEEDS_FRONTEND_PREFIX_RE.match("main.py")
+
+
+@pytest.mark.asyncio
+async def test_design_system_stops_on_fatal_error():
+    from unittest.mock import patch, AsyncMock
+
+    class FatalClient:
+        calls = 0
+
+        async def stream(self, prompt, json_mode=False):
+            FatalClient.calls += 1
+            raise Exception("API quota exhausted and Ollama not available. Run: ollama serve")
+            yield
+
+    with patch("app.agents.architect.get_hybrid_client", return_value=FatalClient()), \
+         patch("app.agents.architect.settings.SPECULATIVE_RETRIES", True), \
+         patch("app.agents.architect.cache.get", new_callable=AsyncMock, return_value=None), \
+         patch("app.agents.architect.cache.init_redis", new_callable=AsyncMock), \
+         patch("app.agents.architect.SocketManager.emit_buffered"), \
+         patch("app.agents.architect.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        result = await ArchitectAgent().design_system("todo app")
+
+    assert "error" in result
+    # Only the speculative first attempt ran; no backoff before giving up
+    assert FatalClient.calls == 2
+    mock_sleep.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_design_system_without_speculation_makes_single_call():
+    from unittest.mock import patch, AsyncMock
+    from app.core.config import Settings
+
+    client = FakeClient([(0.0, VALID_BLUEPRINT)])
+    # Speculation is opt-in
+    assert Settings.model_fields["SPECULATIVE_RETRIES"].default is False
+
+    with patch("app.agents.architect.get_hybrid_client", return_value=client), \
+         patch("app.agents.architect.settings.SPECULATIVE_RETRIES", False), \
+         patch("app.agents.architect.cache.get", new_callable=AsyncMock, return_value=None), \
+         patch("app.agents.architect.cache.set_nowait"), \
+         patch("app.agents.architect.cache.init_redis", new_callable=AsyncMock):
+        result = await ArchitectAgent().design_system("todo app")
+
+    assert result["project_name"] == "demo"
+    assert client.calls == 1
+
+
+def test_architect_prompt_echoes_tech_stack_preference():
+    from app.agents.architect import ARCHITECT_PREAMBLE, ARCHITECT_REQUEST
+
+    prompt = ARCHITECT_PREAMBLE + ARCHITECT_REQUEST.substitute(user_prompt="todo app", tech_stack="Next.js + FastAPI")
+
+    # The static preamble still asks for the caller's preference in "tech_stack"
+    assert '"tech_stack": "string (the TECH STACK PREFERENCE given below, verbatim)"' in ARCHITECT_PREAMBLE
+    assert prompt.index("Next.js + FastAPI") > len(ARCHITECT_PREAMBLE)
+
+
+def test_blueprint_ttl_by_stack_and_complexity():
+    from app.agents.architect import blueprint_ttl
+
+    static_ttl = blueprint_ttl({"project_type": "static", "primary_stack": "static"})
+    nextjs_ttl = blueprint_ttl({"project_type": "dynamic", "primary_stack": "nextjs"})
+    complex_ttl = blueprint_ttl({"project_type": "static", "primary_stack": "static", "complexity": "complex"})
+
+    assert static_ttl > nextjs_ttl
+    assert complex_ttl == 12 * 3600
+
+
+@pytest.mark.asyncio
+async def test_design_system_safety_net_fixes_nextjs_layout():
+    from unittest.mock import patch, AsyncMock
+
+    blueprint = (
+        '{"project_name": "site", "project_type": "dynamic", "primary_stack": "nextjs",'
+        ' "tech_stack": "Next.js", "file_structure": ['
+        '{"path": "page.tsx", "description": "Main page"},'
+        '{"path": "frontend/tsconfig.json", "description": "TS config"}]}'
+    )
+    client = FakeClient([(0.0, blueprint), (0.05, blueprint)])
+
+    with patch("app.agents.architect.get_hybrid_client", return_value=client), \
+         patch("app.agents.architect.cache.get", new_callable=AsyncMock, return_value=None), \
+         patch("app.agents.architect.cache.set_nowait") as mock_set, \
+         patch("app.agents.architect.cache.init_redis", new_callable=AsyncMock):
+        result = await ArchitectAgent().design_system("portfolio", "Next.js")
+
+    paths = [f["path"] for f in result["file_structure"]]
+    assert "frontend/app/page.tsx" in paths
+    assert "frontend/next.config.js" in paths
+    assert paths.count("frontend/tsconfig.json") == 1
+    mock_set.assert_called_once()
@@ -559,5 +559,270 @@ class TestBrowserValidationIntegration:
             mock_validate.assert_called_once_with("http://localhost:3000", "", validation_level="quick")
 
 
+
+class TestBrowserValidationRoundTrips:
+    """Validation keeps navigations and CDP round-trips to a minimum."""
+    
+    @pytest.fixture
+    def browser_agent(self):
+        from app.agents.browser_validation_agent import BrowserValidationAgent
+        return BrowserValidationAgent()
+    
+    @pytest.mark.asyncio
+    async def test_interactivity_reads_counts_in_one_evaluate(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_page.evaluate = AsyncMock(return_value={
+            "buttons": 2, "links": 4, "inputs": 0,
+            "button_states": [
+                {"visible": True, "enabled": True},
+                {"visible": True, "enabled": False}
+            ]
+        })
+        mock_button = AsyncMock()
+        mock_button_locator = Mock(element_handles=AsyncMock(return_value=[mock_button, AsyncMock()]))
+        mock_page.locator = Mock(return_value=mock_button_locator)
+        
+        with patch("app.agents.browser_validation_agent.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            result = await browser_agent._test_interactivity(mock_page, "http://localhost:3000", Mock(emit=AsyncMock()))
+        
+        mock_page.evaluate.assert_awaited_once()
+        assert result["interactive_elements"] == {"buttons": 2, "links": 4, "inputs": 0}
+        assert result["issues"] == ["Button 2 is disabled"]
+        mock_button.click.assert_awaited_once_with(timeout=1000, no_wait_after=True)
+        mock_sleep.assert_awaited_once()
+        mock_button_locator.element_handles.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_seo_handles_missing_meta_description(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_page.evaluate = AsyncMock(return_value={
+            "title": "A reasonably long title", "meta_description": None, "h1": 1, "h2": 2
+        })
+        mock_page.locator = Mock(side_effect=AssertionError("locator should not be used"))
+        
+        mock_sm = Mock(emit=AsyncMock())
+        
+        result = await browser_agent._test_seo(mock_page, "http://localhost:3000", mock_sm)
+        
+        mock_sm.emit.assert_not_awaited()  # Progress logs are buffered, not awaited
+        assert mock_sm.emit_buffered.call_count == 2
+        assert result["seo_elements"]["headings"] == {"h1": 1, "h2": 2}
+        assert "Meta description missing" in result["issues"]
+    
+    @pytest.mark.asyncio
+    async def test_responsiveness_resizes_one_extra_page(self, browser_agent):
+        widths = {375: [375, 375], 768: [900, 768]}  # [scroll_width, client_width]
+        viewport_page = AsyncMock()
+        viewport_page.viewport_size = None
+        
+        async def set_viewport_size(size):
+            viewport_page.viewport_size = size
+        
+        async def evaluate(script):
+            return widths[viewport_page.viewport_size["width"]]
+        
+        async def new_context(viewport):
+            viewport_page.viewport_size = viewport
+            return mock_context
+        
+        viewport_page.set_viewport_size = AsyncMock(side_effect=set_viewport_size)
+        viewport_page.evaluate = AsyncMock(side_effect=evaluate)
+        mock_context = AsyncMock(new_page=AsyncMock(return_value=viewport_page))
+        
+        mock_page = AsyncMock()
+        mock_page.viewport_size = {"width": 1920, "height": 1080}
+        mock_page.evaluate = AsyncMock(return_value=[1920, 1920])
+        mock_page.context = Mock(browser=Mock(new_context=AsyncMock(side_effect=new_context)))
+        
+        result = await browser_agent._test_responsiveness(mock_page, "http://localhost:3000", Mock(emit=AsyncMock()))
+        
+        viewport_page.goto.assert_awaited_once()  # Mobile and tablet share one navigation
+        mock_context.close.assert_awaited_once()
+        mock_page.set_viewport_size.assert_not_called()  # Desktop reuses the shared page
+        mock_page.evaluate.assert_awaited_once()  # Both widths in a single evaluate
+        assert list(result["viewports"]) == ["mobile", "tablet", "desktop"]
+        assert result["viewports"]["mobile"]["horizontal_scroll"] is False
+        assert result["viewports"]["tablet"]["horizontal_scroll"] is True
+        assert result["viewports"]["desktop"]["horizontal_scroll"] is False
+    
+    @pytest.mark.asyncio
+    async def test_performance_uses_navigation_timing(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_page.evaluate = AsyncMock(return_value={
+            "total_load_time_ms": 6200.456, "dom_interactive": 900, "ttfb": 40, "fcp": 350
+        })
+        
+        result = await browser_agent._test_performance(mock_page, "http://localhost:3000", Mock(emit=AsyncMock()))
+        
+        mock_page.goto.assert_not_called()
+        assert result["metrics"]["total_load_time_ms"] == 6200.46
+        assert result["metrics"]["fcp"] == 350
+        assert result["status"] == "WARN"
+    
+    @pytest.mark.asyncio
+    async def test_links_head_checks_targets_concurrently(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_page.evaluate = AsyncMock(return_value=[
+            ["/about", "http://localhost:3000/about"],
+            ["#top", "http://localhost:3000/#top"],
+            ["mailto:a@b.c", "mailto:a@b.c"],
+            ["/missing", "http://localhost:3000/missing"],
+            ["/about", "http://localhost:3000/about"],
+            ["/slow", "http://localhost:3000/slow"],
+        ])
+        statuses = {"http://localhost:3000/about": 200, "http://localhost:3000/missing": 404}
+        
+        async def head_status(session, link_url):
+            if link_url not in statuses:
+                raise asyncio.TimeoutError()
+            return statuses[link_url]
+        
+        with patch.object(browser_agent, "_head_status", side_effect=head_status) as mock_head:
+            result = await browser_agent._test_links(mock_page, "http://localhost:3000", Mock(emit=AsyncMock()))
+        
+        assert mock_head.call_count == 3  # Anchors, mailto and duplicates skipped
+        assert result["link_summary"] == {"total_links": 6, "tested": 3, "broken": 2}
+        assert "HTTP 404" in result["issues"][0]
+        assert "TimeoutError" in result["issues"][1]  # One failure does not cancel the others
+    
+    @pytest.mark.asyncio
+    async def test_structural_phases_read_shared_snapshot(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_page.evaluate = AsyncMock(return_value={
+            "seo": {"title": "A reasonably long title", "meta_description": "Desc", "h1": 1, "h2": 0},
+            "forms": {"forms": 0, "submit_buttons": 0, "required_inputs": 0}
+        })
+        
+        snapshot = await browser_agent._dom_snapshot(mock_page, ["seo", "forms"])
+        seo = await browser_agent._test_seo(mock_page, "http://localhost:3000", Mock(), snapshot=snapshot)
+        forms = await browser_agent._test_forms(mock_page, "http://localhost:3000", Mock(), snapshot=snapshot)
+        
+        mock_page.evaluate.assert_awaited_once()
+        script = mock_page.evaluate.await_args.args[0]
+        assert "seo: (" in script and "forms: (" in script and "accessibility" not in script
+        assert seo["status"] == "PASS"
+        assert forms["status"] == "SKIP"
+    
+    @pytest.mark.asyncio
+    async def test_structural_phases_fall_back_when_snapshot_fails(self, browser_agent):
+        seo_dom = {"title": "A reasonably long title", "meta_description": "Desc", "h1": 1, "h2": 0}
+        mock_page = AsyncMock()
+        mock_page.evaluate = AsyncMock(side_effect=[Exception("Execution context was destroyed"), seo_dom])
+        
+        snapshot = await browser_agent._dom_snapshot(mock_page, ["seo", "forms"])
+        seo = await browser_agent._test_seo(mock_page, "http://localhost:3000", Mock(), snapshot=snapshot)
+        
+        assert snapshot == {"seo": None, "forms": None}
+        assert mock_page.evaluate.await_count == 2  # Failed snapshot, then SEO's own evaluate
+        assert seo["status"] == "PASS"
+    
+    def test_calculate_scores_single_pass(self, browser_agent):
+        scores = browser_agent._calculate_scores({
+            "interactive": {"status": "WARN", "issues": ["a", "b"]},
+            "accessibility": {"status": "FAIL", "issues": ["c"]},
+            "forms": {"status": "SKIP", "issues": []},
+            "links": {"status": "ERROR", "issues": ["d"]}
+        })
+        
+        assert scores == {"interactive": 80, "accessibility": 0, "forms": None, "links": 50, "overall": 43}
+    
+    @pytest.mark.asyncio
+    async def test_comprehensive_validate_navigates_once(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_context = AsyncMock(new_page=AsyncMock(return_value=mock_page))
+        mock_browser = AsyncMock(new_context=AsyncMock(return_value=mock_context))
+        
+        order = []
+        running = []
+        max_running = []
+        def phase(name):
+            async def run(page, url, sm, snapshot=None):
+                running.append(name)
+                max_running.append(len(running))
+                await asyncio.sleep(0.01)
+                running.remove(name)
+                order.append(name)
+                return {"status": "PASS", "issues": []}
+            return run
+        
+        for name in ["interactivity", "accessibility", "responsiveness", "performance", "seo", "links", "forms"]:
+            setattr(browser_agent, f"_test_{name}", phase(name))
+        
+        with patch("app.agents.browser_validation_agent.browser_pool.get_browser", new_callable=AsyncMock, return_value=mock_browser):
+            result = await browser_agent.comprehensive_validate("http://localhost:3000", "/project", validation_level="thorough")
+        
+        mock_page.goto.assert_awaited_once()
+        mock_page.evaluate.assert_awaited_once()  # One DOM snapshot shared by the structural phases
+        mock_context.close.assert_awaited_once()  # Context released, pooled browser kept
+        mock_browser.close.assert_not_called()
+        assert order[4] == "interactivity"  # Clicks run after the core read-only phases, alone
+        assert max(max_running) == 4  # Core read-only phases overlap; interactivity runs alone
+        assert set(order[5:7]) == {"links", "forms"}  # Deep checks follow once the core score is known
+        assert list(result["tests"])[0] == "interactive"
+    
+    @pytest.mark.asyncio
+    async def test_thorough_skips_deep_checks_when_core_checks_fail(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_context = AsyncMock(new_page=AsyncMock(return_value=mock_page))
+        mock_browser = AsyncMock(new_context=AsyncMock(return_value=mock_context))
+        
+        async def failing(page, url, sm, snapshot=None):
+            return {"status": "FAIL", "issues": ["broken"]}
+        
+        async def warning(page, url, sm, snapshot=None):
+            return {"status": "WARN", "issues": ["slow"]}
+        
+        async def erroring(page, url, sm, snapshot=None):
+            return {"status": "ERROR", "issues": ["Timeout"]}
+        
+        # Statuses the real phases can return: only interactivity and accessibility FAIL.
+        # Provisional score is (0 + 0 + 90 + 50 + 50) / 5 = 38, in the POOR band.
+        browser_agent._test_interactivity = failing
+        browser_agent._test_accessibility = failing
+        browser_agent._test_responsiveness = warning
+        browser_agent._test_performance = erroring
+        browser_agent._test_seo = erroring
+        browser_agent._test_links = AsyncMock()
+        browser_agent._test_forms = AsyncMock()
+        
+        with patch("app.agents.browser_validation_agent.browser_pool.get_browser", new_callable=AsyncMock, return_value=mock_browser):
+            result = await browser_agent.comprehensive_validate("http://localhost:3000", "/project", validation_level="thorough")
+        
+        browser_agent._test_links.assert_not_called()
+        browser_agent._test_forms.assert_not_called()
+        assert result["tests"]["links"]["status"] == "SKIP"
+        assert result["scores"]["forms"] is None  # Skipped phases don't drag the score further
+    
+    @pytest.mark.asyncio
+    async def test_thorough_early_exit_score_counts_interactivity(self, browser_agent):
+        mock_page = AsyncMock()
+        mock_context = AsyncMock(new_page=AsyncMock(return_value=mock_page))
+        mock_browser = AsyncMock(new_context=AsyncMock(return_value=mock_context))
+        
+        async def failing(page, url, sm, snapshot=None):
+            return {"status": "FAIL", "issues": ["broken"]}
+        
+        async def erroring(page, url, sm, snapshot=None):
+            return {"status": "ERROR", "issues": ["Timeout"]}
+        
+        async def passing(page, url, sm, snapshot=None):
+            return {"status": "PASS", "issues": []}
+        
+        # Core phases alone score (0 + 50 + 50 + 50) / 4 = 38; a passing interactivity check lifts it to 50
+        browser_agent._test_accessibility = failing
+        for name in ["responsiveness", "performance", "seo"]:
+            setattr(browser_agent, f"_test_{name}", erroring)
+        browser_agent._test_interactivity = passing
+        browser_agent._test_links = AsyncMock(return_value={"status": "PASS", "issues": []})
+        browser_agent._test_forms = AsyncMock(return_value={"status": "PASS", "issues": []})
+        
+        with patch("app.agents.browser_validation_agent.browser_pool.get_browser", new_callable=AsyncMock, return_value=mock_browser), \
+             patch("app.agents.browser_validation_agent.settings.BROWSER_EARLY_EXIT_SCORE", 50):
+            result = await browser_agent.comprehensive_validate("http://localhost:3000", "/project", validation_level="thorough")
+        
+        browser_agent._test_links.assert_awaited_once()
+        browser_agent._test_forms.assert_awaited_once()
+        assert list(result["tests"])[0] == "interactive"
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
@@ -60,7 +60,8 @@ def test_key_manager_rotation():
         
         km.rotate_key()
         c4 = km.get_client()
-        MockClient.assert_called_with(api_key="key1") # Wrap around
+        assert c4 is c1 # Wrap around reuses key1's client
+        assert MockClient.call_count == 3
 
 def test_key_manager_exhaustion():
     with patch("app.core.key_manager.GeminiClient") as MockClient:
@@ -139,3 +140,178 @@ async def test_hybrid_client_rotation_on_quota():
     # Verify we marked a key exhausted and rotated
     assert km.mark_exhausted.called
     assert km.rotate_key.called
+
+def test_key_manager_reuses_key_after_cooldown():
+    with patch("app.core.key_manager.GeminiClient") as MockClient, \
+         patch("app.core.key_manager.time.monotonic", return_value=1000.0) as mock_clock:
+        km = KeyManager(["key1", "key2"], cooldown=60)
+        km.mark_exhausted("key1")
+        km.mark_exhausted("key2")
+
+        with pytest.raises(RuntimeError, match="All API keys have been exhausted"):
+            km.get_client()
+
+        mock_clock.return_value = 1061.0  # Per-minute quota window has passed
+        km.get_client()
+
+    MockClient.assert_called_with(api_key="key1")
+    assert not km.exhausted
+
+# --- ModelResponse Tests ---
+def test_extract_json_object_drops_fences_and_prose():
+    from app.core.model_response import extract_json_object
+
+    assert extract_json_object('```json\n{"a": {"b": 1}}\n```') == '{"a": {"b": 1}}'
+    assert extract_json_object('Sure! {"a": 1} Hope this helps.') == '{"a": 1}'
+    assert extract_json_object("  not json  ") == "not json"
+
+def test_strip_code_fences_keeps_only_fenced_code():
+    from app.core.model_response import strip_code_fences
+
+    assert strip_code_fences("```python\ndef test_a():\n    pass\n```") == "def test_a():\n    pass"
+    assert strip_code_fences("Here you go:\n\n```ts\nit('a', () => {});\n```\n\nThese cover it.") == "it('a', () => {});"
+    assert strip_code_fences("```js\nconst a = 1;\n") == "const a = 1;"  # Truncated response
+    assert strip_code_fences("python\nimport pytest") == "import pytest"
+    assert strip_code_fences("jest.mock('./api');") == "jest.mock('./api');"
+
+# --- SocketManager Tests ---
+@pytest.mark.asyncio
+async def test_socket_manager_emit_nowait():
+    from app.core.socket_manager import SocketManager
+
+    with patch("app.core.socket_manager.sio.emit", new_callable=AsyncMock) as mock_emit:
+        sm = SocketManager()
+        sm.emit_nowait("agent_log", {"message": "hi"})
+        mock_emit.assert_not_called()
+
+        await asyncio.gather(*list(sm._pending))
+        mock_emit.assert_called_once_with("agent_log", {"message": "hi"}, room=None)
+        assert not sm._pending
+
+@pytest.mark.asyncio
+async def test_socket_manager_emit_buffered_batches_logs():
+    from app.core.socket_manager import SocketManager
+
+    # Start from a clean buffer; other tests share the singleton
+    with patch("app.core.socket_manager.sio.emit", new_callable=AsyncMock) as mock_emit, \
+         patch.object(SocketManager, "_buffers", {}), \
+         patch.object(SocketManager, "_flush_task", None):
+        sm = SocketManager()
+        for i in range(3):
+            sm.emit_buffered("agent_log", {"message": i})
+        mock_emit.assert_not_called()
+
+        await sm._flush_task
+        mock_emit.assert_called_once_with(
+            "agent_log_batch", [{"message": 0}, {"message": 1}, {"message": 2}], room=None
+        )
+        assert not sm._buffers
+
+@pytest.mark.asyncio
+async def test_socket_manager_emit_buffered_sends_logs_queued_during_flush():
+    from app.core.socket_manager import SocketManager
+
+    sent = []
+
+    async def slow_emit(event, data, room=None):
+        if not sent:
+            # A trailing log arrives while the first batch is still going out
+            SocketManager().emit_buffered("agent_log", {"message": "done"})
+        sent.append((event, data))
+
+    with patch("app.core.socket_manager.sio.emit", side_effect=slow_emit), \
+         patch.object(SocketManager, "_buffers", {}), \
+         patch.object(SocketManager, "_flush_task", None):
+        sm = SocketManager()
+        sm.emit_buffered("agent_log", {"message": "working"})
+        await sm._flush_task
+
+        assert sent == [
+            ("agent_log_batch", [{"message": "working"}]),
+            ("agent_log_batch", [{"message": "done"}]),
+        ]
+        assert not SocketManager._buffers
+
+# --- AIResponseCache Tests ---
+def test_normalize_prompt_ignores_case_punctuation_and_spacing():
+    from app.core.cache import normalize_prompt
+
+    assert normalize_prompt("  Make a Portfolio,  with Next.js!! ") == "make a portfolio with next.js"
+    assert normalize_prompt("make a portfolio with next.js") == "make a portfolio with next.js"
+
+@pytest.mark.asyncio
+async def test_memory_cache_respects_ttl():
+    from app.core.cache import AIResponseCache
+
+    cache = AIResponseCache()
+    await cache.set("prompt", "architect", "fresh", ttl=60)
+    await cache.set("other", "architect", "stale", ttl=0)
+
+    assert await cache.get("prompt", "architect") == "fresh"
+    assert await cache.get("other", "architect") is None
+    assert len(cache.memory_cache) == 1
+
+@pytest.mark.asyncio
+async def test_init_redis_builds_one_pool_under_concurrency():
+    from app.core.cache import AIResponseCache
+
+    cache = AIResponseCache()
+    with patch("app.core.cache.aioredis.ConnectionPool.from_url") as mock_pool:
+        await asyncio.gather(*[cache.init_redis() for _ in range(5)])
+
+    mock_pool.assert_called_once()
+    assert cache.ready
+
+@pytest.mark.asyncio
+async def test_cache_set_nowait_writes_redis_in_background():
+    from app.core.cache import AIResponseCache
+
+    cache = AIResponseCache()
+    cache.redis = AsyncMock()
+    cache.set_nowait("prompt", "architect", "blueprint", ttl=60)
+
+    assert len(cache.memory_cache) == 1  # Visible to readers before Redis confirms
+    cache.redis.setex.assert_not_called()
+
+    await asyncio.gather(*list(cache._pending))
+    cache.redis.setex.assert_awaited_once()
+    assert not cache._pending
+
+# --- Filesystem Tests ---
+def test_archive_project_reuses_zip_for_unchanged_tree(tmp_path):
+    import zipfile
+    from app.core import filesystem
+
+    (tmp_path / "demo" / "src").mkdir(parents=True)
+    (tmp_path / "demo" / "src" / "main.py").write_text("print('hi')")
+    (tmp_path / "demo" / "empty").mkdir()
+
+    with patch.object(filesystem, "BASE_PROJECTS_DIR", tmp_path), \
+         patch.object(filesystem, "_archive_keys", {}), \
+         patch("app.core.filesystem.zipfile.ZipFile", wraps=zipfile.ZipFile) as mock_zip:
+        first = filesystem.archive_project("demo")
+        second = filesystem.archive_project("demo")
+        (tmp_path / "demo" / "README.md").write_text("# demo")
+        third = filesystem.archive_project("demo")
+
+    assert first == second == third == str(tmp_path / "demo.zip")
+    assert mock_zip.call_count == 2  # Only the edited tree is re-compressed
+    with zipfile.ZipFile(third) as zf:
+        assert sorted(zf.namelist()) == ["README.md", "empty/", "src/", "src/main.py"]
+
+def test_archive_project_skips_dangling_symlinks(tmp_path):
+    import zipfile
+    from app.core import filesystem
+
+    bin_dir = tmp_path / "demo" / "node_modules" / ".bin"
+    bin_dir.mkdir(parents=True)
+    (tmp_path / "demo" / "index.js").write_text("console.log('hi')")
+    (bin_dir / "vite").symlink_to("../vite/bin/vite.js")  # Target was never installed
+
+    with patch.object(filesystem, "BASE_PROJECTS_DIR", tmp_path), \
+         patch.object(filesystem, "_archive_keys", {}):
+        archive = filesystem.archive_project("demo")
+
+    with zipfile.ZipFile(archive) as zf:
+        assert sorted(zf.namelist()) == ["index.js", "node_modules/", "node_modules/.bin/"]
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
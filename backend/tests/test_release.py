@@ -0,0 +1,353 @@
+import pytest
+import sys
+import os
+from unittest.mock import patch, AsyncMock
+
+# Ensure backend directory is in path
+sys.path.insert(0, os.getcwd())
+
+from app.agents.release import ReleaseAgent, ReleaseReport, _iter_files, _scan_project
+
+
+def test_iter_files_skips_dependency_dirs(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("print('hi')")
+    (tmp_path / "node_modules" / "react").mkdir(parents=True)
+    (tmp_path / "node_modules" / "react" / "index.js").write_text("module.exports = {}")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main")
+    (tmp_path / "README.md").write_text("# Demo")
+
+    paths = sorted(os.path.relpath(f.path, tmp_path) for f in _iter_files(tmp_path))
+
+    assert paths == ["README.md", os.path.join("src", "main.py")]
+
+
+@pytest.mark.asyncio
+async def test_prepare_release_counts_project_files(tmp_path):
+    project = tmp_path / "demo"
+    project.mkdir()
+    (project / "main.py").write_text("print('hi')")
+    (project / "README.md").write_text("# Demo")
+    (project / "node_modules").mkdir()
+    (project / "node_modules" / "dep.js").write_text("x" * 1000)
+
+    with patch("app.agents.release.BASE_PROJECTS_DIR", tmp_path), \
+         patch("app.core.socket_manager.SocketManager.emit", new_callable=AsyncMock) as mock_emit, \
+         patch("app.core.socket_manager.SocketManager.emit_buffered") as mock_buffered:
+        report = await ReleaseAgent().prepare_release(
+            "demo", {"project_name": "demo"}, generate_readme=False, generate_cicd=False
+        )
+
+    # Start and finish logs are queued for one batched emit, not sent one by one
+    mock_emit.assert_not_called()
+    assert [c.args[0] for c in mock_buffered.call_args_list] == ["agent_log", "agent_log"]
+
+    assert report.file_count == 2
+    assert report.total_size_bytes == len("print('hi')") + len("# Demo")
+    assert report.warnings == []
+
+
+@pytest.mark.asyncio
+async def test_prepare_release_walks_project_once(tmp_path):
+    project = tmp_path / "demo"
+    (project / "src").mkdir(parents=True)
+    (project / "src" / "main.py").write_text("print('hi')")
+
+    with patch("app.agents.release.BASE_PROJECTS_DIR", tmp_path), \
+         patch("app.core.socket_manager.SocketManager.emit_buffered"), \
+         patch("app.agents.release._iter_files", wraps=_iter_files) as mock_walk, \
+         patch("app.agents.documenter.DocumenterAgent.generate_readme",
+               new_callable=AsyncMock, return_value="# Demo") as mock_readme:
+        await ReleaseAgent().prepare_release("demo", {"project_name": "demo"}, generate_cicd=False)
+
+    mock_walk.assert_called_once()  # README listing reuses the release walk
+    assert mock_readme.await_args.args[1] == ["src/main.py"]
+    assert (project / "README.md").read_text() == "# Demo"
+
+
+def test_validate_files_reports_checks_from_the_scan(tmp_path):
+    (tmp_path / "notes.txt").write_text("")
+    (tmp_path / "empty.py").write_text("")
+    (tmp_path / "lib.py").write_text("x = 1")
+
+    file_list, rel_paths, total_size, state = _scan_project(tmp_path)
+    warnings = ReleaseAgent()._validate_files(state)
+
+    assert warnings == [
+        "No standard entry point file found",
+        "No README.md found",
+        "2 empty file(s) found",
+    ]
+    assert len(file_list) == 3 and total_size == len("x = 1")
+    assert sorted(rel_paths) == ["empty.py", "lib.py", "notes.txt"]
+    assert sorted(_scan_project(str(tmp_path) + os.sep)[1]) == sorted(rel_paths)
+
+
+@pytest.mark.asyncio
+async def test_generate_gitignore_adds_python_section_for_python_stacks(tmp_path):
+    agent = ReleaseAgent()
+
+    await agent._generate_gitignore(tmp_path, {"language": "javascript"})
+    js_ignore = (tmp_path / ".gitignore").read_text()
+    await agent._generate_gitignore(tmp_path, {"language": "python"})
+    py_ignore = (tmp_path / ".gitignore").read_text()
+
+    assert "node_modules/" in js_ignore and ".pytest_cache/" not in js_ignore
+    assert py_ignore.startswith(js_ignore) and ".pytest_cache/" in py_ignore
+
+
+def test_validate_blueprint_answers_from_walked_paths(tmp_path):
+    (tmp_path / "frontend" / "src").mkdir(parents=True)
+    (tmp_path / "frontend" / "src" / "index.js").write_text("")
+    blueprint = {"file_structure": [
+        {"path": "main.py"},
+        {"path": "./frontend/app.js"},
+        {"path": "frontend"},
+        {"path": "missing.py"},
+        {"path": "frontend/src/index.js"},
+        {"path": "frontend/src/gone.js"},
+        {"path": "nope/a.py"},
+    ]}
+
+    with patch("app.agents.release.os.scandir", wraps=os.scandir) as mock_scandir:
+        missing = ReleaseAgent()._validate_blueprint(tmp_path, blueprint, {"main.py", "frontend/app.js"})
+
+    assert missing == ["missing.py", "frontend/src/gone.js", "nope/a.py"]
+    assert mock_scandir.call_count == 3  # One listing per parent of a path the walk did not see
+
+
+def test_release_report_to_dict_matches_asdict():
+    from dataclasses import asdict
+
+    report = ReleaseReport(
+        project_id="demo", project_name="Demo", ready=False, file_count=3, total_size_bytes=120,
+        missing_files=["main.py"], warnings=["No README.md found"],
+        generated_artifacts=[".gitignore", "release.json"], deploy_targets=["vercel"]
+    )
+
+    result = report.to_dict()
+
+    assert result == asdict(report)
+    assert list(result) == list(asdict(report))  # Same key order in the serialized JSON
+    assert result["warnings"] is not report.warnings
+
+
+@pytest.mark.asyncio
+async def test_write_artifacts_runs_off_the_event_loop(tmp_path):
+    import threading
+    from app.agents.release import DeploymentArtifact, DeployTarget
+
+    from app.agents.release import _write_file
+
+    writer_threads = []
+
+    def recording_write_file(path, data):
+        writer_threads.append(threading.current_thread())
+        return _write_file(path, data)
+
+    artifacts = [
+        DeploymentArtifact(DeployTarget.CUSTOM, ".github/workflows/ci.yml", "name: CI\n", "CI"),
+        DeploymentArtifact(DeployTarget.GITHUB_PAGES, ".github/workflows/deploy.yml", "name: Deploy\n", "Pages"),
+        DeploymentArtifact(DeployTarget.DOCKER, "Dockerfile", "FROM python:3.11-slim\n", "Docker"),
+    ]
+    with patch("app.agents.release._write_file", recording_write_file), \
+         patch("pathlib.Path.mkdir", autospec=True, side_effect=lambda path, **kw: os.makedirs(path, exist_ok=True)) as mock_mkdir:
+        await ReleaseAgent()._write_artifacts(tmp_path, artifacts)
+
+    assert (tmp_path / ".github" / "workflows" / "ci.yml").read_text() == "name: CI\n"
+    assert (tmp_path / "Dockerfile").read_text() == "FROM python:3.11-slim\n"
+    assert len(writer_threads) == 3 and threading.main_thread() not in writer_threads
+    # One mkdir for the directory both workflows share; none for the project root
+    assert [c.args[0] for c in mock_mkdir.call_args_list] == [tmp_path / ".github" / "workflows"]
+
+
+@pytest.mark.asyncio
+async def test_prepare_release_dispatches_deploy_targets(tmp_path):
+    from app.agents.release import DeployTarget
+
+    project = tmp_path / "demo"
+    project.mkdir()
+    (project / "requirements.txt").write_text("fastapi\n")
+
+    with patch("app.agents.release.BASE_PROJECTS_DIR", tmp_path), \
+         patch("app.core.socket_manager.SocketManager.emit_buffered"):
+        agent = ReleaseAgent()
+        explicit = await agent.prepare_release(
+            "demo", None, deploy_targets=[DeployTarget.RAILWAY, DeployTarget.CUSTOM, DeployTarget.RAILWAY],
+            generate_readme=False, generate_cicd=False
+        )
+        auto = await agent.prepare_release("demo", None, generate_readme=False, generate_cicd=False)
+
+    assert explicit.deploy_targets == ["railway"]  # CUSTOM has no generator; the repeat is dropped
+    assert explicit.generated_artifacts.count("railway.json") == 1
+    assert auto.deploy_targets == ["docker"] and (project / "Dockerfile").exists()
+
+
+def test_deploy_configs_select_framework_variant(tmp_path):
+    agent = ReleaseAgent()
+
+    netlify = {fw: agent._generate_netlify_config(tmp_path, {"framework": fw}, "demo").content for fw in ["nextjs", "react", "vue"]}
+    dockerfile = {
+        lang: agent._generate_dockerfile(tmp_path, {"language": lang, "framework": "nextjs"}, "demo").content
+        for lang in ["python", "javascript"]
+    }
+
+    assert "@netlify/plugin-nextjs" in netlify["nextjs"]
+    assert 'publish = "build"' in netlify["react"]
+    assert 'publish = "dist"' in netlify["vue"]
+    assert dockerfile["python"].startswith("# Python") and dockerfile["javascript"].startswith("# Next.js")
+
+
+def test_vercel_config_is_built_once_per_framework_and_name(tmp_path):
+    import json
+    from app.agents.release import _build_vercel_json
+
+    _build_vercel_json.cache_clear()
+    agent = ReleaseAgent()
+    first = agent._generate_vercel_config(tmp_path, {"framework": "react"}, "my-app")
+    second = agent._generate_vercel_config(tmp_path, {"framework": "react"}, "my-app")
+
+    assert first.content is second.content
+    assert _build_vercel_json.cache_info().hits == 1
+    assert json.loads(first.content)["name"] == "my-app"
+
+
+@pytest.mark.asyncio
+async def test_prepare_release_slugs_project_name_once(tmp_path):
+    import json
+    from app.agents.release import DeployTarget, _slugify
+
+    (tmp_path / "demo").mkdir()
+
+    with patch("app.agents.release.BASE_PROJECTS_DIR", tmp_path), \
+         patch("app.core.socket_manager.SocketManager.emit_buffered"), \
+         patch("app.agents.release._slugify", wraps=_slugify) as mock_slugify:
+        report = await ReleaseAgent().prepare_release(
+            "demo", {"project_name": "My App"}, deploy_targets=[DeployTarget.VERCEL],
+            generate_readme=False, generate_cicd=False
+        )
+
+    mock_slugify.assert_called_once_with("My App")
+    assert report.project_name == "My App"
+    assert json.loads((tmp_path / "demo" / "vercel.json").read_text())["name"] == "my-app"
+    assert json.loads((tmp_path / "demo" / "release.json").read_text())["project_name"] == "My App"
+
+
+@pytest.mark.asyncio
+async def test_prepare_release_reads_package_json_and_writes_manifest(tmp_path):
+    import json
+
+    project = tmp_path / "demo"
+    project.mkdir()
+    (project / "package.json").write_text('{"dependencies": {"next": "14.0.0", "react": "18.2.0"}}')
+
+    with patch("app.agents.release.BASE_PROJECTS_DIR", tmp_path), \
+         patch("app.core.socket_manager.SocketManager.emit_buffered"):
+        report = await ReleaseAgent().prepare_release("demo", None, generate_readme=False, generate_cicd=False)
+
+    manifest = json.loads((project / "release.json").read_text())
+    assert manifest["tech_stack"]["framework"] == "nextjs"
+    assert manifest["deploy_targets"] == report.deploy_targets == ["vercel"]
+    assert ReleaseAgent()._detect_tech_stack(tmp_path / "missing", None)["framework"] is None
+
+
+def test_detect_tech_stack_keyword_priority(tmp_path):
+    agent = ReleaseAgent()
+
+    def detect(tech_stack):
+        stack = agent._detect_tech_stack(tmp_path, {"tech_stack": tech_stack})
+        return stack["framework"], stack["language"], stack["type"]
+
+    assert detect("Next.js + FastAPI") == ("nextjs", "javascript", "frontend")
+    assert detect("ReactJS") == ("react", "javascript", "frontend")
+    assert detect("Python 3.11 with FastAPI") == ("fastapi", "python", "backend")
+    assert detect("Flask") == ("flask", "python", "backend")
+    assert detect("Express on Node") == ("express", "javascript", "backend")
+    assert detect("Tailwind") == (None, "javascript", "unknown")
+
+
+def test_cicd_workflow_matches_language(tmp_path):
+    from app.agents.release import CI_WORKFLOW_PYTHON, CI_WORKFLOW_NODE
+
+    agent = ReleaseAgent()
+    [python_ci] = agent._generate_cicd_configs(tmp_path, {"language": "python"})
+    [node_ci] = agent._generate_cicd_configs(tmp_path, {})
+
+    assert python_ci.filename == node_ci.filename == ".github/workflows/ci.yml"
+    assert python_ci.content is CI_WORKFLOW_PYTHON and "pytest" in python_ci.content
+    assert node_ci.content is CI_WORKFLOW_NODE and "npm ci" in node_ci.content
+
+
+def test_detect_tech_stack_is_cached_until_package_json_changes(tmp_path):
+    from app.agents.release import _detect_stack_cached
+
+    _detect_stack_cached.cache_clear()
+    agent = ReleaseAgent()
+    package_json = tmp_path / "package.json"
+    package_json.write_text('{"dependencies": {"react": "18.2.0"}}')
+
+    first = agent._detect_tech_stack(tmp_path, {"tech_stack": "React"})
+    first["framework"] = "mutated"
+    second = agent._detect_tech_stack(tmp_path, {"tech_stack": "React"})
+    package_json.write_text('{"dependencies": {"next": "14.0.0", "react": "18.2.0"}}')
+    third = agent._detect_tech_stack(tmp_path, {"tech_stack": "React"})
+
+    assert second["framework"] == "react"  # Cached entry unaffected by the caller's edit
+    assert third["framework"] == "nextjs"
+    assert _detect_stack_cached.cache_info().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_prepare_release_builds_configs_while_readme_generates(tmp_path):
+    import asyncio
+
+    (tmp_path / "demo").mkdir()
+    events = []
+
+    async def slow_readme(self, blueprint, files, user_prompt):
+        events.append("readme started")
+        await asyncio.sleep(0.01)
+        events.append("readme done")
+        return "# Demo"
+
+    real_cicd = ReleaseAgent._generate_cicd_configs
+
+    def recording_cicd(self, *args):
+        events.append("cicd built")
+        return real_cicd(self, *args)
+
+    with patch("app.agents.release.BASE_PROJECTS_DIR", tmp_path), \
+         patch("app.core.socket_manager.SocketManager.emit_buffered"), \
+         patch("app.agents.documenter.DocumenterAgent.generate_readme", slow_readme), \
+         patch.object(ReleaseAgent, "_generate_cicd_configs", recording_cicd):
+        report = await ReleaseAgent().prepare_release("demo", {"project_name": "demo"})
+
+    assert events.index("cicd built") < events.index("readme done")
+    assert (tmp_path / "demo" / "README.md").read_text() == "# Demo"
+    assert report.generated_artifacts[:2] == [".gitignore", "README.md"]
+
+
+@pytest.mark.asyncio
+async def test_prepare_release_keeps_existing_readme(tmp_path):
+    project = tmp_path / "demo"
+    (project / "docs").mkdir(parents=True)
+    (project / "docs" / "ReadMe.MD").write_text("# Docs")
+
+    with patch("app.agents.release.BASE_PROJECTS_DIR", tmp_path), \
+         patch("app.core.socket_manager.SocketManager.emit_buffered"), \
+         patch("app.agents.documenter.DocumenterAgent.generate_readme", new_callable=AsyncMock) as mock_readme:
+        report = await ReleaseAgent().prepare_release("demo", None, generate_cicd=False)
+
+    mock_readme.assert_not_called()
+    assert "README.md" not in report.generated_artifacts
+
+
+def test_write_file_replaces_existing_content(tmp_path):
+    from app.agents.release import _write_file
+
+    target = tmp_path / "vercel.json"
+    target.write_text("x" * 10000)
+    _write_file(target, "{\"name\": \"café\"}".encode())
+
+    assert target.read_text(encoding="utf-8") == '{"name": "café"}'
@@ -60,3 +60,74 @@ async def test_hybrid_client_exhaustion_fallback():
             
             assert response == "Ollama Response"
             assert client.use_local is True
+
+@pytest.mark.asyncio
+async def test_hybrid_client_stream_delegates_quota_errors_to_generate():
+    km = KeyManager(["key1", "key2"])
+    client = HybridModelClient(km)
+
+    with patch("app.core.socket_manager.SocketManager") as mock_sm_cls:
+        mock_sm_cls.return_value.emit = AsyncMock()
+
+        with patch("app.core.key_manager.GeminiClient") as mock_gemini:
+            models = mock_gemini.return_value.aio.models
+            models.generate_content_stream = AsyncMock(side_effect=Exception("429 RESOURCE_EXHAUSTED"))
+            models.generate_content = AsyncMock(return_value=MagicMock(text="Rotated"))
+
+            chunks = [chunk async for chunk in client.stream("test prompt")]
+
+            # Delegated to generate(), which owns rotation and the Ollama fallback
+            assert chunks == ["Rotated"]
+            models.generate_content.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_hybrid_client_recovers_after_all_keys_cooled_down():
+    km = KeyManager(["key1"], cooldown=60)
+    client = HybridModelClient(km)
+    clock = {"now": 1000.0}
+
+    with patch("app.core.socket_manager.SocketManager") as mock_sm_cls, \
+         patch("app.core.key_manager.time.monotonic", side_effect=lambda: clock["now"]), \
+         patch("app.core.local_model.time.monotonic", side_effect=lambda: clock["now"]), \
+         patch("app.core.key_manager.GeminiClient") as mock_gemini:
+        mock_sm_cls.return_value.emit = AsyncMock()
+        generate_content = AsyncMock(side_effect=Exception("429 RESOURCE_EXHAUSTED"))
+        mock_gemini.return_value.aio.models.generate_content = generate_content
+        client.ollama.is_available = AsyncMock(return_value=False)
+
+        with pytest.raises(Exception, match="Ollama not available"):
+            await client.generate("burst")
+        # Still cooling down: no Gemini call, same clear quota error instead of a RuntimeError
+        with pytest.raises(Exception, match="Ollama not available"):
+            await client.generate("during cooldown")
+        assert generate_content.call_count == 1
+
+        clock["now"] += 61
+        generate_content.side_effect = None
+        generate_content.return_value = MagicMock(text="Recovered")
+        assert await client.generate("after cooldown") == "Recovered"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_client_leaves_local_mode_after_ttl():
+    from app.core.local_model import LOCAL_MODE_TTL
+
+    client = HybridModelClient(KeyManager(["key1"]))
+    client.use_local = True
+    clock = {"now": 1000.0}
+    client._local_until = clock["now"] + LOCAL_MODE_TTL
+
+    with patch("app.core.socket_manager.SocketManager") as mock_sm_cls, \
+         patch("app.core.local_model.time.monotonic", side_effect=lambda: clock["now"]), \
+         patch("app.core.key_manager.GeminiClient") as mock_gemini:
+        mock_sm_cls.return_value.emit = AsyncMock()
+        mock_gemini.return_value.aio.models.generate_content = AsyncMock(return_value=MagicMock(text="Gemini"))
+        client.ollama.is_available = AsyncMock(return_value=True)
+        client.ollama.generate = AsyncMock(return_value="Ollama")
+
+        assert await client.generate("local") == "Ollama"
+        clock["now"] += LOCAL_MODE_TTL
+        assert await client.generate("cloud again") == "Gemini"
+
+    assert client.use_local is False
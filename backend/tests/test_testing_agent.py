@@ -487,6 +487,309 @@ class TestTestingAgentIntegration:
                 assert len(test_files) == 2
 
 
+class TestTestingAgentGeneration:
+    """Request fan-out of test generation, against the in-tree module."""
+    
+    @pytest.fixture
+    def testing_agent(self):
+        from collections import OrderedDict
+        from app.agents.testing_agent import TestingAgent
+        
+        with patch("app.agents.testing_agent._generated_tests", OrderedDict()):
+            yield TestingAgent()
+    
+    @pytest.mark.asyncio
+    async def test_generate_tests_batches_small_files_into_one_request(self, testing_agent):
+        mock_client = Mock()
+        mock_client.generate = AsyncMock(return_value=json.dumps({
+            "backend/main.py": "def test_main(): assert True",
+            "backend/utils.py": "```python\ndef test_add(): assert True\n```"
+        }))
+        
+        file_system = {
+            "backend/main.py": "def main():\n    return 'hello from the main module'",
+            "backend/utils.py": "def add(a, b):\n    # Adds two numbers together\n    return a + b"
+        }
+        
+        with patch('app.agents.testing_agent.get_hybrid_client', return_value=mock_client):
+            test_files = await testing_agent._generate_tests(file_system, "pytest", Mock(emit=AsyncMock()))
+        
+        assert mock_client.generate.await_count == 1
+        assert mock_client.generate.await_args.kwargs["json_mode"] is True
+        assert test_files == {
+            "backend/tests/test_main.py": "def test_main(): assert True",
+            "backend/tests/test_utils.py": "def test_add(): assert True"
+        }
+    
+    @pytest.mark.asyncio
+    async def test_generate_tests_falls_back_to_concurrent_per_file_requests(self, testing_agent):
+        in_flight = []
+        peak = []
+        
+        async def generate(prompt, json_mode=False):
+            if json_mode:
+                return "Sorry, I can't do that."
+            in_flight.append(prompt)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(prompt)
+            return "def test_generated(): assert True"
+        
+        mock_client = Mock(generate=generate)
+        file_system = {
+            f"backend/module_{i}.py": f"def handler_{i}(value):\n    return value * {i} + {i}  # scaled"
+            for i in range(3)
+        }
+        
+        with patch('app.agents.testing_agent.get_hybrid_client', return_value=mock_client):
+            test_files = await testing_agent._generate_tests(file_system, "pytest", Mock(emit=AsyncMock()))
+        
+        assert len(test_files) == 3
+        assert max(peak) == 3  # Per-file requests overlap instead of running one after another
+
+    
+    @pytest.mark.asyncio
+    async def test_generate_tests_reuses_tests_for_unchanged_files(self, testing_agent):
+        mock_client = Mock()
+        mock_client.generate = AsyncMock(return_value="def test_main(): assert True")
+        
+        file_system = {"backend/main.py": "def main():\n    return 'hello from the main module'"}
+        
+        with patch('app.agents.testing_agent.get_hybrid_client', return_value=mock_client):
+            first = await testing_agent._generate_tests(file_system, "pytest", Mock(emit=AsyncMock()))
+            second = await testing_agent._generate_tests(file_system, "pytest", Mock(emit=AsyncMock()))
+            file_system["backend/main.py"] += "\n# changed"
+            await testing_agent._generate_tests(file_system, "pytest", Mock(emit=AsyncMock()))
+        
+        assert first == second == {"backend/tests/test_main.py": "def test_main(): assert True"}
+        assert mock_client.generate.await_count == 2  # Only the edited source is regenerated
+    
+    @pytest.mark.asyncio
+    async def test_generate_tests_rejects_unparsable_python(self, testing_agent):
+        async def generate(prompt, json_mode=False):
+            if json_mode:
+                return json.dumps({
+                    "backend/main.py": "def test_main(): assert True",
+                    "backend/utils.py": "def test_add(:\n    assert add(1, 2) == 3"
+                })
+            return "def test_add():\n    assert True"
+        
+        mock_client = Mock(generate=AsyncMock(side_effect=generate))
+        file_system = {
+            "backend/main.py": "def main():\n    return 'hello from the main module'",
+            "backend/utils.py": "def add(a, b):\n    # Adds two numbers together\n    return a + b"
+        }
+        
+        with patch('app.agents.testing_agent.get_hybrid_client', return_value=mock_client):
+            test_files = await testing_agent._generate_tests(file_system, "pytest", Mock(emit=AsyncMock()))
+        
+        # The broken batched test was regenerated on its own instead of being kept
+        assert mock_client.generate.await_count == 2
+        assert test_files["backend/tests/test_utils.py"] == "def test_add():\n    assert True"
+        assert testing_agent._syntax_ok("def broken(:", "python") is False
+        assert testing_agent._syntax_ok("it('works', () => {", "typescript") is True
+    
+    def test_find_testable_files_applies_exclusions(self, testing_agent):
+        body = "def handler(value):\n    return value * 2  # doubled for the caller"
+        file_system = {
+            "backend/app/main.py": body,
+            "frontend/src/utils.ts": body,
+            "frontend/vite.config.ts": body,
+            "frontend/src/App.test.tsx": body,
+            "frontend/node_modules/pkg/index.js": body,
+            "backend/venv/lib/site.py": body,
+            "frontend/dist/bundle.js": body,
+            "docs/readme.md": body,
+            "backend/app/tiny.py": "x = 1"
+        }
+        
+        assert set(testing_agent._find_testable_files(file_system)) == {"backend/app/main.py", "frontend/src/utils.ts"}
+    
+    def test_parse_pytest_counts_reads_summary_line(self):
+        from app.agents.testing_agent import parse_pytest_counts
+        
+        stdout = """
+test_main.py::test_example PASSED
+test_utils.py::test_add FAILED
+=========================== short test summary info ============================
+FAILED test_utils.py::test_add - assert 1 == 2
+==================== 1 failed, 1 passed, 2 skipped in 0.12s ====================
+"""
+        
+        assert parse_pytest_counts(stdout) == (1, 1, 2)  # Summary FAILED line not double-counted
+        assert parse_pytest_counts("test_a.py::test_x PASSED\ntest_a.py::test_y SKIPPED") == (1, 0, 1)
+    
+    @pytest.mark.asyncio
+    async def test_run_command_does_not_block_event_loop(self, tmp_path):
+        import subprocess
+        import sys
+        from app.agents.testing_agent import run_command
+        
+        ticks = []
+        
+        async def ticker():
+            for _ in range(5):
+                ticks.append(1)
+                await asyncio.sleep(0.01)
+        
+        result, _ = await asyncio.gather(
+            run_command([sys.executable, "-c", "import time; time.sleep(0.1); print('done')"], cwd=str(tmp_path)),
+            ticker()
+        )
+        
+        assert result.returncode == 0 and result.stdout.strip() == "done"
+        assert len(ticks) == 5  # Loop kept running while the child process worked
+        
+        with pytest.raises(subprocess.TimeoutExpired):
+            await run_command([sys.executable, "-c", "import time; time.sleep(5)"], cwd=str(tmp_path), timeout=0.1)
+    
+    @pytest.mark.asyncio
+    async def test_run_command_streams_lines_with_progress(self, tmp_path):
+        import sys
+        from app.agents.testing_agent import run_command, progress_reporter, PYTEST_PROGRESS_RE
+        
+        script = (
+            "import sys\n"
+            "for i in range(45):\n"
+            "    print(f'tests/test_a.py::test_{i} ' + ('FAILED' if i % 10 == 0 else 'PASSED'))\n"
+            "print('FAILED tests/test_a.py::test_0 - assert 0')\n"
+            "sys.stderr.write('warn' * 50000)\n"
+        )
+        sm = Mock()
+        lines = []
+        reporter = progress_reporter(sm, PYTEST_PROGRESS_RE, failed="FAILED")
+        
+        def on_line(line):
+            lines.append(line)
+            reporter(line)
+        
+        result = await run_command([sys.executable, "-c", script], cwd=str(tmp_path), timeout=10, on_line=on_line)
+        
+        assert len(lines) == 46 and result.stdout == "".join(lines)
+        assert len(result.stderr) == 200000  # Large stderr drained while stdout streams
+        # Tallies after the 20th and 40th test; the short summary line is not counted
+        assert [c.args[1]["message"] for c in sm.emit_buffered.call_args_list] == [
+            "🧪 20 tests run, 2 failed so far...",
+            "🧪 40 tests run, 4 failed so far...",
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_run_pytest_runs_test_files_in_parallel_processes(self, testing_agent, tmp_path):
+        import subprocess
+        
+        tests_dir = tmp_path / "backend" / "tests"
+        tests_dir.mkdir(parents=True)
+        for name in ["test_api.py", "test_models.py", "helpers.py"]:
+            (tests_dir / name).write_text("")
+        (tmp_path / "backend" / "venv").mkdir()
+        (tmp_path / "backend" / "venv" / "test_vendored.py").write_text("")
+        
+        summaries = {
+            os.path.join("tests", "test_api.py"): ("===== 2 passed in 0.01s =====", 0),
+            os.path.join("tests", "test_models.py"): ("===== 1 failed, 1 passed in 0.01s =====", 1)
+        }
+        
+        async def fake_run(cmd, cwd, timeout=None, env=None, on_line=None):
+            assert "no:cacheprovider" in cmd and env["PYTHONDONTWRITEBYTECODE"] == "1"
+            stdout, code = summaries[cmd[-1]]
+            return subprocess.CompletedProcess(cmd, code, stdout, "")
+        
+        with patch("app.agents.testing_agent.PYTEST_WORKERS", 4), \
+             patch("app.agents.testing_agent.run_command", side_effect=fake_run) as mock_run:
+            result = await testing_agent._run_pytest(str(tmp_path), Mock(emit=AsyncMock()))
+        
+        assert mock_run.call_count == 2  # One process per test module; venv and helpers skipped
+        assert (result["passed"], result["failed"], result["tests_run"]) == (3, 1, 4)
+        assert result["success"] is False and result["exit_code"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_run_pytest_parallel_ignores_empty_test_module(self, testing_agent, tmp_path):
+        import subprocess
+        
+        tests_dir = tmp_path / "backend" / "tests"
+        tests_dir.mkdir(parents=True)
+        for name in ["test_api.py", "test_empty.py"]:
+            (tests_dir / name).write_text("")
+        
+        summaries = {
+            os.path.join("tests", "test_api.py"): ("===== 2 passed in 0.01s =====", 0),
+            os.path.join("tests", "test_empty.py"): ("===== no tests ran in 0.01s =====", 5)
+        }
+        
+        async def fake_run(cmd, cwd, timeout=None, env=None, on_line=None):
+            stdout, code = summaries[cmd[-1]]
+            return subprocess.CompletedProcess(cmd, code, stdout, "")
+        
+        with patch("app.agents.testing_agent.PYTEST_WORKERS", 4), \
+             patch("app.agents.testing_agent.run_command", side_effect=fake_run) as mock_run:
+            result = await testing_agent._run_pytest(str(tmp_path), Mock(emit=AsyncMock()))
+        
+        assert mock_run.call_count == 2
+        assert result["success"] is True and result["exit_code"] == 0
+        assert result["passed"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_run_pytest_single_run_with_custom_discovery(self, testing_agent, tmp_path):
+        import subprocess
+        
+        tests_dir = tmp_path / "backend" / "tests"
+        tests_dir.mkdir(parents=True)
+        for name in ["test_api.py", "test_models.py"]:
+            (tests_dir / name).write_text("")
+        (tmp_path / "backend" / "pytest.ini").write_text("[pytest]\ntestpaths = tests/unit\n")
+        
+        async def fake_run(cmd, cwd, timeout=None, env=None, on_line=None):
+            return subprocess.CompletedProcess(cmd, 0, "===== 3 passed in 0.01s =====", "")
+        
+        with patch("app.agents.testing_agent.PYTEST_WORKERS", 4), \
+             patch("app.agents.testing_agent.run_command", side_effect=fake_run) as mock_run:
+            result = await testing_agent._run_pytest(str(tmp_path), Mock(emit=AsyncMock()))
+        
+        mock_run.assert_called_once()
+        assert not mock_run.call_args.args[0][-1].endswith(".py")  # Left to pytest's own discovery
+        assert result["passed"] == 3
+    
+    def test_get_test_file_path_keeps_dotted_directories(self, testing_agent):
+        assert testing_agent._get_test_file_path("backend/app/main.py", "pytest") == "backend/tests/test_main.py"
+        assert testing_agent._get_test_file_path("frontend/src/App.tsx", "vitest") == "frontend/src/App.test.tsx"
+        # Only the file's own extension gets the .test infix
+        assert testing_agent._get_test_file_path("frontend/lib.ts/util.ts", "jest") == "frontend/lib.ts/util.test.ts"
+        assert testing_agent._get_test_file_path("src/utils.js", "jest") == "frontend/__tests__/utils.test.ts"
+    
+    @pytest.mark.asyncio
+    async def test_run_tests_dispatches_by_framework(self, testing_agent):
+        with patch.object(testing_agent, "_run_vitest", AsyncMock(return_value={"success": True})) as mock_vitest:
+            assert await testing_agent._run_tests("/tmp/project", "vitest", Mock()) == {"success": True}
+        
+        mock_vitest.assert_awaited_once()
+        unsupported = await testing_agent._run_tests("/tmp/project", "mocha", Mock())
+        assert unsupported["success"] is False and "mocha" in unsupported["error"]
+        assert [testing_agent._get_language(p) for p in ["a/b.py", "c.tsx", "d.jsx", "e.md"]] == [
+            "python", "typescript", "javascript", "unknown"
+        ]
+    
+    def test_generation_prompts_share_static_prefix(self, testing_agent):
+        from app.agents.testing_agent import framework_preamble
+        
+        first = testing_agent._create_test_generation_prompt("backend/a.py", "def a(): pass", "pytest", "python")
+        second = testing_agent._create_test_generation_prompt("frontend/b.ts", "export const b = 1", "pytest", "typescript")
+        
+        prefix = framework_preamble("pytest")
+        assert first.startswith(prefix) and second.startswith(prefix)
+        assert "backend/a.py" not in prefix  # Per-file details only after the cached prefix
+    
+    def test_batch_generation_prompts_share_static_prefix(self, testing_agent):
+        from app.agents.testing_agent import batch_framework_preamble
+        
+        first = testing_agent._create_batch_test_generation_prompt({"backend/a.py": "def a(): pass"}, "pytest")
+        second = testing_agent._create_batch_test_generation_prompt({"backend/b.py": "def b(): pass"}, "pytest")
+        
+        prefix = batch_framework_preamble("pytest")
+        assert first.startswith(prefix) and second.startswith(prefix)
+        assert "**REQUIREMENTS**" in prefix and "<file" not in prefix
+        assert '<file path="backend/a.py">' in first[len(prefix):]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
     
\ No newline at end of file
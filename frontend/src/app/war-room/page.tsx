@@ -147,6 +147,7 @@ export default function WarRoomPage() {
     useEffect(() => {
         socket.on("connect", () => addLog("SYSTEM", "Connected to ACEA Core Uplink", "success"))
         socket.on("agent_log", (data: any) => addLog(data.agent_name, data.message, "info"))
+        socket.on("agent_log_batch", (batch: any[]) => batch.forEach((data: any) => addLog(data.agent_name, data.message, "info")))
         socket.on("agent_status", (data: any) => setAgents((prev: any) => ({ ...prev, [data.agent_name]: data.status })))
         socket.on("mission_accepted", (data: { project_id: string }) => setProjectId(data.project_id))
         socket.on("mission_complete", (data: any) => {
@@ -211,6 +212,7 @@ export default function WarRoomPage() {
             clearInterval(timerInterval)
             socket.off("connect")
             socket.off("agent_log")
+            socket.off("agent_log_batch")
             socket.off("agent_status")
             socket.off("mission_accepted")
             socket.off("mission_complete")